@@ -0,0 +1,618 @@
+"""Offline benchmarks for the LinkedIn scraper
+
+Usage:
+    python benchmark.py parse --corpus saved_pages/ [--backends lxml,selectolax,bs4] [--repeat 3] [--diff]
+    python benchmark.py frontier [--items 100000] [--workers 20]
+    python benchmark.py browser-extract --corpus saved_pages/ [--repeat 3]
+    python benchmark.py browsers [--workers 10] [--tabs 0,5,10] [--pages 20]
+    python benchmark.py startup [--drivers 5]
+    python benchmark.py e2e [--drivers 2,4] [--workers 8,16] [--engine asyncio] [--fetch-mode http] [--latency-ms 50] [--error-rate 0.01]
+                            [--queries 4] [--pages 4] [--mongo-uri mongodb://localhost:27017/] [--label my-change]
+"""
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from datetime import datetime
+import multiprocessing
+import subprocess
+import argparse
+import threading
+import tempfile
+import resource
+import random
+import json
+import glob
+import time
+import os
+
+import main
+
+try:
+    import mongomock
+except ImportError:
+    mongomock = None
+
+
+def load_corpus(corpus_dir):
+    """Read every saved job page (*.html) in the corpus directory"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def _run_parse_backend(backend, corpus_dir, repeat, results):
+    """Parse the corpus with one backend in a fresh process so peak RSS is its own"""
+    pages = load_corpus(corpus_dir)
+    extractor = main.FieldExtractor(backend)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    parsed = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, html in pages:
+            if extractor.extract(html) is not None:
+                parsed += 1
+    elapsed = time.perf_counter() - start
+
+    results[backend] = {
+        "pages": len(pages) * repeat,
+        "parsed": parsed,
+        "seconds": elapsed,
+        "pages_per_sec": len(pages) * repeat / elapsed if elapsed else 0.0,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "parse_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss,
+    }
+
+
+def diff_backends(pages, backends, reference="bs4"):
+    """Compare each backend's output with the reference backend and return mismatches"""
+    extractors = {backend: main.FieldExtractor(backend) for backend in set(backends) | {reference}}
+    mismatches = []
+    for name, html in pages:
+        expected = extractors[reference].extract(html)
+        for backend in backends:
+            if backend == reference:
+                continue
+            actual = extractors[backend].extract(html)
+            if actual != expected:
+                mismatches.append((name, backend, expected, actual))
+    return mismatches
+
+
+def bench_parse(args):
+    pages = load_corpus(args.corpus)
+    if not pages:
+        print(f"No *.html files found in {args.corpus}")
+        return
+    backends = args.backends.split(",")
+    print(f"Parsing {len(pages)} pages x {args.repeat} with: {', '.join(backends)}")
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Manager().dict()
+    for backend in backends:
+        process = context.Process(target=_run_parse_backend, args=(backend, args.corpus, args.repeat, results))
+        process.start()
+        process.join()
+
+    print(f"{'backend':<12}{'pages/sec':>12}{'parsed':>10}{'peak RSS MB':>14}{'parse RSS MB':>14}")
+    for backend in backends:
+        if backend not in results:
+            print(f"{backend:<12}{'failed':>12}")
+            continue
+        result = results[backend]
+        print(f"{backend:<12}{result['pages_per_sec']:>12.1f}{result['parsed']:>10}"
+              f"{result['peak_rss_kb'] / 1024:>14.1f}{result['parse_rss_kb'] / 1024:>14.1f}")
+
+    if args.diff:
+        mismatches = diff_backends(pages, backends)
+        print(f"{len(mismatches)} pages differ from the bs4 backend")
+        for name, backend, expected, actual in mismatches:
+            changed = sorted(key for key in set(expected or {}) | set(actual or {})
+                             if (expected or {}).get(key) != (actual or {}).get(key))
+            print(f"  {name} [{backend}]: {', '.join(changed) or 'markers'}")
+
+
+def bench_browser_extract(args):
+    """Bytes and latency of page_source plus FieldExtractor versus JOB_EXTRACTOR_SCRIPT in Chrome"""
+    paths = sorted(glob.glob(os.path.join(os.path.abspath(args.corpus), "*.html")))
+    if not paths:
+        print(f"No *.html files found in {args.corpus}")
+        return
+    extractor = main.FieldExtractor()
+    driver = main.DriverManager.create_driver(headless=True)
+    totals = {"page_source": [0, 0.0], "in_browser": [0, 0.0]}
+    mismatches = []
+    try:
+        for _ in range(args.repeat):
+            for path in paths:
+                driver.get("file://" + path)
+
+                start = time.perf_counter()
+                html = driver.page_source
+                expected = extractor.extract(html)
+                totals["page_source"][0] += len(html.encode("utf-8"))
+                totals["page_source"][1] += time.perf_counter() - start
+
+                start = time.perf_counter()
+                result = driver.execute_script(main.JOB_EXTRACTOR_SCRIPT)
+                actual = main.JobScraper.validate_browser_fields(result)
+                totals["in_browser"][0] += len(json.dumps(result).encode("utf-8"))
+                totals["in_browser"][1] += time.perf_counter() - start
+
+                if actual != expected:
+                    mismatches.append((os.path.basename(path), expected, actual))
+    finally:
+        driver.quit()
+
+    pages = len(paths) * args.repeat
+    print(f"{'path':<14}{'KB/page':>10}{'ms/page':>10}")
+    for name, (size, seconds) in totals.items():
+        print(f"{name:<14}{size / pages / 1024:>10.1f}{seconds / pages * 1000:>10.2f}")
+    print(f"{len(mismatches)} pages differ from FieldExtractor ({extractor.backend})")
+    for name, expected, actual in mismatches[:20]:
+        changed = sorted(key for key in set(expected or {}) | set(actual or {})
+                         if (expected or {}).get(key) != (actual or {}).get(key))
+        print(f"  {name}: {', '.join(changed) or 'markers'}")
+
+
+def bench_frontier(args):
+    """Enqueue, lease and acknowledge items through a fresh SQLite frontier"""
+    with tempfile.TemporaryDirectory() as tmp:
+        frontier = main.Frontier(os.path.join(tmp, "frontier.sqlite3"))
+
+        start = time.perf_counter()
+        for i in range(args.items):
+            frontier.put(f"https://www.linkedin.com/jobs/view/{4000000000 + i}/", "Remote")
+        frontier.close_input()
+        enqueue_seconds = time.perf_counter() - start
+
+        def worker():
+            while True:
+                job = frontier.get(timeout=5)
+                if job is None:
+                    return
+                frontier.done(job[0])
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(args.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        dequeue_seconds = time.perf_counter() - start
+
+        counts = frontier.counts()
+        frontier.close()
+
+    print(f"enqueue: {args.items / enqueue_seconds:,.0f} items/sec ({enqueue_seconds:.2f}s)")
+    print(f"lease+ack with {args.workers} workers: {args.items / dequeue_seconds:,.0f} items/sec ({dequeue_seconds:.2f}s)")
+    print(f"final states: {counts}")
+
+
+SEARCH_CARD = (
+    '<li><div class="artdeco-entity-lockup__content">'
+    '<a class="job-card-list__title--link" href="{base}/jobs/view/{job_id}/">Benchmark Engineer {job_id}</a>'
+    '<ul class="job-card-container__metadata-wrapper"><li>Ahmedabad, Gujarat, India ({job_type})</li></ul>'
+    '</div></li>'
+)
+
+JOB_PAGE = """<html><head><title>Benchmark Engineer {job_id}</title></head><body>
+<section class="top-card-layout"><div><h1 class="top-card-layout__title">Benchmark Engineer {job_id}</h1>
+<h4 class="top-card-layout__second-subline"><div><span><a class="topcard__org-name-link" href="{base}/company/company-{company}"> Company {company} </a></span>
+<span class="topcard__flavor topcard__flavor--bullet"> Ahmedabad, Gujarat, India </span></div>
+<div><span class="posted-time-ago__text"> {days} days ago </span><figcaption class="num-applicants__caption"> {applicants} applicants </figcaption></div></h4></div></section>
+<div class="description__text description__text--rich"><section><p>{description}</p></section></div>
+<ul class="description__job-criteria-list"><li class="description__job-criteria-item"><h3 class="description__job-criteria-subheader">Seniority level</h3><span class="description__job-criteria-text"> Mid-Senior level </span></li>
+<li class="description__job-criteria-item"><h3 class="description__job-criteria-subheader">Employment type</h3><span class="description__job-criteria-text">Full-time</span></li></ul>
+</body></html>"""
+
+
+COMPANY_PAGE = """<html><head><title>Company {company}</title></head><body><main>
+<section class="top-card-layout"><h1 class="top-card-layout__title">Company {company}</h1>
+<h2 class="top-card-layout__headline">Benchmarks for company {company}</h2>
+<h3 class="top-card-layout__first-subline">IT Services and IT Consulting Ahmedabad, Gujarat {followers} followers</h3></section>
+<section><p data-test-id="about-us__description">Company {company} builds software.</p>
+<dl><div data-test-id="about-us__industry"><dt>Industry</dt><dd>IT Services and IT Consulting</dd></div>
+<div data-test-id="about-us__size"><dt>Company size</dt><dd>51-200 employees</dd></div>
+<div data-test-id="about-us__headquarters"><dt>Headquarters</dt><dd>Ahmedabad, Gujarat</dd></div></dl></section>
+</main></body></html>"""
+
+SIGN_IN_PAGE = """<html><head><title>Sign In | LinkedIn</title></head><body>
+<form class="sign-in-form"><p>Sign in to see this job</p></form></body></html>"""
+
+
+class FakeLinkedInHandler(BaseHTTPRequestHandler):
+    """Synthetic search result, job detail and company pages with injected latency and 429s"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        fake = self.server
+        url = urlparse(self.path)
+        time.sleep(fake.latency * random.uniform(0.5, 1.5))
+        with fake.lock:
+            fake.requests += 1
+            scheduled = fake.requests in fake.throttle_requests
+        if scheduled or random.random() < fake.error_rate:
+            with fake.lock:
+                fake.throttled += 1
+            self._send(429, "<html><body>Too Many Requests</body></html>")
+        elif url.path.startswith("/jobs/search"):
+            self._send(200, self.search_page(parse_qs(url.query)))
+        elif url.path.startswith("/jobs/view/"):
+            job_id = url.path.rstrip("/").rsplit("/", 1)[-1]
+            if job_id in fake.walled_jobs and "li_at=" not in self.headers.get("Cookie", ""):
+                self._send(200, SIGN_IN_PAGE)
+            else:
+                self._send(200, self.job_page(job_id))
+        elif url.path.startswith("/company/"):
+            company = url.path.rstrip("/").rsplit("-", 1)[-1]
+            self._send(200, COMPANY_PAGE.format(company=company, followers=int(company) * 100 if company.isdigit() else 0))
+        else:
+            self._send(404, "<html><body>Not found</body></html>")
+
+    def search_page(self, params):
+        """25 cards per page; a query's job ids are 4000000000 + query number * 1000000 + rank"""
+        fake = self.server
+        query = int(params.get("keywords", ["bench-0"])[0].rsplit("-", 1)[-1])
+        start = int(params.get("start", ["0"])[0])
+        first = 4000000000 + query * 1000000
+        cards = "".join(
+            SEARCH_CARD.format(base=fake.base, job_id=first + rank, job_type=("Remote", "Hybrid", "On-site")[rank % 3])
+            for rank in range(start, min(start + 25, fake.jobs_per_query))
+        )
+        return f"<html><head><title>Jobs</title></head><body><ul>{cards}</ul></body></html>"
+
+    def job_page(self, job_id):
+        fake = self.server
+        number = int(job_id) if job_id.isdigit() else 0
+        return JOB_PAGE.format(
+            base=fake.base, job_id=job_id, company=number % 50, days=number % 14 + 1,
+            applicants=number % 200, description=fake.descriptions[number % len(fake.descriptions)]
+        )
+
+    def _send(self, status, body):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeLinkedIn(ThreadingHTTPServer):
+    """Local stand-in for LinkedIn on a free port
+
+    walled_jobs are job ids whose page is a sign-in page unless the request
+    carries a li_at session cookie, as a logged-in browser's does.
+    throttle_requests are request numbers, counted from 1, answered with a 429
+    on top of the random error_rate ones.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, jobs_per_query, latency_ms=0, error_rate=0.0, distinct_descriptions=20, walled_jobs=(),
+                 throttle_requests=()):
+        super().__init__(("127.0.0.1", 0), FakeLinkedInHandler)
+        self.base = f"http://127.0.0.1:{self.server_port}"
+        self.jobs_per_query = jobs_per_query
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+        self.walled_jobs = {str(job_id) for job_id in walled_jobs}
+        self.throttle_requests = set(throttle_requests)
+        self.descriptions = [f"Description {i}: " + "Build and run data pipelines in Python. " * 40
+                             for i in range(distinct_descriptions)]
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="fake-linkedin", daemon=True).start()
+        return self
+
+
+def process_tree_mb():
+    """Memory of every process started below this one, as PSS where the OS reports it"""
+    total = 0
+    for process in main.psutil.Process().children(recursive=True):
+        try:
+            memory = process.memory_full_info()
+            total += getattr(memory, "pss", memory.rss)
+        except main.psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+def _run_browsers(settings, results):
+    """Start a driver pool in one browser mode, load pages with every worker and measure the browsers"""
+    fake = FakeLinkedIn(settings["workers"] * settings["pages"]).start()
+    main.rate_controller = main.RateController()
+    main.SCRAPER_CONFIG["rate_limit"].update({"initial_rate": 1000, "max_rate": 1000, "initial_concurrency": 1000, "max_concurrency": 1000})
+    start = time.perf_counter()
+    pool = main.DriverPool(settings["workers"], headless=True, tabs_per_browser=settings["tabs"])
+    started = pool.start()
+    startup = time.perf_counter() - start
+
+    def worker(index):
+        for page in range(settings["pages"]):
+            with pool.checkout() as driver:
+                job_url = f"{fake.base}/jobs/view/{4000000000 + index * settings['pages'] + page}/"
+                main.JobScraper.fetch_in_browser(driver, job_url, job_url)
+
+    try:
+        start = time.perf_counter()
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(started)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        memory = process_tree_mb()
+    finally:
+        browsers = pool.stats()["browsers"]
+        pool.close()
+        fake.shutdown()
+
+    results[settings["tabs"]] = {
+        "workers": started,
+        "browsers": browsers,
+        "startup_seconds": startup,
+        "pages_per_sec": started * settings["pages"] / elapsed if elapsed else 0.0,
+        "memory_mb": memory,
+        "mb_per_worker": memory / started if started else 0.0,
+    }
+
+
+def bench_browsers(args):
+    if main.psutil is None:
+        raise SystemExit("The browsers benchmark requires psutil (pip install psutil)")
+    context = multiprocessing.get_context("spawn")
+    results = context.Manager().dict()
+    modes = [int(tabs) for tabs in args.tabs.split(",")]
+    for tabs in modes:
+        process = context.Process(target=_run_browsers, args=({"workers": args.workers, "tabs": tabs, "pages": args.pages}, results))
+        process.start()
+        process.join()
+
+    print(f"{args.workers} workers, {args.pages} job pages each (memory is PSS of browsers and chromedrivers)")
+    print(f"{'mode':<18}{'browsers':>10}{'startup s':>11}{'pages/sec':>11}{'memory MB':>11}{'MB/worker':>11}")
+    for tabs in modes:
+        mode = f"{tabs} tabs/browser" if tabs else "browser/worker"
+        if tabs not in results:
+            print(f"{mode:<18}{'failed':>10}")
+            continue
+        result = results[tabs]
+        print(f"{mode:<18}{result['browsers']:>10}{result['startup_seconds']:>11.1f}{result['pages_per_sec']:>11.1f}"
+              f"{result['memory_mb']:>11.0f}{result['mb_per_worker']:>11.0f}")
+
+
+def _run_startup(settings, results):
+    """Start and quit drivers one after another against settings["cache_dir"] and time each start"""
+    main.SCRAPER_CONFIG.update({"driver_cache_dir": settings["cache_dir"], "profile_templates": settings["templates"]})
+    times = []
+    for _ in range(settings["drivers"]):
+        start = time.perf_counter()
+        driver = main.DriverManager.create_driver(headless=True)
+        if driver is None:
+            break
+        times.append(time.perf_counter() - start)
+        driver.quit()
+    results[settings["mode"]] = times
+
+
+def bench_startup(args):
+    context = multiprocessing.get_context("spawn")
+    results = context.Manager().dict()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Each mode is a fresh process, as a restarted scraper would be; "cold" fills the cache that "warm" starts from
+        modes = [("cold", cache_dir, True), ("warm", cache_dir, True), ("no templates", cache_dir, False)]
+        for mode, directory, templates in modes:
+            settings = {"mode": mode, "cache_dir": directory, "templates": templates, "drivers": args.drivers}
+            process = context.Process(target=_run_startup, args=(settings, results))
+            process.start()
+            process.join()
+
+    print(f"{args.drivers} drivers started one after another (first includes patching chromedriver and building templates when cold)")
+    print(f"{'mode':<14}{'first s':>9}{'p50 s':>9}{'max s':>9}")
+    for mode, _, _ in modes:
+        times = results.get(mode)
+        if not times:
+            print(f"{mode:<14}{'failed':>9}")
+            continue
+        rest = sorted(times[1:] or times)
+        print(f"{mode:<14}{times[0]:>9.2f}{rest[len(rest) // 2]:>9.2f}{max(times):>9.2f}")
+
+
+def _run_e2e(settings, results):
+    """Run main() against a fake LinkedIn in a fresh process so metrics, CPU and RSS are its own"""
+    with tempfile.TemporaryDirectory() as tmp:
+        fake = FakeLinkedIn(settings["pages"] * 25, settings["latency_ms"], settings["error_rate"]).start()
+        if settings["mongo_uri"]:
+            main.DB_CONFIG["host"] = settings["mongo_uri"]
+        elif mongomock is not None:
+            main.pymongo.MongoClient = mongomock.MongoClient
+        else:
+            raise SystemExit("Install mongomock or pass --mongo-uri for the Mongo stand-in")
+        main.DB_CONFIG["db_name"] = f"benchmark_{os.getpid()}"
+        main.SCRAPER_CONFIG.update({
+            "search_url": f"{fake.base}/jobs/search/",
+            "search_queries": [{"keywords": f"bench-{i}"} for i in range(settings["queries"])],
+            "search_profile": False,
+            "max_pages": settings["pages"],
+            "num_drivers": settings["drivers"],
+            "http_workers": settings["workers"],
+            "fetch_mode": settings["fetch_mode"],
+            "incremental": False,
+            "rescrape_ttl_hours": 0,
+            "frontier_path": os.path.join(tmp, "frontier.sqlite3"),
+            "archive_enabled": False,
+            "metrics_summary_path": None,
+            "wait_for_jobs_timeout": 30
+        })
+        main.SCRAPER_CONFIG["rate_limit"].update(settings["rate_limit"])
+
+        start = time.perf_counter()
+        main.main(["--log-level", "WARNING", "--engine", settings["engine"]])
+        elapsed = time.perf_counter() - start
+
+        summary = main.Metrics.summary()
+        if settings["mongo_uri"]:
+            client = main.pymongo.MongoClient(settings["mongo_uri"])
+            client.drop_database(main.DB_CONFIG["db_name"])
+            client.close()
+        fake.shutdown()
+
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    counters = summary["counters"]
+    written = counters.get("jobs_inserted", 0) + counters.get("jobs_existing", 0)
+    job_latency = summary["stages"].get("job", {})
+    results[settings["key"]] = {
+        "jobs": written,
+        "seconds": elapsed,
+        "jobs_per_sec": written / elapsed if elapsed else 0.0,
+        "job_p50": job_latency.get("p50", 0.0),
+        "job_p99": job_latency.get("p99", 0.0),
+        "cpu_seconds": own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime,
+        "peak_rss_mb": own.ru_maxrss / 1024,
+        "children_peak_rss_mb": children.ru_maxrss / 1024,
+        "requests": fake.requests,
+        "throttled": fake.throttled,
+        "stage_means": {stage: histogram["mean"] for stage, histogram in summary["stages"].items()},
+        "counters": counters
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_previous(path):
+    """Latest stored result for each configuration, to compare the new run against"""
+    previous = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                previous[record["key"]] = record
+    return previous
+
+
+def mongomock_works():
+    """mongomock 4.3 can't take the sort argument pymongo 4.11+ passes to bulk updates"""
+    try:
+        mongomock.MongoClient().check.check.bulk_write([main.UpdateOne({"_id": 1}, {"$set": {"ok": 1}}, upsert=True)])
+    except TypeError:
+        return False
+    return True
+
+
+def bench_e2e(args):
+    """Drive the full pipeline for every drivers x workers combination and append the results"""
+    if not args.mongo_uri:
+        if mongomock is None:
+            raise SystemExit("Install mongomock (pip install -r requirements-dev.txt) or pass --mongo-uri for the Mongo stand-in")
+        if not mongomock_works():
+            raise SystemExit(f"mongomock {mongomock.__version__} can't run pymongo {main.pymongo.version}'s bulk writes; "
+                             "pip install -r requirements-dev.txt (pymongo<4.11) or pass --mongo-uri")
+    rate_limit = {}
+    if args.rate:
+        rate_limit = {"initial_rate": args.rate, "max_rate": max(args.rate, main.SCRAPER_CONFIG["rate_limit"]["max_rate"])}
+    previous = load_previous(args.results)
+    context = multiprocessing.get_context("spawn")
+    results = context.Manager().dict()
+    combinations = [(int(drivers), int(workers)) for drivers in args.drivers.split(",") for workers in args.workers.split(",")]
+
+    print(f"{args.queries} queries x {args.pages} pages ({args.queries * args.pages * 25} jobs), "
+          f"{args.engine} engine, {args.fetch_mode} fetch, {args.latency_ms}ms latency, {args.error_rate:.1%} 429s")
+    print(f"{'drivers':>8}{'workers':>8}{'jobs':>7}{'jobs/sec':>10}{'p50 s':>8}{'p99 s':>8}{'CPU s':>8}{'RSS MB':>8}{'vs prev':>9}")
+    with open(args.results, "a", encoding="utf-8") as output:
+        for drivers, workers in combinations:
+            key = f"{args.engine}|{args.fetch_mode}|q{args.queries}|p{args.pages}|d{drivers}|w{workers}|{args.latency_ms}ms|{args.error_rate}"
+            settings = {
+                "key": key, "drivers": drivers, "workers": workers, "engine": args.engine, "fetch_mode": args.fetch_mode,
+                "queries": args.queries, "pages": args.pages, "latency_ms": args.latency_ms,
+                "error_rate": args.error_rate, "mongo_uri": args.mongo_uri, "rate_limit": rate_limit
+            }
+            process = context.Process(target=_run_e2e, args=(settings, results))
+            process.start()
+            process.join()
+            if key not in results:
+                print(f"{drivers:>8}{workers:>8}{'failed':>7}")
+                continue
+
+            result = dict(results[key])
+            change = ""
+            if key in previous and previous[key]["jobs_per_sec"]:
+                change = f"{result['jobs_per_sec'] / previous[key]['jobs_per_sec'] - 1:+.1%}"
+            print(f"{drivers:>8}{workers:>8}{result['jobs']:>7}{result['jobs_per_sec']:>10.1f}{result['job_p50']:>8.2f}"
+                  f"{result['job_p99']:>8.2f}{result['cpu_seconds']:>8.1f}{result['peak_rss_mb']:>8.0f}{change:>9}")
+            output.write(json.dumps({
+                "key": key, "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "revision": git_revision(),
+                "label": args.label, "settings": settings, **result
+            }) + "\n")
+    print(f"Results appended to {args.results}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="LinkedIn scraper benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parse_parser = subparsers.add_parser("parse", help="Field extraction throughput over saved job pages")
+    parse_parser.add_argument("--corpus", required=True, help="Directory of saved job detail *.html files")
+    parse_parser.add_argument("--backends", default=",".join(main.FieldExtractor.BACKENDS))
+    parse_parser.add_argument("--repeat", type=int, default=3)
+    parse_parser.add_argument("--diff", action="store_true", help="Report fields that differ from the bs4 backend")
+    parse_parser.set_defaults(func=bench_parse)
+
+    browser_parser = subparsers.add_parser("browser-extract", help="In-browser extraction versus page_source over saved job pages")
+    browser_parser.add_argument("--corpus", required=True, help="Directory of saved job detail *.html files")
+    browser_parser.add_argument("--repeat", type=int, default=3)
+    browser_parser.set_defaults(func=bench_browser_extract)
+
+    browsers_parser = subparsers.add_parser("browsers", help="RSS per worker with a browser per worker versus shared-browser tabs")
+    browsers_parser.add_argument("--workers", type=int, default=main.SCRAPER_CONFIG["num_drivers"])
+    browsers_parser.add_argument("--tabs", default="0,5,10", help="Comma-separated browser_tabs values, 0 is a browser per worker")
+    browsers_parser.add_argument("--pages", type=int, default=20, help="Job pages loaded by each worker")
+    browsers_parser.set_defaults(func=bench_browsers)
+
+    startup_parser = subparsers.add_parser("startup", help="Driver startup time with a cold and a warm driver cache")
+    startup_parser.add_argument("--drivers", type=int, default=5, help="Drivers started in each mode")
+    startup_parser.set_defaults(func=bench_startup)
+
+    frontier_parser = subparsers.add_parser("frontier", help="Enqueue/dequeue rate of the persistent frontier")
+    frontier_parser.add_argument("--items", type=int, default=100000)
+    frontier_parser.add_argument("--workers", type=int, default=20)
+    frontier_parser.set_defaults(func=bench_frontier)
+
+    e2e_parser = subparsers.add_parser("e2e", help="Full pipeline against a local fake LinkedIn and a Mongo stand-in")
+    e2e_parser.add_argument("--drivers", default=str(main.SCRAPER_CONFIG["num_drivers"]),
+                            help="Comma-separated num_drivers values to run")
+    e2e_parser.add_argument("--workers", default=str(main.SCRAPER_CONFIG["http_workers"]),
+                            help="Comma-separated http_workers values to run")
+    e2e_parser.add_argument("--engine", choices=["asyncio", "threads"], default=main.SCRAPER_CONFIG["engine"])
+    e2e_parser.add_argument("--fetch-mode", choices=["http", "browser"], default=main.SCRAPER_CONFIG["fetch_mode"])
+    e2e_parser.add_argument("--queries", type=int, default=4)
+    e2e_parser.add_argument("--pages", type=int, default=4, help="Result pages per query (25 jobs each)")
+    e2e_parser.add_argument("--latency-ms", type=int, default=50, help="Mean server latency per request")
+    e2e_parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    e2e_parser.add_argument("--rate", type=float, default=None, help="Initial requests/sec per host (default: rate_limit)")
+    e2e_parser.add_argument("--mongo-uri", help="Local mongod to write to (a throwaway database); default is mongomock")
+    e2e_parser.add_argument("--results", default="benchmark_results.jsonl", help="JSON lines file results are appended to")
+    e2e_parser.add_argument("--label", help="Free-form note stored with the results, e.g. the change being measured")
+    e2e_parser.set_defaults(func=bench_e2e)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main_cli()
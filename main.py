@@ -2,20 +2,75 @@ from dateutil.relativedelta import relativedelta
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from datetime import datetime, timedelta
 import undetected_chromedriver as uc
-from threading import Thread, Lock
+from threading import Thread, Lock, RLock, Semaphore, Condition, Event, local
+from urllib.parse import urlparse, urlencode
 from bs4 import BeautifulSoup
+import soupsieve
+from contextlib import contextmanager, asynccontextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
 import concurrent.futures
-from queue import Queue
+from queue import Queue, Empty
+from collections import deque, OrderedDict
+from bson.binary import Binary
+from pymongo.errors import BulkWriteError, OperationFailure
+from pymongo import UpdateOne, ReturnDocument
+from array import array
+from requests.adapters import HTTPAdapter
+import requests
 import pymongo
 import random
+import bisect
+import heapq
 import time
 import re
 import signal
 import sys
+import os
+import shutil
+import subprocess
+import tempfile
+import sqlite3
+import socket
+import argparse
+import hashlib
+import json
+import asyncio
+import zlib
 import logging
 
+try:
+    import lxml.html
+    from lxml import etree
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    lxml = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.ERROR,
@@ -29,15 +84,37 @@ logger = logging.getLogger(__name__)
 
 # Database configuration
 DB_CONFIG = {
-    "host": "mongodb://localhost:27017/",
+    "host": os.environ.get("MONGO_URI", "mongodb://localhost:27017/"),
     "db_name": "local",
-    "collection_name": "jobs"
+    "collection_name": "jobs",
+    "state_collection_name": "crawl_state",  # Per-query high-water marks for incremental runs
+    "description_collection_name": "descriptions",  # Compressed job descriptions keyed by content hash
+    "dedup_descriptions": False,  # Store each distinct description once and reference it by hash from jobs
+    "company_collection_name": "companies",  # Company pages keyed by Company Link path
+    "write_batch_size": 500,  # Documents per bulk_write
+    "write_flush_interval": 2,  # Seconds before a partial batch is flushed
+    "write_buffer_size": 5000  # Max documents waiting for the writer before workers block
 }
 
 # Scraper configuration
 SCRAPER_CONFIG = {
-    "linkedin_url" : "https://www.linkedin.com/jobs/search/?currentJobId=4141450053&geoId=103644278&keywords=python%20developer&origin=JOB_SEARCH_PAGE_LOCATION_AUTOCOMPLETE&refresh=true",
+    "search_url": "https://www.linkedin.com/jobs/search/",
+    "search_queries": [  # Every combination to crawl; filters are extra search URL parameters (f_TPR, f_WT, f_E, ...)
+        {"keywords": "python developer", "geoId": "103644278", "filters": {}},
+    ],
+    "search_drivers": 1,  # Search workers sharing the result pages of all queries
+    "search_profile": True,  # Search in visible Chrome on the logged-in profile; False runs them headless without it
+    "incremental": False,  # Sort results by date and stop paginating once a query reaches jobs seen before
+    "rescrape_ttl_hours": 0,  # Re-scrape stored jobs older than this to refresh Applicants Apply, 0 disables
+    "rescrape_max_post_age_days": 14,  # Only refresh jobs posted within this many days
     "num_drivers": 10, # Default is 10, because it's better and faster, you can use more than 10 if you have powerful pc 
+    "driver_max_pages": 200,  # Recycle a driver after serving this many pages
+    "driver_max_memory_mb": 1500,  # Recycle a driver whose browser process tree grows past this (needs psutil)
+    "driver_probe_interval": 30,  # Seconds a driver may sit idle before it is probed on check-out
+    "driver_replace_attempts": 3,  # Tries to start a replacement driver, with doubling waits, before the slot is given up
+    "driver_replace_backoff": 2,  # Seconds before the second try
+    "browser_tabs": 0,  # Worker drivers sharing one Chrome as separate tabs, 0 starts a Chrome per worker
+    "tab_contexts": True,  # Give each shared-browser tab its own browser context (cookie jar)
     "user_agents": [
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36",
@@ -46,22 +123,170 @@ SCRAPER_CONFIG = {
     "chrome_user_data_dir": r"C:\\Users\\bhavi\\AppData\\Local\\Google\\Chrome\\User Data",
     "chrome_profile": "Default",
     "chrome_version": 133,
-    "page_load_wait": 2,
-    "job_detail_wait": (1, 2),  # Random wait between these values
+    "driver_cache_dir": os.path.join(os.path.expanduser("~"), ".cache", "linkedin-scraper"),  # Patched chromedriver per chrome_version and the template profiles
+    "profile_templates": True,  # Start every driver from a copy of a pre-warmed template profile
+    "login_cookies_path": "linkedin_cookies.json",  # Cookies (JSON list) loaded into the search template when chrome_user_data_dir doesn't exist
+    "log_level": "INFO",  # Scraper log level; --log-level overrides it
+    "metrics_host": "127.0.0.1",
+    "metrics_port": 9464,  # Prometheus /metrics and JSON /stats endpoint, None to disable
+    "metrics_summary_path": "metrics_summary.json",  # JSON summary written at shutdown, None to skip
+    "stage_buckets": (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30),  # Seconds, for per-stage latency histograms
+    "readiness": {  # Condition-based waits replacing fixed sleeps after navigation and scrolling
+        "page_timeout": 15,  # document.readyState == "complete"
+        "cards_timeout": 10,  # First job cards on a search page
+        "scroll_timeout": 3,  # New job cards after a scroll
+        "cards_stable_time": 0.3,  # Card count must hold this long to count as settled
+        "top_card_timeout": 10,  # Top card h4 on a job detail page
+        "poll_interval": 0.1,
+        "histogram_buckets": (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10)  # Seconds
+    },
     "max_pages": 8,  # Limit to 8 pages (25 jobs per page = 200 jobs)
     "max_scroll_attempts": 10,
     "retry_attempts": 3,
-    "wait_for_jobs_timeout": 120  # Wait up to 2 minutes for jobs
+    "wait_for_jobs_timeout": 120,  # Wait up to 2 minutes for jobs
+    "frontier_path": "frontier.sqlite3",  # Discovered job URLs and search progress, kept across runs for --resume
+    "frontier_lease_seconds": 300,  # In-flight jobs not acknowledged within this go back to pending
+    "frontier_batch_size": 500,  # Writes buffered per commit
+    "frontier_commit_interval": 1.0,  # Seconds before buffered writes are committed anyway
+    "frontier_prefetch": 16,  # Jobs leased per frontier round-trip
+    "max_job_attempts": 3,  # Failed fetches before a job is marked failed
+    "frontier_backend": "sqlite",  # "sqlite" for one process, "mongo" to share the frontier between nodes (implied by --role)
+    "frontier_collection_prefix": "frontier",  # Mongo frontier collections: <prefix>_jobs, _pages, _control, _nodes
+    "frontier_heartbeat_seconds": 30,  # Mongo frontier nodes extend their leases this often
+    "frontier_poll_interval": 0.5,  # Seconds between claim attempts while the Mongo frontier is empty
+    "archive_enabled": False,  # Keep every fetched job page in a compressed archive for replay.py
+    "archive_dir": "archive",
+    "archive_segment_mb": 256,  # Segment file size before a new one is started
+    "engine": "threads",  # "threads" is the thread-per-worker engine, "asyncio" runs the stages as coroutines on bounded queues
+    "async_fetches": 200,  # Job pages in flight at once with the asyncio engine in http fetch mode
+    "async_queue_size": 500,  # Capacity of each asyncio stage queue
+    "fetch_mode": "browser",  # "browser" loads job pages in Chrome, "http" fetches them over a pooled session with Chrome as fallback
+    "http_workers": 20,  # Job detail workers used in http fetch mode
+    "http_pool_size": 20,  # Keep-alive connections kept open to LinkedIn
+    "http_timeout": 15,
+    "browser_extract": False,  # Run the field rules inside Chrome and only fall back to page_source when their result looks wrong
+    "company_enrichment": False,  # Fetch the company page of every stored job into the companies collection (extra LinkedIn traffic)
+    "company_ttl_hours": 168,  # Company pages fetched within this are reused instead of fetched again
+    "company_retry_minutes": 15,  # A company whose page failed to load is not tried again for this long
+    "company_cache_size": 2048,  # Companies kept in memory in front of the collection
+    "company_workers": 4,  # Company pages fetched at once
+    "fallback_drivers": 2,  # Chrome instances used when an http-fetched page is missing the expected markers
+    "parser_backend": "lxml",  # "lxml", "selectolax" or "bs4" (the original html.parser path, kept for diffing output)
+    "parse_workers": os.cpu_count() or 2,  # Processes in the parse stage, 0 parses inline in the fetch workers
+    "parse_queue_size": 100,  # Fetched pages waiting to be parsed before fetch workers block
+    "parse_pool_retries": 2,  # Times a page is resubmitted after the parse process pool broke under it
+    "debug_pages_dir": None,  # Directory for pages that failed to load or parse, None keeps none
+    "debug_pages_max": 100,  # Pages kept in debug_pages_dir per run
+    "rate_limit": {  # Per-host pacing, adjusted AIMD-style from what LinkedIn sends back
+        "initial_rate": 2.0,  # Requests per second
+        "min_rate": 0.1,
+        "max_rate": 20.0,
+        "additive_increase": 0.05,  # Added to the rate after each good response
+        "multiplicative_decrease": 0.5,  # Rate and concurrency are scaled by this on a 429, auth wall or empty page
+        "initial_concurrency": 4,
+        "max_concurrency": 32,
+        "backoff_base": 2.0,  # Seconds, doubled per consecutive throttle and fully jittered
+        "backoff_max": 120.0,
+        "log_interval": 30  # Seconds between rate log lines, 0 disables them
+    }
+}
+
+# Field rules for job detail pages, compiled once per parser backend.
+# Each rule is (field, scope, selectors, attribute): scope "page" searches the
+# whole document and "top_card" searches the top card h4, the first selector
+# that matches wins, and attribute None takes the element text. A rule whose
+# attribute is a (heading, value) selector pair emits one field per match.
+TOP_CARD_SELECTORS = ("h1 + h4", "section.top-card-layout h4")
+# Cheap substring check used by fetch workers before a page is handed to the parse stage
+JOB_PAGE_MARKERS = ("<h1", "<h4")
+JOB_FIELD_SPEC = (
+    ("Job Title", "page", ("h1",), None),
+    ("Job Description", "page", (".description__text",), None),
+    (None, "page", ("ul.description__job-criteria-list li.description__job-criteria-item",),
+        ("h3.description__job-criteria-subheader", "span.description__job-criteria-text")),
+    ("Company Name", "top_card", ("a.topcard__org-name-link",), None),
+    ("Company Link", "top_card", ("a.topcard__org-name-link",), "href"),
+    ("Company Location", "top_card", ("span.topcard__flavor--bullet",), None),
+    ("Post Time", "top_card", ("span.posted-time-ago__text",), None),
+    ("Applicants Apply", "top_card", ("figcaption", "span.num-applicants__caption"), None),
+    ("Salary Description", "page", ("p.compensation__description",), None),
+    ("Salary Range", "page", ("div.salary",), None),
+)
+
+# JOB_FIELD_SPEC as a script run in the browser with execute_script, so a job
+# page comes back as a compact field list instead of its full page_source. It
+# mirrors FieldExtractor: text joins the stripped text nodes, the first
+# matching selector wins and criteria pairs emit one field each. Fields are
+# [name, value] pairs to keep their order.
+JOB_EXTRACTOR_SCRIPT = """
+const rules = __RULES__;
+const topCardSelectors = __TOP_CARD__;
+const first = (node, selectors) => {
+  for (const selector of selectors) {
+    const match = node === document ? document.querySelector(selector) : node.querySelector(':scope ' + selector);
+    if (match) return match;
+  }
+  return null;
+};
+const all = (node, selector) => node === document ? document.querySelectorAll(selector) : node.querySelectorAll(':scope ' + selector);
+const text = node => {
+  const walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+  let out = '';
+  while (walker.nextNode()) out += walker.currentNode.nodeValue.trim();
+  return out;
+};
+const result = {ready: document.readyState === 'complete', url: location.href, topCard: false, fields: null};
+const topCard = first(document, topCardSelectors);
+if (!topCard) return result;
+result.topCard = true;
+result.fields = [];
+for (const [field, scope, selectors, attribute] of rules) {
+  const node = scope === 'top_card' ? topCard : document;
+  if (Array.isArray(attribute)) {
+    for (const item of all(node, selectors[0])) {
+      const heading = first(item, [attribute[0]]), value = first(item, [attribute[1]]);
+      if (heading && value) result.fields.push([text(heading), text(value)]);
+    }
+    continue;
+  }
+  const match = first(node, selectors);
+  result.fields.push([field, !match ? null : attribute ? match.getAttribute(attribute) : text(match)]);
 }
+return result;
+""".replace("__RULES__", json.dumps(JOB_FIELD_SPEC)).replace("__TOP_CARD__", json.dumps(TOP_CARD_SELECTORS))
+
+# Field rules for public company pages, in the JOB_FIELD_SPEC format. The
+# "About" definition list becomes one field per entry (Website, Industry,
+# Company size, Headquarters, Type, Founded, Specialties).
+COMPANY_TOP_CARD_SELECTORS = ("section.top-card-layout", "main")
+COMPANY_PAGE_MARKERS = ("<h1",)
+COMPANY_FIELD_SPEC = (
+    ("Company Name", "top_card", ("h1.top-card-layout__title", "h1"), None),
+    ("Tagline", "top_card", ("h2.top-card-layout__headline", "h4.top-card-layout__second-subline"), None),
+    ("Summary", "top_card", ("h3.top-card-layout__first-subline",), None),
+    ("Logo", "top_card", ("img.top-card-layout__entity-image",), "data-delayed-url"),
+    ("About", "page", ('p[data-test-id="about-us__description"]',), None),
+    (None, "page", ('dl div[data-test-id^="about-us__"]',), ("dt", "dd")),
+    ("Employees On LinkedIn", "page", ('a[data-tracking-control-name="public_biz_employees-join"]', "p.face-pile__text"), None),
+)
 
 # Initialize global variables
 client = None
 db = None
 collection = None
-drivers = []
-job_queue = Queue()
+driver_pool = None
+search_drivers = []
+frontier = None
+page_archive = None
+company_enricher = None
+job_writer = None
+parse_stage = None
+rate_controller = None
+metrics_server = None
+known_jobs = None
+field_extractor = None
 lock = Lock()
-stop_event = False
+stop_event = Event()
 
 class DatabaseManager:
     """Manages database connections and operations"""
@@ -79,14 +304,60 @@ class DatabaseManager:
             logger.error(f"Failed to connect to MongoDB: {e}")
             sys.exit(1)
     
+    # Compound indexes for the common filters: company, location, post time and salary
+    JOB_INDEXES = (
+        [("Company Name", 1), ("Post Converted Time", -1)],
+        [("Company Location", 1), ("Post Converted Time", -1)],
+        [("Post Converted Time", -1)],
+        [("Scrape Time", -1)],
+        [("Salary Currency", 1), ("Salary Period", 1), ("Salary Min", 1)],
+    )
+    
+    @staticmethod
+    def ensure_indexes(collection):
+        """Create the unique Job Id index the bulk writer relies on and the query indexes"""
+        try:
+            collection.create_index("Job Id", unique=True)
+        except OperationFailure as e:
+            logger.error(f"Could not create unique index on Job Id (duplicate documents?): {e}")
+        for keys in DatabaseManager.JOB_INDEXES:
+            try:
+                collection.create_index(keys)
+            except OperationFailure as e:
+                logger.error(f"Could not create index {keys}: {e}")
+    
+    @staticmethod
+    def load_high_water_marks():
+        """Newest job id seen per search query key in earlier runs"""
+        state = db[DB_CONFIG["state_collection_name"]]
+        return {doc["_id"]: doc.get("newest_job_id", 0) for doc in state.find()}
+    
+    @staticmethod
+    def save_high_water_mark(query_key, newest_job_id):
+        """Raise a query's high-water mark to newest_job_id"""
+        db[DB_CONFIG["state_collection_name"]].update_one(
+            {"_id": query_key},
+            {"$max": {"newest_job_id": newest_job_id}, "$set": {"updated": datetime.now()}},
+            upsert=True
+        )
+    
+    @staticmethod
+    def find_stale_jobs():
+        """Stored jobs due for a re-scrape under rescrape_ttl_hours"""
+        now = datetime.now()
+        scraped_before = now - timedelta(hours=SCRAPER_CONFIG["rescrape_ttl_hours"])
+        posted_after = now - timedelta(days=SCRAPER_CONFIG["rescrape_max_post_age_days"])
+        return collection.find(
+            {"$and": [JobSchema.time_filter("Scrape Time", "$lt", scraped_before),
+                      JobSchema.time_filter("Post Converted Time", "$gte", posted_after)]},
+            {"Job Url": 1, "Job Type": 1, "_id": 0}
+        ).batch_size(1000)
+    
     @staticmethod
     def insert_job(job_data):
-        """Insert job data into the database with thread safety"""
-        with lock:
-            if not collection.find_one({"Job Id": job_data["Job Id"]}):
-                collection.insert_one(job_data)
-                return True
-            return False
+        """Hand job data to the background writer without waiting on the database"""
+        job_writer.submit(job_data)
+        return True
 
     @staticmethod
     def close():
@@ -95,230 +366,2827 @@ class DatabaseManager:
             client.close()
             logger.info("MongoDB connection closed")
 
-class DriverManager:
-    """Manages Selenium WebDriver instances"""
+class Frontier:
+    """Disk-backed crawl frontier in SQLite (WAL mode)
     
-    @staticmethod
-    def create_driver(headless=True, use_profile=False):
-        """Create and return a new undetected Chrome driver"""
+    Every discovered job is a row keyed by job id and moves from pending to
+    in_flight (leased until lease_until) to done or failed. Leases that expire
+    without an acknowledgement make the job pending again, so a dead worker's
+    jobs come back. Inserts and acknowledgements are buffered and committed
+    in batches; search_pages records finished result pages for --resume.
+    """
+    
+    PENDING = "pending"
+    IN_FLIGHT = "in_flight"
+    DONE = "done"
+    FAILED = "failed"
+    
+    def __init__(self, path=None, resume=False):
+        self.path = path or SCRAPER_CONFIG["frontier_path"]
+        self.lease_seconds = SCRAPER_CONFIG["frontier_lease_seconds"]
+        self.batch_size = SCRAPER_CONFIG["frontier_batch_size"]
+        self.commit_interval = SCRAPER_CONFIG["frontier_commit_interval"]
+        self.prefetch = SCRAPER_CONFIG["frontier_prefetch"]
+        
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY,
+            job_url TEXT NOT NULL,
+            job_type TEXT,
+            state TEXT NOT NULL DEFAULT 'pending',
+            lease_until REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            refresh INTEGER NOT NULL DEFAULT 0,
+            updated REAL
+        )""")
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(jobs)")]
+        if "refresh" not in columns:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN refresh INTEGER NOT NULL DEFAULT 0")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_until)")
+        self._db.execute("""CREATE TABLE IF NOT EXISTS search_pages (
+            query_key TEXT NOT NULL,
+            start INTEGER NOT NULL,
+            cards INTEGER NOT NULL,
+            PRIMARY KEY (query_key, start)
+        )""")
+        if resume:
+            self._db.execute("UPDATE jobs SET state = 'pending', lease_until = NULL WHERE state = 'in_flight'")
+            logger.info(f"Resuming frontier {self.path}: {self._counts()}")
+        else:
+            self._db.execute("DELETE FROM jobs")
+            self._db.execute("DELETE FROM search_pages")
+        
+        self._puts = []
+        self._acks = []
+        self._leased = deque()
+        self._last_commit = time.monotonic()
+        self._input_closed = False
+        self._available = Condition(Lock())
+    
+    def put(self, job_url, job_type, refresh=False):
+        """Add a discovered job; jobs already in the frontier are ignored
+        
+        refresh marks a stored job that is re-scraped to update its volatile fields.
+        """
+        job_id = JobScraper.extract_job_id(job_url)
+        with self._available:
+            self._puts.append((job_id, job_url, job_type, int(refresh), time.time()))
+            self._maybe_flush()
+            self._available.notify_all()
+    
+    def _maybe_flush(self):
+        if (len(self._puts) + len(self._acks) >= self.batch_size
+                or time.monotonic() - self._last_commit >= self.commit_interval):
+            self._flush()
+    
+    def _flush(self):
+        """Commit buffered inserts and acknowledgements in one transaction"""
+        if self._puts or self._acks:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR IGNORE INTO jobs (job_id, job_url, job_type, refresh, updated) VALUES (?, ?, ?, ?, ?)", self._puts)
+            for statement, params in self._acks:
+                self._db.execute(statement, params)
+            self._db.execute("COMMIT")
+            self._puts = []
+            self._acks = []
+        self._last_commit = time.monotonic()
+    
+    def _lease(self):
+        """Lease up to prefetch pending (or lease-expired) jobs"""
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        rows = self._db.execute(
+            "SELECT job_id, job_url, job_type, refresh FROM jobs "
+            "WHERE state = 'pending' OR (state = 'in_flight' AND lease_until < ?) LIMIT ?",
+            (now, self.prefetch)
+        ).fetchall()
+        self._db.executemany(
+            "UPDATE jobs SET state = 'in_flight', lease_until = ?, updated = ? WHERE job_id = ?",
+            [(now + self.lease_seconds, now, row[0]) for row in rows]
+        )
+        self._db.execute("COMMIT")
+        return rows
+    
+    def _has_in_flight(self):
+        row = self._db.execute(
+            "SELECT 1 FROM jobs WHERE state = 'in_flight' AND lease_until >= ? LIMIT 1", (time.time(),)).fetchone()
+        return row is not None
+    
+    def get(self, timeout=None):
+        """Lease the next job as (job_id, job_url, job_type, refresh)
+        
+        Returns None once input is closed and nothing is pending or in flight,
+        or when no job turns up within timeout seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._available:
+            while True:
+                if self._leased:
+                    return self._leased.popleft()
+                self._flush()
+                self._leased.extend(self._lease())
+                if self._leased:
+                    continue
+                if self._input_closed and not self._has_in_flight():
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                # Wake up at least every second so expired leases are noticed
+                self._available.wait(1 if remaining is None else min(1, remaining))
+    
+    def drained(self):
+        """True once input is closed and no job is pending or in flight"""
+        with self._available:
+            self._flush()
+            if not self._input_closed or self._leased or self._has_in_flight():
+                return False
+            return self._db.execute("SELECT 1 FROM jobs WHERE state = 'pending' LIMIT 1").fetchone() is None
+    
+    def _ack(self, statement, params):
+        with self._available:
+            self._acks.append((statement, params))
+            self._maybe_flush()
+            self._available.notify_all()
+    
+    def done(self, job_id):
+        """Mark a job as finished"""
+        self._ack("UPDATE jobs SET state = 'done', lease_until = NULL, updated = ? WHERE job_id = ?", (time.time(), job_id))
+    
+    def fail(self, job_id):
+        """Count a failed attempt; the job is retried until max_job_attempts"""
+        Metrics.inc("job_attempts_failed")
+        Metrics.job_finished(job_id, written=False)
+        self._ack(
+            "UPDATE jobs SET attempts = attempts + 1, lease_until = NULL, updated = ?, "
+            "state = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END WHERE job_id = ?",
+            (time.time(), SCRAPER_CONFIG["max_job_attempts"], job_id)
+        )
+    
+    def release(self, job_id):
+        """Put a job back to pending without counting an attempt (e.g. after a 429)"""
+        Metrics.inc("jobs_released")
+        Metrics.job_finished(job_id, written=False)
+        self._ack("UPDATE jobs SET state = 'pending', lease_until = NULL, updated = ? WHERE job_id = ?", (time.time(), job_id))
+    
+    def close_input(self):
+        """Signal that no more jobs will be put; get() returns None once drained"""
+        with self._available:
+            self._flush()
+            self._input_closed = True
+            self._available.notify_all()
+    
+    def page_done(self, query_key, start, cards):
+        """Record a finished search results page"""
+        with self._available:
+            self._db.execute("INSERT OR REPLACE INTO search_pages (query_key, start, cards) VALUES (?, ?, ?)",
+                             (query_key, start, cards))
+    
+    def finished_pages(self):
+        """Search pages finished in this or the resumed run, as {(query_key, start): cards}"""
+        with self._available:
+            rows = self._db.execute("SELECT query_key, start, cards FROM search_pages").fetchall()
+        return {(query_key, start): cards for query_key, start, cards in rows}
+    
+    def counts(self):
+        """Number of jobs in each state"""
+        with self._available:
+            return self._counts()
+    
+    def _counts(self):
+        rows = self._db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return dict(rows)
+    
+    def close(self):
+        """Commit anything buffered and close the database; unacknowledged leases expire for the next run"""
+        with self._available:
+            if self._db is None:
+                return
+            self._flush()
+            logger.info(f"Frontier state: {self._counts()}")
+            self._db.close()
+            self._db = None
+
+class MongoFrontier:
+    """Crawl frontier in MongoDB, shared by every node of a distributed run
+    
+    Same interface and job states as Frontier. Jobs are claimed one at a time
+    with find_one_and_update, so no two nodes ever hold the same lease, and a
+    heartbeat thread keeps extending this node's leases. When a node dies its
+    leases expire and other nodes reclaim the jobs. Lease times come from each
+    node's clock, so nodes need roughly synchronized clocks (NTP).
+    
+    The search role resets the frontier unless resuming, opens a new input
+    epoch and closes its input when pagination is done. Workers run until
+    input is closed and nothing is pending or in flight, but a closed input is
+    only trusted once the worker has seen the current run: the input open, a
+    newer epoch than the one it joined, or jobs to work on. So a worker
+    started before the search node doesn't exit on the previous run's closed
+    input, and one joining a closed run with jobs left still exits after them.
+    """
+    
+    PENDING = Frontier.PENDING
+    IN_FLIGHT = Frontier.IN_FLIGHT
+    DONE = Frontier.DONE
+    FAILED = Frontier.FAILED
+    
+    def __init__(self, database, role="all", resume=False, clock=time.time, node_id=None):
+        prefix = SCRAPER_CONFIG["frontier_collection_prefix"]
+        self.jobs = database[f"{prefix}_jobs"]
+        self.pages = database[f"{prefix}_pages"]
+        self.control = database[f"{prefix}_control"]
+        self.nodes = database[f"{prefix}_nodes"]
+        self.role = role
+        self.clock = clock  # Wall clock for lease times, shared by every node
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = SCRAPER_CONFIG["frontier_lease_seconds"]
+        self.batch_size = SCRAPER_CONFIG["frontier_batch_size"]
+        self.commit_interval = SCRAPER_CONFIG["frontier_commit_interval"]
+        self.prefetch = SCRAPER_CONFIG["frontier_prefetch"]
+        self.poll_interval = SCRAPER_CONFIG["frontier_poll_interval"]
+        
+        self.jobs.create_index([("state", 1), ("lease_until", 1)])
+        self.jobs.create_index("owner")
+        self.pages.create_index([("query_key", 1), ("start", 1)], unique=True)
+        if resume or role == "worker":
+            released = self.jobs.update_many({"state": self.IN_FLIGHT, "owner": self.node_id},
+                                             {"$set": {"state": self.PENDING, "lease_until": None}})
+            logger.info(f"Joining Mongo frontier as {self.node_id} ({role}): {self.counts()}"
+                        f"{f', released {released.modified_count} stale leases' if released.modified_count else ''}")
+        else:
+            self.jobs.delete_many({})
+            self.pages.delete_many({})
+            logger.info(f"Starting a new Mongo frontier as {self.node_id} ({role})")
+        if role != "worker":
+            control = self.control.find_one_and_update(
+                {"_id": "input"}, {"$set": {"closed": False, "opened": datetime.now()}, "$inc": {"epoch": 1}},
+                upsert=True, return_document=ReturnDocument.AFTER
+            )
+        else:
+            control = self.control.find_one({"_id": "input"}) or {}
+        self.epoch = control.get("epoch")
+        self._run_seen = not control.get("closed", True)
+        if not self._run_seen:
+            logger.info("Waiting for a search node to open the frontier input")
+        
+        self._puts = []
+        self._acks = []
+        self._leased = deque()
+        self._last_commit = time.monotonic()
+        self._lock = Lock()
+        self._stop = Event()
+        self._beat()
+        self._heartbeat = Thread(target=self._heartbeat_loop, name="frontier-heartbeat", daemon=True)
+        self._heartbeat.start()
+    
+    def _heartbeat_loop(self):
+        """Extend this node's leases and advertise the node until close()"""
+        while not self._stop.wait(SCRAPER_CONFIG["frontier_heartbeat_seconds"]):
+            try:
+                self._beat()
+            except Exception as e:
+                logger.warning(f"Frontier heartbeat failed: {e}")
+    
+    def _beat(self):
+        """Extend this node's leases once and record the node as alive"""
+        extended = self.jobs.update_many(
+            {"state": self.IN_FLIGHT, "owner": self.node_id},
+            {"$set": {"lease_until": self.clock() + self.lease_seconds}}
+        ).modified_count
+        self.nodes.update_one({"_id": self.node_id}, {"$set": {
+            "role": self.role, "last_seen": datetime.now(), "leases": extended
+        }}, upsert=True)
+    
+    def put(self, job_url, job_type, refresh=False):
+        """Add a discovered job; jobs already in the frontier are ignored"""
+        job_id = JobScraper.extract_job_id(job_url)
+        with self._lock:
+            self._puts.append(UpdateOne({"_id": job_id}, {"$setOnInsert": {
+                "url": job_url, "type": job_type, "state": self.PENDING, "lease_until": None,
+                "attempts": 0, "refresh": bool(refresh), "updated": self.clock()
+            }}, upsert=True))
+            self._maybe_flush()
+    
+    def _maybe_flush(self):
+        if (len(self._puts) + len(self._acks) >= self.batch_size
+                or time.monotonic() - self._last_commit >= self.commit_interval):
+            self._flush()
+    
+    def _flush(self):
+        """Send buffered inserts and acknowledgements as unordered bulk writes; call with the lock held"""
+        if self._puts:
+            self.jobs.bulk_write(self._puts, ordered=False)
+            self._puts = []
+        if self._acks:
+            # Acknowledgement pairs must apply in order (fail increments, then caps)
+            self.jobs.bulk_write(self._acks, ordered=True)
+            self._acks = []
+        self._last_commit = time.monotonic()
+    
+    def _claim(self):
+        """Atomically lease one pending (or lease-expired) job, or return None"""
+        now = self.clock()
+        return self.jobs.find_one_and_update(
+            {"$or": [{"state": self.PENDING}, {"state": self.IN_FLIGHT, "lease_until": {"$lt": now}}]},
+            {"$set": {"state": self.IN_FLIGHT, "lease_until": now + self.lease_seconds, "owner": self.node_id, "updated": now}},
+            projection={"url": 1, "type": 1, "refresh": 1},
+            return_document=ReturnDocument.AFTER
+        )
+    
+    def _input_closed(self):
+        """True once the input of the current run is closed"""
+        control = self.control.find_one({"_id": "input"}) or {}
+        if not control.get("closed", True) or control.get("epoch") != self.epoch:
+            self._run_seen = True
+        return self._run_seen and bool(control.get("closed"))
+    
+    def _has_work(self):
+        """True while any job is pending or in flight, expired leases included: those are still to be reclaimed"""
+        return self.jobs.find_one({"state": {"$in": [self.PENDING, self.IN_FLIGHT]}}, {"_id": 1}) is not None
+    
+    def get(self, timeout=None):
+        """Lease the next job as (job_id, job_url, job_type, refresh)
+        
+        Returns None once input is closed and nothing is pending or in flight
+        on any node, or when no job turns up within timeout seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if self._leased:
+                    return self._leased.popleft()
+                self._flush()
+                for _ in range(self.prefetch):
+                    doc = self._claim()
+                    if doc is None:
+                        break
+                    self._leased.append((doc["_id"], doc["url"], doc["type"], bool(doc.get("refresh"))))
+                if self._leased:
+                    self._run_seen = True
+                    continue
+            if self.drained():
+                return None
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+    
+    def drained(self):
+        """True once input is closed and no job is pending or in flight on any node"""
+        with self._lock:
+            self._flush()
+            if self._leased:
+                return False
+        if self._has_work():
+            self._run_seen = True
+            return False
+        return self._input_closed()
+    
+    def _ack(self, *operations):
+        with self._lock:
+            self._acks.extend(operations)
+            self._maybe_flush()
+    
+    def done(self, job_id):
+        """Mark a job as finished"""
+        self._ack(UpdateOne({"_id": job_id}, {"$set": {"state": self.DONE, "lease_until": None, "updated": self.clock()}}))
+    
+    def fail(self, job_id):
+        """Count a failed attempt; the job is retried until max_job_attempts"""
+        Metrics.inc("job_attempts_failed")
+        Metrics.job_finished(job_id, written=False)
+        self._ack(
+            UpdateOne({"_id": job_id}, {"$set": {"state": self.PENDING, "lease_until": None, "updated": self.clock()},
+                                        "$inc": {"attempts": 1}}),
+            UpdateOne({"_id": job_id, "attempts": {"$gte": SCRAPER_CONFIG["max_job_attempts"]}},
+                      {"$set": {"state": self.FAILED}})
+        )
+    
+    def release(self, job_id):
+        """Put a job back to pending without counting an attempt (e.g. after a 429)"""
+        Metrics.inc("jobs_released")
+        Metrics.job_finished(job_id, written=False)
+        self._ack(UpdateOne({"_id": job_id}, {"$set": {"state": self.PENDING, "lease_until": None, "updated": self.clock()}}))
+    
+    def close_input(self):
+        """Signal every node that no more jobs will be put (search role only)"""
+        with self._lock:
+            self._flush()
+        if self.role != "worker":
+            self.control.update_one({"_id": "input"}, {"$set": {"closed": True, "closed_at": datetime.now()}}, upsert=True)
+    
+    def page_done(self, query_key, start, cards):
+        """Record a finished search results page"""
+        self.pages.update_one({"query_key": query_key, "start": start}, {"$set": {"cards": cards}}, upsert=True)
+    
+    def finished_pages(self):
+        """Search pages finished in this or the resumed run, as {(query_key, start): cards}"""
+        return {(doc["query_key"], doc["start"]): doc["cards"] for doc in self.pages.find({}, {"_id": 0})}
+    
+    def counts(self):
+        """Number of jobs in each state, across every node"""
+        return {row["_id"]: row["count"] for row in self.jobs.aggregate([{"$group": {"_id": "$state", "count": {"$sum": 1}}}])}
+    
+    def close(self):
+        """Flush buffered writes, hand back prefetched jobs and stop the heartbeat; later calls do nothing"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        with self._lock:
+            if self._leased:
+                self._acks.extend(
+                    UpdateOne({"_id": job[0], "owner": self.node_id}, {"$set": {"state": self.PENDING, "lease_until": None}})
+                    for job in self._leased
+                )
+                self._leased.clear()
+            self._flush()
+        self.nodes.delete_one({"_id": self.node_id})
+        logger.info(f"Frontier state: {self.counts()}")
+
+class PageArchive:
+    """Content-addressed, compressed store of every fetched job page
+    
+    Pages are compressed one by one (zstd when zstandard is installed, zlib
+    otherwise) and appended to segment files, so any page can be read on its
+    own. An SQLite index maps each SHA-256 to its segment and offset, storing
+    identical pages once, and records every fetch by job id and time.
+    """
+    
+    def __init__(self, directory=None):
+        self.directory = directory or SCRAPER_CONFIG["archive_dir"]
+        os.makedirs(self.directory, exist_ok=True)
+        self.segment_limit = SCRAPER_CONFIG["archive_segment_mb"] * 1024 * 1024
+        self._lock = Lock()
+        self._pending = 0
+        self._segment_file = None
+        
+        self._db = sqlite3.connect(os.path.join(self.directory, "index.sqlite3"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""CREATE TABLE IF NOT EXISTS blobs (
+            sha TEXT PRIMARY KEY,
+            segment INTEGER NOT NULL,
+            offset INTEGER NOT NULL,
+            length INTEGER NOT NULL,
+            codec TEXT NOT NULL,
+            size INTEGER NOT NULL
+        )""")
+        self._db.execute("""CREATE TABLE IF NOT EXISTS fetches (
+            job_id TEXT NOT NULL,
+            fetched_at TEXT NOT NULL,
+            sha TEXT NOT NULL,
+            job_url TEXT,
+            job_type TEXT,
+            PRIMARY KEY (job_id, fetched_at)
+        )""")
+        self._db.commit()
+        
+        if zstandard is not None:
+            self.codec = "zstd"
+            self._compressor = zstandard.ZstdCompressor(level=10)
+        else:
+            self.codec = "zlib"
+        self._decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+        
+        row = self._db.execute("SELECT MAX(segment) FROM blobs").fetchone()
+        self.segment = row[0] or 1
+    
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, f"segment-{segment:06d}.bin")
+    
+    def _compress(self, data):
+        if self.codec == "zstd":
+            return self._compressor.compress(data)
+        return zlib.compress(data, 9)
+    
+    def _decompress(self, data, codec):
+        if codec == "zstd":
+            if self._decompressor is None:
+                raise ImportError("Reading zstd archive segments requires zstandard")
+            return self._decompressor.decompress(data)
+        return zlib.decompress(data)
+    
+    def store(self, job_data, html):
+        """Archive a fetched page under the job's id and scrape time"""
+        raw = html.encode("utf-8")
+        sha = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM blobs WHERE sha = ?", (sha,)).fetchone() is None:
+                compressed = self._compress(raw)
+                if self._segment_file is None:
+                    self._segment_file = open(self._segment_path(self.segment), "ab")
+                if self._segment_file.tell() and self._segment_file.tell() + len(compressed) > self.segment_limit:
+                    self._segment_file.close()
+                    self.segment += 1
+                    self._segment_file = open(self._segment_path(self.segment), "ab")
+                offset = self._segment_file.tell()
+                self._segment_file.write(compressed)
+                self._db.execute("INSERT INTO blobs VALUES (?, ?, ?, ?, ?, ?)",
+                                 (sha, self.segment, offset, len(compressed), self.codec, len(raw)))
+            self._db.execute("INSERT OR REPLACE INTO fetches VALUES (?, ?, ?, ?, ?)",
+                             (job_data["Job Id"], job_data["Scrape Time"], sha, job_data["Job Url"], job_data["Job Type"]))
+            self._pending += 1
+            if self._pending >= 100:
+                self._commit()
+    
+    def _commit(self):
+        # Segment data must reach disk before the index points at it
+        if self._segment_file is not None:
+            self._segment_file.flush()
+        self._db.commit()
+        self._pending = 0
+    
+    def read(self, sha):
+        """Return the archived page with the given SHA-256"""
+        with self._lock:
+            segment, offset, length, codec = self._db.execute(
+                "SELECT segment, offset, length, codec FROM blobs WHERE sha = ?", (sha,)).fetchone()
+            if self._segment_file is not None:
+                self._segment_file.flush()
+        with open(self._segment_path(segment), "rb") as f:
+            f.seek(offset)
+            return self._decompress(f.read(length), codec).decode("utf-8")
+    
+    def iter_latest(self, since=None):
+        """Yield (job_data, html) for the newest archived fetch of every job, in segment order"""
+        query = ("SELECT f.job_id, MAX(f.fetched_at), f.sha, f.job_url, f.job_type, b.segment, b.offset, b.length, b.codec "
+                 "FROM fetches f JOIN blobs b ON b.sha = f.sha ")
+        params = ()
+        if since:
+            query += "WHERE f.fetched_at >= ? "
+            params = (since,)
+        query += "GROUP BY f.job_id ORDER BY b.segment, b.offset"
+        with self._lock:
+            self._commit()
+            rows = self._db.execute(query, params).fetchall()
+        
+        handles = {}
         try:
-            user_agent = random.choice(SCRAPER_CONFIG["user_agents"])
-            options = uc.ChromeOptions()
-            options.add_argument(f"--user-agent={user_agent}")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            
-            if use_profile:
-                options.add_argument(f"--user-data-dir={SCRAPER_CONFIG['chrome_user_data_dir']}")
-                options.add_argument(f"--profile-directory={SCRAPER_CONFIG['chrome_profile']}")
-            
-            driver = uc.Chrome(options=options, version_main=SCRAPER_CONFIG["chrome_version"], headless=headless)
-            
-            # Block unnecessary resources for better performance
-            if not use_profile:
-                driver.execute_cdp_cmd("Network.setBlockedURLs", {
-                    "urls": [
-                        "*.jpg", "*.png", "*.svg", "*.gif", "*.webp", 
-                        "*.css", "*.woff2", "*.ttf", "*.mp4", "*.avi", "*.mkv",
-                        "*.json", "*.xml", "*.websocket", 
-                        "media.licdn.com", 
-                        "linkedin.com/li/track",
-                        "static.licdn.com/*", 
-                        "fonts.gstatic.com/*",
-                        "csp.withgoogle.com/*"
-                    ]
-                })
-                driver.execute_cdp_cmd("Network.enable", {})
-            
-            return driver
-        except Exception as e:
-            logger.error(f"Failed to create driver: {e}")
+            for job_id, fetched_at, _, job_url, job_type, segment, offset, length, codec in rows:
+                if segment not in handles:
+                    handles[segment] = open(self._segment_path(segment), "rb")
+                handle = handles[segment]
+                handle.seek(offset)
+                html = self._decompress(handle.read(length), codec).decode("utf-8")
+                yield {'Job Id': job_id, 'Job Url': job_url, 'Job Type': job_type, 'Scrape Time': fetched_at}, html
+        finally:
+            for handle in handles.values():
+                handle.close()
+    
+    def stats(self):
+        """Fetch and unique page counts with raw and compressed sizes"""
+        with self._lock:
+            fetches = self._db.execute("SELECT COUNT(*), COUNT(DISTINCT job_id) FROM fetches").fetchone()
+            blobs = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(length), 0) FROM blobs").fetchone()
+        return {"fetches": fetches[0], "jobs": fetches[1], "unique_pages": blobs[0],
+                "raw_bytes": blobs[1], "compressed_bytes": blobs[2]}
+    
+    def close(self):
+        """Flush segments and commit the index"""
+        with self._lock:
+            if self._db is None:
+                return
+            self._commit()
+            if self._segment_file is not None:
+                self._segment_file.close()
+                self._segment_file = None
+            self._db.close()
+            self._db = None
+
+class JobSchema:
+    """Typed storage form of scraped job data
+    
+    Scraping produces display strings. Before they are stored, "Not Mentioned"
+    becomes null, "Scrape Time" and "Post Converted Time" become datetimes,
+    "Applicants Apply" gains an integer "Applicants" next to it and the salary
+    text is parsed into min, max, currency and period fields. normalize() is
+    idempotent, so migrate.py runs documents written before it through it too.
+    """
+    
+    VERSION = 2
+    VERSION_FIELD = "Schema Version"
+    MISSING = "Not Mentioned"
+    TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+    TIME_FIELDS = ("Scrape Time", "Post Converted Time")
+    SALARY_FIELDS = ("Salary Min", "Salary Max", "Salary Currency", "Salary Period")
+    # Fields derived from a scraped field are stored right after it
+    DERIVED_FIELDS = {"Applicants Apply": ("Applicants",), "Salary Range": SALARY_FIELDS}
+    
+    CURRENCY = r"CA\$|A\$|US\$|[$€£₹]|\b(?:USD|EUR|GBP|INR|CAD|AUD)\b"
+    CURRENCY_CODES = {"$": "USD", "US$": "USD", "CA$": "CAD", "A$": "AUD", "€": "EUR", "£": "GBP", "₹": "INR"}
+    AMOUNT = r"\d[\d,]*(?:\.\d+)?(?:\s*[KkMm](?![A-Za-z]))?"
+    UNIT = r"(?:\s*/\s*[A-Za-z]+)?"
+    RANGE_SEPARATOR = r"\s*(?:-|–|—|to)\s*"
+    # "$120,000.00/yr - $150,000.00/yr", "USD 90K-110K" or "90,000 - 110,000 EUR"
+    SALARY_PATTERNS = (
+        re.compile(rf"(?P<currency>{CURRENCY})\s*(?P<min>{AMOUNT}){UNIT}(?:{RANGE_SEPARATOR}(?:{CURRENCY})?\s*(?P<max>{AMOUNT}))?"),
+        re.compile(rf"(?P<min>{AMOUNT}){UNIT}(?:{RANGE_SEPARATOR}(?P<max>{AMOUNT}))?{UNIT}\s*(?P<currency>\b(?:USD|EUR|GBP|INR|CAD|AUD)\b)"),
+    )
+    PERIODS = (
+        ("hour", re.compile(r"/\s*h(?:ou)?r\b|per hour|hourly|an hour", re.I)),
+        ("day", re.compile(r"/\s*day\b|per day|daily|a day", re.I)),
+        ("week", re.compile(r"/\s*w(?:ee)?k\b|per week|weekly|a week", re.I)),
+        ("month", re.compile(r"/\s*mo(?:nth)?\b|per month|monthly|a month", re.I)),
+        ("year", re.compile(r"/\s*y(?:ea)?r\b|per year|annual|a year|per annum|p\.a\.", re.I)),
+    )
+    
+    @staticmethod
+    def parse_time(value):
+        if isinstance(value, str):
+            try:
+                return datetime.strptime(value, JobSchema.TIME_FORMAT)
+            except ValueError:
+                return None
+        return value
+    
+    @staticmethod
+    def parse_applicants(text):
+        """The count LinkedIn shows as a lower bound ("Over 200 applicants" is 200), or None
+        
+        "Be among the first 25 applicants" only says there are fewer than 25,
+        so it is None.
+        """
+        if isinstance(text, int):
+            return text
+        if re.search(r"\bfirst\b", text or "", re.I):
             return None
+        match = re.search(r"\d[\d,]*", text or "")
+        return int(match.group().replace(",", "")) if match else None
     
     @staticmethod
-    def create_drivers(count, headless=True):
-        """Create multiple drivers and return them as a list"""
-        driver_list = []
-        for _ in range(count):
-            driver = DriverManager.create_driver(headless)
-            if driver:
-                driver_list.append(driver)
-        return driver_list
+    def parse_amount(text):
+        match = re.fullmatch(r"([\d,]+(?:\.\d+)?)\s*([KkMm])?", text.strip())
+        return float(match.group(1).replace(",", "")) * {"k": 1e3, "m": 1e6}.get((match.group(2) or "").lower(), 1)
     
     @staticmethod
-    def quit_drivers(driver_list):
-        """Quit all drivers in the list"""
-        for driver in driver_list:
-            try:
-                driver.quit()
-            except Exception:
-                pass
+    def parse_salary(text, require_range=False):
+        """Salary min, max, currency and period from text such as "$120,000.00/yr - $150,000.00/yr"
+        
+        Only an amount next to its currency counts, or with require_range
+        (free text such as the description) only a min - max range, so other
+        numbers around a currency mark don't pass for a salary.
+        """
+        salary = dict.fromkeys(JobSchema.SALARY_FIELDS)
+        matches = [match for pattern in JobSchema.SALARY_PATTERNS for match in pattern.finditer(text or "")
+                   if match.group("max") or not require_range]
+        if not matches:
+            return salary
+        match = min(matches, key=lambda match: match.start())
+        amounts = [JobSchema.parse_amount(match.group("min"))]
+        if match.group("max"):
+            amounts.append(JobSchema.parse_amount(match.group("max")))
+        salary["Salary Min"] = min(amounts)
+        salary["Salary Max"] = max(amounts)
+        salary["Salary Currency"] = JobSchema.CURRENCY_CODES.get(match.group("currency"), match.group("currency"))
+        salary["Salary Period"] = next((period for period, pattern in JobSchema.PERIODS if pattern.search(text)), None)
+        return salary
+    
+    @staticmethod
+    def normalize(job_data):
+        """Typed copy of job data, keeping field order"""
+        salary = JobSchema.parse_salary(job_data.get("Salary Range") if job_data.get("Salary Range") != JobSchema.MISSING else None)
+        if salary["Salary Min"] is None and job_data.get("Salary Description") != JobSchema.MISSING:
+            salary = JobSchema.parse_salary(job_data.get("Salary Description"), require_range=True)
+        derived = {"Applicants": JobSchema.parse_applicants(job_data.get("Applicants Apply")), **salary}
+        
+        normalized = {}
+        for field, value in job_data.items():
+            if field in derived or field == JobSchema.VERSION_FIELD:
+                continue  # Recomputed below
+            if value == JobSchema.MISSING:
+                value = None
+            elif field in JobSchema.TIME_FIELDS:
+                value = JobSchema.parse_time(value)
+            normalized[field] = value
+            for derived_field in JobSchema.DERIVED_FIELDS.get(field, ()):
+                normalized[derived_field] = derived[derived_field]
+        for field, value in derived.items():
+            normalized.setdefault(field, value)
+        normalized[JobSchema.VERSION_FIELD] = JobSchema.VERSION
+        return normalized
+    
+    @staticmethod
+    def time_filter(field, operator, when):
+        """Filter on a time field that matches both datetimes and not yet migrated strings"""
+        return {"$or": [{field: {operator: when}}, {field: {operator: when.strftime(JobSchema.TIME_FORMAT)}}]}
 
-class DateTimeHelper:
-    """Helper class for date and time operations"""
+class DescriptionStore:
+    """Stores each distinct job description once, compressed, keyed by content hash
+    
+    Jobs carry a "Job Description Hash" instead of the text. rehydrate() puts
+    "Job Description" back for readers. A small LRU of known hashes and texts
+    avoids repeat round-trips for popular descriptions.
+    """
+    
+    HASH_FIELD = "Job Description Hash"
+    TEXT_FIELD = "Job Description"
+    
+    def __init__(self, db, cache_size=10000):
+        self.collection = db[DB_CONFIG["description_collection_name"]]
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = Lock()
     
     @staticmethod
-    def convert_to_datetime(post_time):
-        """Convert LinkedIn relative time to datetime object"""
-        if post_time == "Not Mentioned":
-            return None
-            
-        current_time = datetime.now()
+    def normalize(text):
+        """Collapse whitespace so trivially different copies hash the same"""
+        return " ".join(text.split())
+    
+    @staticmethod
+    def digest(text):
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def attach_hash(job_data):
+        """Normalize the description and add its hash next to it, keeping field order"""
+        text = job_data.get(DescriptionStore.TEXT_FIELD)
+        if not text or text == "Not Mentioned":
+            return job_data
+        text = DescriptionStore.normalize(text)
+        hashed = {}
+        for field, value in job_data.items():
+            if field == DescriptionStore.TEXT_FIELD:
+                hashed[DescriptionStore.HASH_FIELD] = DescriptionStore.digest(text)
+                value = text
+            hashed[field] = value
+        return hashed
+    
+    def _remember(self, digest, text):
+        with self._lock:
+            self._cache[digest] = text
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def store(self, texts):
+        """Insert {hash: text} descriptions that are not stored yet"""
+        with self._lock:
+            new = {digest: text for digest, text in texts.items() if digest not in self._cache}
+        if not new:
+            return
+        now = datetime.now()
+        self.collection.bulk_write([
+            UpdateOne({"_id": digest}, {"$setOnInsert": {
+                "text": Binary(zlib.compress(text.encode("utf-8"))),
+                "length": len(text),
+                "first_seen": now
+            }}, upsert=True)
+            for digest, text in new.items()
+        ], ordered=False)
+        for digest, text in new.items():
+            self._remember(digest, text)
+    
+    def detach(self, batch):
+        """Store the batch's descriptions and drop the texts from the job documents"""
+        texts = {job_data[self.HASH_FIELD]: job_data[self.TEXT_FIELD]
+                 for job_data in batch if self.HASH_FIELD in job_data and self.TEXT_FIELD in job_data}
+        self.store(texts)
+        for job_data in batch:
+            if self.HASH_FIELD in job_data:
+                job_data.pop(self.TEXT_FIELD, None)
+    
+    def rehydrate(self, docs):
+        """Put "Job Description" back into documents that only carry its hash, in place"""
+        missing = set()
+        with self._lock:
+            for doc in docs:
+                digest = doc.get(self.HASH_FIELD)
+                if digest and digest not in self._cache:
+                    missing.add(digest)
+        if missing:
+            for stored in self.collection.find({"_id": {"$in": list(missing)}}):
+                self._remember(stored["_id"], zlib.decompress(stored["text"]).decode("utf-8"))
         
-        # Parse the post time
+        for i, doc in enumerate(docs):
+            digest = doc.get(self.HASH_FIELD)
+            if not digest or self.TEXT_FIELD in doc:
+                continue
+            with self._lock:
+                text = self._cache.get(digest)
+            docs[i] = {(self.TEXT_FIELD if field == self.HASH_FIELD else field): (text if field == self.HASH_FIELD else value)
+                       for field, value in doc.items()}
+        return docs
+    
+    def report(self, jobs):
+        """Dedup numbers for a jobs collection; inline descriptions of older documents are hashed on the fly"""
+        references = {}
+        lengths = {}
+        for doc in jobs.find({}, {self.HASH_FIELD: 1, self.TEXT_FIELD: 1, "_id": 0}).batch_size(5000):
+            digest = doc.get(self.HASH_FIELD)
+            text = doc.get(self.TEXT_FIELD)
+            if not digest and text and text != "Not Mentioned":
+                text = self.normalize(text)
+                digest = self.digest(text)
+                lengths[digest] = len(text)
+            if digest:
+                references[digest] = references.get(digest, 0) + 1
+        
+        unknown = [digest for digest in references if digest not in lengths]
+        for i in range(0, len(unknown), 1000):
+            for stored in self.collection.find({"_id": {"$in": unknown[i:i + 1000]}}, {"length": 1}):
+                lengths[stored["_id"]] = stored["length"]
+        stored_bytes = 0
         try:
-            number = int(post_time.split()[0])
-            
-            if 'minute' in post_time:
-                return current_time - timedelta(minutes=number)
-            elif 'hour' in post_time:
-                return current_time - timedelta(hours=number)
-            elif 'day' in post_time:
-                return current_time - timedelta(days=number)
-            elif 'week' in post_time:
-                return current_time - timedelta(weeks=number)
-            elif 'month' in post_time:
-                return current_time - relativedelta(months=number)
-            elif 'year' in post_time:
-                return current_time - relativedelta(years=number)
-            else:
-                return current_time
-        except (ValueError, IndexError):
-            return current_time
+            for row in self.collection.aggregate([{"$group": {"_id": None, "bytes": {"$sum": {"$binarySize": "$text"}}}}]):
+                stored_bytes = row["bytes"]
+        except OperationFailure:
+            stored_bytes = None  # $binarySize needs MongoDB 4.4+
+        
+        total = sum(references.values())
+        return {
+            "jobs_with_description": total,
+            "unique_descriptions": len(references),
+            "dedup_ratio": total / len(references) if references else 0.0,
+            "raw_chars": sum(lengths.get(digest, 0) * count for digest, count in references.items()),
+            "unique_chars": sum(lengths.get(digest, 0) for digest in references),
+            "stored_compressed_bytes": stored_bytes
+        }
 
-class JobScraper:
-    """Main class for scraping LinkedIn jobs"""
+class CompanyEnricher:
+    """Fetches company pages for stored jobs, at most once per company per TTL
+    
+    Companies are keyed by the path of their "Company Link" and kept in the
+    companies collection with their "Scrape Time". Lookups go through an
+    in-process LRU first, then the collection, and only fetch the page when
+    both are missing or older than company_ttl_hours. Concurrent lookups of
+    the same company wait for a single fetch. A company whose page could not
+    be loaded is skipped for company_retry_minutes, then tried again.
+    """
+    
+    def __init__(self, db, workers=None, ttl_hours=None, cache_size=None):
+        self.collection = db[DB_CONFIG["company_collection_name"]]
+        self.ttl = timedelta(hours=SCRAPER_CONFIG["company_ttl_hours"] if ttl_hours is None else ttl_hours)
+        self.cache_size = cache_size or SCRAPER_CONFIG["company_cache_size"]
+        self.executor = ThreadPoolExecutor(max_workers=workers or SCRAPER_CONFIG["company_workers"], thread_name_prefix="company")
+        self.retry_after = timedelta(minutes=SCRAPER_CONFIG["company_retry_minutes"])
+        self.hits = {"memory": 0, "store": 0, "coalesced": 0, "fetched": 0, "failed": 0, "skipped": 0}
+        self._cache = OrderedDict()
+        self._failures = OrderedDict()
+        self._in_flight = {}
+        self._lock = Lock()
+        self._local = local()
     
     @staticmethod
-    def get_job_links(url, driver):
-        """Scrape job links from LinkedIn search results pages"""
+    def key(company_link):
+        """Company pages are shared across LinkedIn subdomains and tracking parameters"""
+        return urlparse(company_link).path.rstrip("/").lower()
+    
+    def _fresh(self, company):
+        scraped = company.get("Scrape Time")
+        return isinstance(scraped, datetime) and scraped >= datetime.now() - self.ttl
+    
+    def _remember(self, key, company):
+        """Cache a loaded company, or note a failure so the company is skipped for retry_after"""
+        with self._lock:
+            cache = self._cache if company is not None else self._failures
+            cache[key] = company if company is not None else datetime.now()
+            cache.move_to_end(key)
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+            if company is not None:
+                self._failures.pop(key, None)
+    
+    def _failed_recently(self, key):
+        """Call with the lock held"""
+        failed = self._failures.get(key)
+        return failed is not None and failed >= datetime.now() - self.retry_after
+    
+    def _count(self, outcome):
+        with self._lock:
+            self.hits[outcome] += 1
+        Metrics.inc(f"company_{outcome}")
+    
+    def submit(self, company_link):
+        """Enrich a company in the background unless it is cached or already being fetched"""
+        if not company_link or company_link == JobSchema.MISSING:
+            return
+        key = self.key(company_link)
+        with self._lock:
+            if key in self._in_flight:
+                outcome = "coalesced"
+            elif key in self._cache and self._fresh(self._cache[key]):
+                self._cache.move_to_end(key)
+                outcome = "memory"
+            elif self._failed_recently(key):
+                outcome = "skipped"
+            else:
+                outcome = None
+        if outcome:
+            self._count(outcome)
+            return
         try:
-            driver.get(url)
-            time.sleep(SCRAPER_CONFIG["page_load_wait"])
-            
-            total_jobs = 0
-            
-            # Function to update page number in URL
-            def update_page(current_url, start_number):
-                if '&start=' in current_url:
-                    return re.sub(r'&start=\d+', f'&start={start_number}', current_url)
-                else:
-                    return current_url + f'&start={start_number}'
-            
-            # Iterate through pages
-            for page_num, i in enumerate(range(0, SCRAPER_CONFIG["max_pages"] * 25, 25), 1):
-                if stop_event:
-                    break
-                    
-                # If not first page, navigate to next page
-                if i > 0:
-                    updated_url = update_page(driver.current_url, i)
-                    driver.get(updated_url)
-                    time.sleep(SCRAPER_CONFIG["page_load_wait"])
-                
-                # Find job elements
-                job_elements = driver.find_elements(By.CLASS_NAME, "job-card-list__title--link")
-                
-                # Ensure jobs are visible with scrolling
-                scroll_attempts = 0
-                while len(job_elements) < 25 and scroll_attempts < SCRAPER_CONFIG["max_scroll_attempts"]:
-                    if not job_elements:
-                        break
-                    
-                    try:
-                        driver.execute_script("arguments[0].scrollIntoView();", job_elements[-1])
-                        time.sleep(0.5)  # Reduced wait time for scrolling
-                        job_elements = driver.find_elements(By.CLASS_NAME, "job-card-list__title--link")
-                    except (IndexError, Exception) as e:
-                        logger.warning(f"Scroll error: {e}")
-                        break
-                    
-                    scroll_attempts += 1
-                
-                # Process job elements
-                page_jobs = 0
-                for job_element in job_elements:
-                    try:
-                        job_url = job_element.get_attribute('href')
-                        
-                        # Extract job type if available
-                        try:
-                            metadata_wrapper = job_element.find_element(By.XPATH, 
-                                "./ancestor::div[contains(@class, 'artdeco-entity-lockup__content')]//ul[contains(@class, 'job-card-container__metadata-wrapper')]")
-                            match = re.search(r'\((.*?)\)', metadata_wrapper.text.strip())
-                            job_type = match.group(1) if match else "Unknown"
-                        except Exception:
-                            job_type = "Unknown"
-                        
-                        # Add job to queue
-                        job_queue.put((job_url, job_type))
-                        page_jobs += 1
-                    except Exception as e:
-                        logger.warning(f"Error processing job element: {e}")
-                
-                total_jobs += page_jobs
-                logger.info(f"Added {page_jobs} jobs from Page {page_num} | Total: {total_jobs}")
-                
-                # Check if we've reached the end of available jobs
-                if page_jobs == 0:
-                    logger.info("No more jobs found, stopping pagination")
+            self.executor.submit(self.get, company_link)
+        except RuntimeError:
+            pass  # Closed during shutdown
+    
+    def get(self, company_link):
+        """Company document for a link, fetched only if not cached within the TTL; None if it failed"""
+        key = self.key(company_link)
+        with self._lock:
+            if key in self._cache and self._fresh(self._cache[key]):
+                self._cache.move_to_end(key)
+                company = self._cache[key]
+                owner, outcome = None, "memory"
+            elif self._failed_recently(key) and key not in self._in_flight:
+                company = None
+                owner, outcome = None, "skipped"
+            else:
+                future = self._in_flight.get(key)
+                owner = future is None
+                if owner:
+                    future = self._in_flight[key] = concurrent.futures.Future()
+        if owner is None:
+            self._count(outcome)
+            return company
+        if not owner:
+            self._count("coalesced")
+            return future.result()
+        
+        company = None
+        try:
+            company = self._load(key, company_link)
+        except Exception as e:
+            logger.warning(f"Error enriching company {company_link}: {e}")
+            self._count("failed")
+        finally:
+            self._remember(key, company)
+            with self._lock:
+                del self._in_flight[key]
+            future.set_result(company)
+        return company
+    
+    def _load(self, key, company_link):
+        stored = self.collection.find_one({"_id": key})
+        if stored is not None and self._fresh(stored):
+            self._count("store")
+            return stored
+        
+        parsed = urlparse(company_link)
+        url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+        with Metrics.timer("company_fetch"):
+            html = HttpFetcher.fetch(url, COMPANY_PAGE_MARKERS)
+        fields = self._extractor().extract(html) if html else None
+        if not fields:
+            self._count("failed")
+            return None
+        
+        company = {"_id": key, "Company Link": url}
+        company.update({field: value or None for field, value in fields.items()})
+        company["Scrape Time"] = datetime.now()
+        self.collection.replace_one({"_id": key}, company, upsert=True)
+        self._count("fetched")
+        return company
+    
+    def _extractor(self):
+        # Compiled selectors are not shared between threads
+        extractor = getattr(self._local, "extractor", None)
+        if extractor is None:
+            extractor = self._local.extractor = FieldExtractor(
+                spec=COMPANY_FIELD_SPEC, top_card_selectors=COMPANY_TOP_CARD_SELECTORS, required="Company Name"
+            )
+        return extractor
+    
+    def stats(self):
+        """Lookup outcomes and the share answered without fetching"""
+        with self._lock:
+            stats = dict(self.hits)
+        lookups = stats["memory"] + stats["store"] + stats["coalesced"] + stats["fetched"] + stats["failed"]
+        stats["hit_rate"] = round((stats["memory"] + stats["store"] + stats["coalesced"]) / lookups, 3) if lookups else None
+        return stats
+    
+    def close(self, wait=True):
+        """Finish queued lookups, or drop them when wait is False"""
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
+
+class JobWriter:
+    """Buffers job documents and flushes them to MongoDB as unordered bulk upserts
+    
+    New jobs are inserted whole. For jobs that already exist only the
+    REFRESH_FIELDS are updated, which keeps re-scraped jobs current, unless
+    overwrite is set (replay.py), in which case every field is replaced.
+    With a DescriptionStore, description texts are moved to it before writing.
+    With a CompanyEnricher, the companies of written jobs are enriched.
+    """
+    
+    REFRESH_FIELDS = ("Applicants Apply", "Applicants", "Scrape Time")
+    
+    def __init__(self, collection, batch_size=None, flush_interval=None, buffer_size=None, overwrite=False, descriptions=None, companies=None):
+        self.collection = collection
+        self.overwrite = overwrite
+        self.descriptions = descriptions
+        self.companies = companies
+        self.batch_size = batch_size or DB_CONFIG["write_batch_size"]
+        self.flush_interval = flush_interval or DB_CONFIG["write_flush_interval"]
+        self.buffer = Queue(maxsize=buffer_size or DB_CONFIG["write_buffer_size"])
+        self.inserted = 0
+        self.existing = 0
+        self.failed = 0
+        self._closed = False
+        self._thread = Thread(target=self._run, name="job-writer", daemon=True)
+    
+    def start(self):
+        """Start the background flush thread"""
+        self._thread.start()
+        return self
+    
+    def submit(self, job_data):
+        """Queue a document for writing; blocks only when the buffer is full"""
+        if self._closed:
+            raise RuntimeError("JobWriter is closed")
+        self.buffer.put(job_data)
+    
+    def _run(self):
+        """Collect documents until the batch is full or the flush interval passes"""
+        batch = []
+        deadline = time.time() + self.flush_interval
+        while True:
+            timeout = max(0, deadline - time.time())
+            try:
+                job_data = self.buffer.get(timeout=timeout)
+                if job_data is None:
                     break
+                batch.append(job_data)
+            except Empty:
+                pass
             
-            return total_jobs
-        except Exception as e:
-            logger.error(f"Error in get_job_links: {e}")
-            return 0
+            if len(batch) >= self.batch_size or time.time() >= deadline:
+                self.flush(batch)
+                batch = []
+                deadline = time.time() + self.flush_interval
+        
+        self.flush(batch)
     
-    @staticmethod
-    def get_job_details(driver):
-        """Extract detailed information from individual job pages"""
-        logger.info('Waiting for job links to be available...')
+    def flush(self, batch):
+        """Write a batch as upserts, counting duplicate keys as already existing
         
-        # Wait for jobs to be available
-        start_time = time.time()
-        while job_queue.empty() and not stop_event:
-            time.sleep(1)
-            if time.time() - start_time > SCRAPER_CONFIG["wait_for_jobs_timeout"]:
-                logger.warning(f"No jobs found after waiting {SCRAPER_CONFIG['wait_for_jobs_timeout']} seconds, exiting worker")
-                return
+        Jobs whose write failed for any other reason are failed in the
+        frontier, so they are retried, and are not treated as stored.
+        """
+        if not batch:
+            return
+        
+        if self.descriptions is not None:
+            try:
+                self.descriptions.detach(batch)
+            except Exception as e:
+                # Descriptions stay inline so no job points at a missing text
+                logger.warning(f"Error storing descriptions, writing them inline: {e}")
         
-        if stop_event:
+        operations = []
+        for job_data in batch:
+            if self.overwrite:
+                update = {"$set": job_data}
+                if DescriptionStore.HASH_FIELD in job_data:
+                    update["$unset"] = {DescriptionStore.TEXT_FIELD: ""}
+                operations.append(UpdateOne({"Job Id": job_data["Job Id"]}, update, upsert=True))
+                continue
+            refreshed = {field: job_data[field] for field in self.REFRESH_FIELDS if field in job_data}
+            inserted = {field: value for field, value in job_data.items() if field not in refreshed}
+            operations.append(UpdateOne({"Job Id": job_data["Job Id"]}, {"$setOnInsert": inserted, "$set": refreshed}, upsert=True))
+        inserted, existing, failed = self.inserted, self.existing, self.failed
+        failed_indexes = set()
+        started = time.monotonic()
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            self.inserted += result.upserted_count
+            self.existing += len(batch) - result.upserted_count
+        except BulkWriteError as e:
+            details = e.details
+            errors = details.get("writeErrors", [])
+            duplicates = sum(1 for error in errors if error.get("code") == 11000)
+            self.inserted += details.get("nUpserted", 0)
+            self.existing += len(batch) - details.get("nUpserted", 0) - (len(errors) - duplicates)
+            self.failed += len(errors) - duplicates
+            for error in errors:
+                if error.get("code") != 11000:
+                    failed_indexes.add(error["index"])
+                    logger.error(f"Failed to write job {batch[error['index']]['Job Id']}: {error.get('errmsg')}")
+        except Exception as e:
+            self.failed += len(batch)
+            failed_indexes = set(range(len(batch)))
+            logger.error(f"Error writing {len(batch)} jobs to database: {e}")
+        finally:
+            Metrics.observe("db_write", time.monotonic() - started)
+            Metrics.inc("jobs_inserted", self.inserted - inserted)
+            Metrics.inc("jobs_existing", self.existing - existing)
+            Metrics.inc("write_failures", self.failed - failed)
+        
+        for index in sorted(failed_indexes):
+            if frontier is not None:
+                frontier.fail(batch[index]["Job Id"])
+            else:
+                Metrics.job_finished(batch[index]["Job Id"], written=False)
+        batch = [job_data for index, job_data in enumerate(batch) if index not in failed_indexes]
+        for job_data in batch:
+            Metrics.job_finished(job_data["Job Id"])
+        if known_jobs is not None:
+            known_jobs.add(job_data["Job Id"] for job_data in batch)
+        if frontier is not None:
+            for job_data in batch:
+                frontier.done(job_data["Job Id"])
+        if self.companies is not None:
+            for job_data in batch:
+                self.companies.submit(job_data.get("Company Link"))
+        
+        logger.info(f"Flushed {len(batch)} jobs | Inserted: {self.inserted} | Existing: {self.existing} | Failed: {self.failed}")
+    
+    def close(self):
+        """Flush everything still buffered and stop the writer thread"""
+        if self._closed:
             return
-            
-        logger.info('Processing jobs...')
+        self._closed = True
+        if self._thread.is_alive():
+            self.buffer.put(None)
+            self._thread.join()
+
+class KnownJobIndex:
+    """Compact set of numeric job ids already stored in the database
+    
+    Ids live in a sorted array of unsigned 64-bit integers (8 bytes per id) and
+    are looked up with bisect. New ids go into a small set that is merged into
+    the array once it grows past merge_threshold.
+    """
+    
+    def __init__(self, job_ids=(), merge_threshold=10000):
+        self._ids = array('Q', sorted(set(job_ids)))
+        self._recent = set()
+        self._merge_threshold = merge_threshold
+        self._lock = Lock()
+    
+    @staticmethod
+    def load(collection, chunk_size=100000):
+        """Build the index from every Job Id stored in the collection
         
-        # Process jobs from queue
-        while not stop_event:
-            job_url = None
-            job_type = None
+        Ids are sorted in chunks of chunk_size and the chunks merged into the
+        array, so loading peaks at about 16 bytes per id instead of holding a
+        set and a sorted list of all of them.
+        """
+        chunks = []
+        chunk = []
+        cursor = collection.find({}, {"Job Id": 1, "_id": 0}).batch_size(10000)
+        for doc in cursor:
             try:
-                # Get job from queue with timeout
-                job_url, job_type = job_queue.get(timeout=5)
-                
-                # Check if the job is None (end signal)
-                if job_url is None:
-                    job_queue.task_done()
-                    break
-                
-                logger.info(f"Processing job: {job_url}")
-                
-                # Extract job ID from URL
-                try:
-                    job_id = job_url.split('jobs/view/')[-1].split('/')[0]
-                    job_id = job_id.split('?')[0]  # Handle URLs with query parameters
-                except Exception as e:
-                    logger.error(f"Error extracting job ID from URL {job_url}: {e}")
-                    job_queue.task_done()
-                    continue
-                
-                logger.debug(f"Job ID: {job_id}")
-                
-                # Skip if job already exists
-                if collection.find_one({'Job Id': job_id}):
-                    logger.info(f"Job {job_id} already exists in database, skipping")
-                    job_queue.task_done()
-                    continue
+                job_id = int(doc["Job Id"])
+            except (KeyError, ValueError, TypeError):
+                continue
+            if 0 <= job_id < 2 ** 64:
+                chunk.append(job_id)
+            if len(chunk) >= chunk_size:
+                chunk.sort()
+                chunks.append(array('Q', chunk))
+                chunk = []
+        if chunk:
+            chunk.sort()
+            chunks.append(array('Q', chunk))
+        
+        index = KnownJobIndex()
+        index._ids = array('Q', KnownJobIndex._unique(heapq.merge(*chunks)))
+        logger.info(f"Loaded {len(index)} known job ids")
+        return index
+    
+    @staticmethod
+    def _unique(sorted_ids):
+        """Drop repeats from an ascending stream of ids"""
+        previous = None
+        for job_id in sorted_ids:
+            if job_id != previous:
+                yield job_id
+                previous = job_id
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._ids) + len(self._recent)
+    
+    def __contains__(self, job_id):
+        try:
+            job_id = int(job_id)
+        except (ValueError, TypeError):
+            return False
+        with self._lock:
+            return job_id in self._recent or self._in_array(job_id)
+    
+    def _in_array(self, job_id):
+        position = bisect.bisect_left(self._ids, job_id)
+        return position < len(self._ids) and self._ids[position] == job_id
+    
+    def add(self, job_ids):
+        """Record newly stored job ids"""
+        with self._lock:
+            for job_id in job_ids:
+                try:
+                    job_id = int(job_id)
+                except (ValueError, TypeError):
+                    continue
+                if 0 <= job_id < 2 ** 64 and not self._in_array(job_id):
+                    self._recent.add(job_id)
+            if len(self._recent) >= self._merge_threshold:
+                self._ids = array('Q', heapq.merge(self._ids, sorted(self._recent)))
+                self._recent.clear()
+
+class DriverManager:
+    """Manages Selenium WebDriver instances
+    
+    Drivers start from a chromedriver patched once per chrome_version and
+    cached in driver_cache_dir, and from copies of template profiles kept
+    there: "worker" is a warmed-up clean profile, "search" is the logged-in
+    profile, built from chrome_user_data_dir or from login_cookies_path.
+    """
+    
+    PROFILE_COPY_IGNORE = shutil.ignore_patterns("Cache", "Code Cache", "GPUCache", "Service Worker", "Singleton*", "*.lock")
+    _chromedriver_path = None
+    _chromedriver_lock = Lock()
+    _template_lock = Lock()
+    
+    BLOCKED_URLS = [
+        "*.jpg", "*.png", "*.svg", "*.gif", "*.webp", 
+        "*.css", "*.woff2", "*.ttf", "*.mp4", "*.avi", "*.mkv",
+        "*.json", "*.xml", "*.websocket", 
+        "media.licdn.com", 
+        "linkedin.com/li/track",
+        "static.licdn.com/*", 
+        "fonts.gstatic.com/*",
+        "csp.withgoogle.com/*"
+    ]
+    
+    @staticmethod
+    def block_resources(driver):
+        """Block unnecessary resources in the driver's current tab for better performance"""
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": DriverManager.BLOCKED_URLS})
+        driver.execute_cdp_cmd("Network.enable", {})
+    
+    @staticmethod
+    def installed_chrome_version():
+        """Major version of the installed Chrome, or None if it can't be told"""
+        executable = uc.find_chrome_executable()
+        if not executable:
+            return None
+        try:
+            output = subprocess.run([executable, "--version"], capture_output=True, text=True, timeout=15).stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+        match = re.search(r"\b(\d+)\.\d+\.\d+", output)
+        return int(match.group(1)) if match else None
+    
+    @staticmethod
+    def chromedriver_path():
+        """Patched chromedriver for chrome_version (or the installed Chrome), downloaded and patched only if not cached yet
+        
+        The cache is keyed by major version, so a Chrome update gets a new
+        chromedriver. Returns None to leave it to undetected_chromedriver when
+        the version can't be told or patching fails.
+        """
+        with DriverManager._chromedriver_lock:
+            if DriverManager._chromedriver_path:
+                return DriverManager._chromedriver_path
+            version = SCRAPER_CONFIG["chrome_version"] or DriverManager.installed_chrome_version()
+            if not version:
+                logger.warning("Could not tell the installed Chrome version, patching chromedriver per driver")
+                return None
+            cache_dir = SCRAPER_CONFIG["driver_cache_dir"]
+            path = os.path.join(cache_dir, f"chromedriver-{version}" + (".exe" if os.name == "nt" else ""))
+            try:
+                if not (os.path.exists(path) and uc.Patcher(executable_path=path, version_main=version).is_binary_patched()):
+                    started = time.monotonic()
+                    os.makedirs(cache_dir, exist_ok=True)
+                    patcher = uc.Patcher(version_main=version)
+                    patcher.auto()
+                    # Staged and renamed so other processes sharing the cache never run a partial copy
+                    staging = f"{path}.{os.getpid()}.{random.getrandbits(32):08x}"
+                    shutil.copy2(patcher.executable_path, staging)
+                    os.replace(staging, path)
+                    logger.info(f"Patched chromedriver {version} cached at {path} in {time.monotonic() - started:.1f}s")
+            except Exception as e:
+                logger.warning(f"Could not cache a patched chromedriver, patching per driver: {e}")
+                return None
+            DriverManager._chromedriver_path = path
+            return path
+    
+    @staticmethod
+    def chrome_options(user_data_dir=None, profile_directory=None):
+        options = uc.ChromeOptions()
+        options.add_argument(f"--user-agent={random.choice(SCRAPER_CONFIG['user_agents'])}")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        if user_data_dir:
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+        if profile_directory:
+            options.add_argument(f"--profile-directory={profile_directory}")
+        return options
+    
+    @staticmethod
+    def start_chrome(options, headless):
+        return uc.Chrome(
+            options=options, version_main=SCRAPER_CONFIG["chrome_version"], headless=headless,
+            driver_executable_path=DriverManager.chromedriver_path()
+        )
+    
+    @staticmethod
+    def load_cookies(path):
+        """Cookies exported from a logged-in browser (get_cookies() format) as Network.setCookies parameters"""
+        with open(path, encoding="utf-8") as f:
+            cookies = json.load(f)
+        params = []
+        for cookie in cookies:
+            param = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite") if key in cookie}
+            if "expiry" in cookie or "expires" in cookie:
+                param["expires"] = cookie.get("expiry", cookie.get("expires"))
+            params.append(param)
+        return params
+    
+    @staticmethod
+    def build_template(name, target):
+        """Build the template profile name ("worker" or "search") in target"""
+        source = SCRAPER_CONFIG["chrome_user_data_dir"]
+        if name == "search" and os.path.isdir(source):
+            shutil.copytree(source, target, ignore=DriverManager.PROFILE_COPY_IGNORE, ignore_dangling_symlinks=True)
+            return
+        
+        cookies = None
+        if name == "search":
+            if os.path.isfile(SCRAPER_CONFIG["login_cookies_path"]):
+                cookies = DriverManager.load_cookies(SCRAPER_CONFIG["login_cookies_path"])
+            else:
+                logger.warning(f"Neither {source} nor {SCRAPER_CONFIG['login_cookies_path']} exists, search drivers start logged out")
+        
+        # Let Chrome create and warm up the profile once, so copies skip first-run work
+        profile_directory = SCRAPER_CONFIG["chrome_profile"] if name == "search" else None
+        driver = DriverManager.start_chrome(DriverManager.chrome_options(target, profile_directory), headless=True)
+        try:
+            driver.get("about:blank")
+            if cookies:
+                driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        finally:
+            driver.quit()
+    
+    @staticmethod
+    def profile_template(name):
+        """Path of a template profile, built on first use"""
+        template = os.path.join(SCRAPER_CONFIG["driver_cache_dir"], "profiles", name)
+        with DriverManager._template_lock:
+            if not os.path.isdir(template):
+                started = time.monotonic()
+                os.makedirs(os.path.dirname(template), exist_ok=True)
+                staging = f"{template}.{os.getpid()}.{random.getrandbits(32):08x}"
+                DriverManager.build_template(name, staging)
+                try:
+                    os.replace(staging, template)
+                except OSError:
+                    shutil.rmtree(staging, ignore_errors=True)  # Another process built it first
+                logger.info(f"Built the {name} template profile in {time.monotonic() - started:.1f}s")
+        return template
+    
+    @staticmethod
+    def copy_search_profile(index):
+        """Copy the logged-in Chrome profile so another browser can run with it at the same time"""
+        target = os.path.join(tempfile.gettempdir(), f"linkedin-scraper-search-{index}")
+        shutil.rmtree(target, ignore_errors=True)
+        shutil.copytree(SCRAPER_CONFIG["chrome_user_data_dir"], target, ignore=DriverManager.PROFILE_COPY_IGNORE,
+                        ignore_dangling_symlinks=True)
+        return target
+    
+    @staticmethod
+    def rebuild_templates():
+        """Drop the template profiles so they are rebuilt, e.g. after new login cookies"""
+        shutil.rmtree(os.path.join(SCRAPER_CONFIG["driver_cache_dir"], "profiles"), ignore_errors=True)
+    
+    @staticmethod
+    def copy_profile(name):
+        """Private copy of a template profile for one browser; quitting the driver removes it"""
+        started = time.monotonic()
+        target = tempfile.mkdtemp(prefix=f"linkedin-scraper-{name}-")
+        shutil.copytree(DriverManager.profile_template(name), target, ignore=DriverManager.PROFILE_COPY_IGNORE,
+                        ignore_dangling_symlinks=True, dirs_exist_ok=True)
+        Metrics.observe("profile_copy", time.monotonic() - started)
+        return target
+    
+    @staticmethod
+    def create_driver(headless=True, use_profile=False, user_data_dir=None, shared=False):
+        """Create and return a new undetected Chrome driver
+        
+        use_profile loads the logged-in profile the search pages need, from
+        user_data_dir when given. A shared browser hosts BrowserTabs and uses
+        the "none" page load strategy. Startup time is recorded as driver_startup.
+        """
+        started = time.monotonic()
+        try:
+            copied = None
+            if use_profile:
+                user_data_dir = user_data_dir or SCRAPER_CONFIG["chrome_user_data_dir"]
+            elif SCRAPER_CONFIG["profile_templates"]:
+                user_data_dir = copied = DriverManager.copy_profile("worker")
+            options = DriverManager.chrome_options(user_data_dir, SCRAPER_CONFIG["chrome_profile"] if use_profile else None)
+            if shared:
+                options.page_load_strategy = "none"  # BrowserTab.get waits for its page without blocking the other tabs
+            
+            driver = DriverManager.start_chrome(options, headless)
+            if copied:
+                driver.keep_user_data_dir = False
+            
+            if not use_profile:
+                DriverManager.block_resources(driver)
+            
+            seconds = time.monotonic() - started
+            Metrics.observe("driver_startup", seconds)
+            logger.info(f"Driver started in {seconds:.1f}s")
+            return driver
+        except Exception as e:
+            logger.error(f"Failed to create driver: {e}")
+            Metrics.inc("driver_start_failures")
+            return None
+    
+    @staticmethod
+    def create_drivers(count, headless=True, shared=False):
+        """Create multiple drivers in parallel and return them as a list"""
+        if count <= 0:
+            return []
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            created = list(executor.map(lambda _: DriverManager.create_driver(headless, shared=shared), range(count)))
+        return [driver for driver in created if driver]
+    
+    @staticmethod
+    def create_tab(browser):
+        """Open a worker tab in a shared browser, or None if it failed"""
+        try:
+            return BrowserTab(browser, isolate=SCRAPER_CONFIG["tab_contexts"])
+        except Exception as e:
+            logger.error(f"Failed to open browser tab: {e}")
+            return None
+    
+    @staticmethod
+    def create_search_drivers(count):
+        """Create logged-in search drivers, each on its own copy of the search template profile
+        
+        Without profile_templates all but the first run on copies of chrome_user_data_dir.
+        """
+        if not SCRAPER_CONFIG["search_profile"]:
+            return DriverManager.create_drivers(count, headless=True)
+        
+        def create(index):
+            if SCRAPER_CONFIG["profile_templates"]:
+                user_data_dir = DriverManager.copy_profile("search")
+            else:
+                user_data_dir = DriverManager.copy_search_profile(index) if index else None
+            driver = DriverManager.create_driver(headless=False, use_profile=True, user_data_dir=user_data_dir)
+            if driver is not None and SCRAPER_CONFIG["profile_templates"]:
+                driver.keep_user_data_dir = False
+            return driver
+        
+        with ThreadPoolExecutor(max_workers=max(1, count)) as executor:
+            created = list(executor.map(create, range(count)))
+        return [driver for driver in created if driver]
+    
+    @staticmethod
+    def quit_drivers(driver_list):
+        """Quit all drivers in the list"""
+        for driver in driver_list:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+class BrowserTab:
+    """A tab of a shared browser, driven through that browser's WebDriver session
+    
+    All tabs of a browser share its one chromedriver session. A session has a
+    single current window, so every call switches it to this tab under the
+    browser's tab lock first. Shared browsers use the "none" page load
+    strategy: get() holds the lock only to start the navigation, then polls
+    until the new document is interactive, so the tabs' pages load in
+    parallel. With isolate the tab lives in a fresh browser context with its
+    own cookie jar. quit() closes the tab and leaves the browser running.
+    """
+    
+    _locks_guard = Lock()
+    
+    @staticmethod
+    def lock(browser):
+        """The lock serializing the commands of a shared browser's tabs"""
+        with BrowserTab._locks_guard:
+            if getattr(browser, "tab_lock", None) is None:
+                browser.tab_lock = RLock()
+                browser.current_tab = None
+            return browser.tab_lock
+    
+    def __init__(self, browser, isolate=True):
+        self.shared_browser = browser
+        self._lock = BrowserTab.lock(browser)
+        self.context_id = None
+        with self._lock:
+            if isolate:
+                self.context_id = browser.execute_cdp_cmd("Target.createBrowserContext", {"disposeOnDetach": False})["browserContextId"]
+            target = {"url": "about:blank"}
+            if self.context_id:
+                target["browserContextId"] = self.context_id
+            self.target_id = browser.execute_cdp_cmd("Target.createTarget", target)["targetId"]
+            try:
+                DriverManager.block_resources(self)
+            except Exception:
+                self.quit()
+                raise
+    
+    def _run(self, command):
+        """Run command(browser) with the shared session switched to this tab"""
+        browser = self.shared_browser
+        with self._lock:
+            if browser.current_tab != self.target_id:
+                browser.switch_to.window(self.target_id)
+                browser.current_tab = self.target_id
+            return command(browser)
+    
+    def _navigate(self, command):
+        """Start a navigation, then wait for the new document without holding the lock"""
+        readiness = SCRAPER_CONFIG["readiness"]
+        self.execute_script("window.__tabNavigation = true")
+        self._run(command)
+        deadline = time.monotonic() + readiness["page_timeout"]
+        while self.execute_script("return window.__tabNavigation === undefined && document.readyState") not in ("interactive", "complete"):
+            if time.monotonic() > deadline:
+                raise TimeoutException(f"Tab navigation timed out after {readiness['page_timeout']}s")
+            time.sleep(readiness["poll_interval"])
+    
+    def get(self, url):
+        self._navigate(lambda browser: browser.get(url))
+    
+    def refresh(self):
+        self._navigate(lambda browser: browser.refresh())
+    
+    def execute_script(self, script, *args):
+        return self._run(lambda browser: browser.execute_script(script, *args))
+    
+    def execute_cdp_cmd(self, cmd, params):
+        return self._run(lambda browser: browser.execute_cdp_cmd(cmd, params))
+    
+    def find_element(self, by, value):
+        return self._run(lambda browser: browser.find_element(by, value))
+    
+    def find_elements(self, by, value):
+        return self._run(lambda browser: browser.find_elements(by, value))
+    
+    @property
+    def page_source(self):
+        return self._run(lambda browser: browser.page_source)
+    
+    @property
+    def current_url(self):
+        return self._run(lambda browser: browser.current_url)
+    
+    def quit(self):
+        browser = self.shared_browser
+        with self._lock:
+            try:
+                browser.execute_cdp_cmd("Target.closeTarget", {"targetId": self.target_id})
+                if self.context_id:
+                    browser.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": self.context_id})
+                # Leave the session on a window that still exists, the browser's own first tab
+                browser.switch_to.window(browser.window_handles[0])
+                browser.current_tab = None
+            except Exception:
+                pass
+
+class DriverPoolEmpty(RuntimeError):
+    """Every driver of the pool failed and none could be replaced"""
+
+class DriverPool:
+    """Pool of worker drivers with check-out/check-in, health checks and recycling
+    
+    Drivers are recycled after driver_max_pages pages or once their browser
+    grows past driver_max_memory_mb, and replaced when they crash or hit a 429,
+    so the worker that was using them keeps running. Starting a replacement is
+    retried with backoff; once no driver is left, checkout raises
+    DriverPoolEmpty instead of waiting forever.
+    
+    With tabs_per_browser, workers are BrowserTabs sharing that many per
+    Chrome instead of a Chrome each. A replaced tab is reopened in the shared
+    browser with the fewest tabs; tabs are recycled by page count only.
+    """
+    
+    def __init__(self, size, headless=True, tabs_per_browser=None):
+        self.size = size
+        self.headless = headless
+        self.tabs_per_browser = SCRAPER_CONFIG["browser_tabs"] if tabs_per_browser is None else tabs_per_browser
+        self._browsers = {}  # Shared browser -> open tabs
+        self._idle = Queue()
+        self._pages = {}
+        self._last_used = {}
+        self._all = set()
+        self._slots = {}
+        self._busy = {}
+        self._checked_out = {}
+        self._lock = Lock()
+        self._closed = False
+        self._replacing = 0
+        self._started = time.monotonic()
+        self.recycled = 0
+        self.replaced = 0
+    
+    def start(self):
+        """Create every driver in parallel and return the number started"""
+        if self.tabs_per_browser:
+            browsers = DriverManager.create_drivers(-(-self.size // self.tabs_per_browser), self.headless, shared=True)
+            with self._lock:
+                self._browsers = {browser: 0 for browser in browsers}
+            with ThreadPoolExecutor(max_workers=max(1, self.size)) as executor:
+                created = [driver for driver in executor.map(lambda _: self._create(), range(self.size)) if driver]
+        else:
+            created = DriverManager.create_drivers(self.size, self.headless)
+        for driver in created:
+            self._add(driver)
+        logger.info(f"Driver pool started with {len(self._all)}/{self.size} drivers"
+                    + (f" in {len(self._browsers)} browsers" if self.tabs_per_browser else ""))
+        return len(self._all)
+    
+    def _create(self):
+        """A new worker driver: its own browser, or a tab in the least loaded shared browser"""
+        if not self.tabs_per_browser:
+            return DriverManager.create_driver(self.headless)
+        
+        with self._lock:
+            browser = min((browser for browser, tabs in self._browsers.items() if tabs < self.tabs_per_browser),
+                          key=self._browsers.get, default=None)
+            if browser is not None:
+                self._browsers[browser] += 1
+        if browser is not None:
+            tab = DriverManager.create_tab(browser)
+            with BrowserTab.lock(browser):
+                alive = tab is not None or self.is_alive(browser)
+            if alive:
+                if tab is None:
+                    with self._lock:
+                        self._browsers[browser] -= 1
+                return tab
+            # The shared browser died, its other tabs are replaced as they fail
+            logger.warning("Shared browser is not responding, starting a new one")
+            with self._lock:
+                self._browsers.pop(browser, None)
+            DriverManager.quit_drivers([browser])
+        
+        browser = DriverManager.create_driver(self.headless, shared=True)
+        if browser is None:
+            return None
+        with self._lock:
+            self._browsers[browser] = 1
+        return DriverManager.create_tab(browser)
+    
+    def _add(self, driver, slot=None):
+        """Add a driver to the pool; a replacement keeps the slot of the driver it replaces"""
+        with self._lock:
+            self._all.add(driver)
+            self._pages[driver] = 0
+            self._last_used[driver] = time.time()
+            self._slots[driver] = len(self._busy) if slot is None else slot
+            self._busy.setdefault(self._slots[driver], 0.0)
+        self._idle.put(driver)
+    
+    def _discard(self, driver):
+        with self._lock:
+            self._all.discard(driver)
+            self._pages.pop(driver, None)
+            self._last_used.pop(driver, None)
+            self._checked_out.pop(driver, None)
+            slot = self._slots.pop(driver, None)
+            if isinstance(driver, BrowserTab) and driver.shared_browser in self._browsers:
+                self._browsers[driver.shared_browser] -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        return slot
+    
+    @staticmethod
+    def is_alive(driver):
+        """Probe the driver with a trivial script"""
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+    
+    @staticmethod
+    def memory_mb(driver):
+        """Resident memory of the driver's browser process tree, or None without psutil (and for tabs)"""
+        browser_pid = getattr(driver, "browser_pid", None)
+        if psutil is None or not browser_pid:
+            return None
+        try:
+            browser = psutil.Process(browser_pid)
+            processes = [browser] + browser.children(recursive=True)
+            return sum(process.memory_info().rss for process in processes) / (1024 * 1024)
+        except psutil.Error:
+            return None
+    
+    def _replace(self, driver, reason):
+        """Quit a driver and put a fresh one in its place"""
+        logger.warning(f"Replacing driver ({reason})")
+        with self._lock:
+            self._replacing += 1
+        try:
+            slot = self._discard(driver)
+            new_driver = None
+            delay = SCRAPER_CONFIG["driver_replace_backoff"]
+            for attempt in range(SCRAPER_CONFIG["driver_replace_attempts"]):
+                if attempt:
+                    logger.warning(f"Retrying replacement driver in {delay}s")
+                    time.sleep(delay)
+                    delay *= 2
+                new_driver = self._create()
+                if new_driver is not None or self._closed:
+                    break
+            with self._lock:
+                if reason == "recycle":
+                    self.recycled += 1
+                else:
+                    self.replaced += 1
+        finally:
+            with self._lock:
+                self._replacing -= 1
+        if new_driver is None:
+            with self._lock:
+                left = len(self._all)
+            logger.error(f"Failed to create a replacement driver, pool is down to {left}/{self.size}")
+            return
+        if self._closed:
+            new_driver.quit()
+            return
+        self._add(new_driver, slot)
+    
+    def checkin(self, driver, failed=False, rate_limited=False):
+        """Return a driver to the pool, recycling or replacing it when needed"""
+        with self._lock:
+            pages = self._pages.get(driver, 0) + 1
+            self._pages[driver] = pages
+            self._last_used[driver] = time.time()
+            checked_out = self._checked_out.pop(driver, None)
+            if checked_out is not None and driver in self._slots:
+                self._busy[self._slots[driver]] += time.monotonic() - checked_out
+        
+        if self._closed:
+            self._discard(driver)
+        elif rate_limited:
+            self._replace(driver, "rate limited")
+        elif failed and not self.is_alive(driver):
+            self._replace(driver, "crashed")
+        elif pages >= SCRAPER_CONFIG["driver_max_pages"]:
+            self._replace(driver, "recycle")
+        elif pages % 20 == 0 and (self.memory_mb(driver) or 0) > SCRAPER_CONFIG["driver_max_memory_mb"]:
+            self._replace(driver, "recycle")
+        else:
+            self._idle.put(driver)
+    
+    def _get_idle(self, timeout):
+        """Next idle driver; raises Empty after timeout and DriverPoolEmpty once no driver is left"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = 1.0 if deadline is None else min(1.0, max(0.0, deadline - time.monotonic()))
+            try:
+                return self._idle.get(timeout=wait)
+            except Empty:
+                with self._lock:
+                    exhausted = not self._all and not self._replacing
+                if exhausted or self._closed:
+                    raise DriverPoolEmpty("Driver pool has no drivers left and could not start new ones")
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise
+    
+    @contextmanager
+    def checkout(self, timeout=None):
+        """Check out a healthy driver for the duration of the block"""
+        while True:
+            driver = self._get_idle(timeout)
+            idle_for = time.time() - self._last_used.get(driver, 0)
+            if idle_for < SCRAPER_CONFIG["driver_probe_interval"] or self.is_alive(driver):
+                break
+            self._replace(driver, "failed liveness probe")
+        
+        with self._lock:
+            self._checked_out[driver] = time.monotonic()
+        try:
+            yield driver
+        except Exception as e:
+            self.checkin(driver, failed=True, rate_limited="429" in str(e))
+            raise
+        else:
+            self.checkin(driver)
+    
+    def stats(self):
+        """Pool counters: active (checked out), idle, recycled and replaced drivers"""
+        with self._lock:
+            total = len(self._all)
+        idle = self._idle.qsize()
+        return {
+            "active": total - idle,
+            "idle": idle,
+            "browsers": len(self._browsers) if self.tabs_per_browser else total,
+            "recycled": self.recycled,
+            "replaced": self.replaced
+        }
+    
+    def utilization(self):
+        """Fraction of the pool's lifetime each driver slot spent checked out"""
+        now = time.monotonic()
+        lifetime = max(now - self._started, 1e-9)
+        with self._lock:
+            busy = dict(self._busy)
+            for driver, checked_out in self._checked_out.items():
+                if driver in self._slots:
+                    busy[self._slots[driver]] += now - checked_out
+        return {slot: round(seconds / lifetime, 3) for slot, seconds in busy.items()}
+    
+    def close(self):
+        """Quit every driver in the pool"""
+        self._closed = True
+        with self._lock:
+            all_drivers = list(self._all)
+        DriverManager.quit_drivers(all_drivers)
+        with self._lock:
+            browsers = list(self._browsers)
+            self._browsers.clear()
+            self._all.clear()
+        DriverManager.quit_drivers(browsers)
+        while not self._idle.empty():
+            self._idle.get_nowait()
+
+class RateController:
+    """Central pacing for every LinkedIn fetch
+    
+    Each host gets a token bucket and a concurrency limit. Good responses grow
+    the rate additively (and the concurrency every few successes), while a 429,
+    auth wall or empty page cuts both multiplicatively and starts a jittered
+    exponential backoff for that host.
+    """
+    
+    OK = "ok"
+    RATE_LIMITED = "rate_limited"
+    AUTH_WALL = "auth_wall"
+    EMPTY = "empty"
+    
+    def __init__(self, config=None):
+        self.config = config or SCRAPER_CONFIG["rate_limit"]
+        self._hosts = {}
+        self._condition = Condition()
+        self._async_waiters = set()
+        self._stop = Event()
+        self._log_thread = None
+    
+    def start(self):
+        """Start logging the current rates every log_interval seconds"""
+        if self.config["log_interval"] and self._log_thread is None:
+            self._log_thread = Thread(target=self._log_loop, name="rate-log", daemon=True)
+            self._log_thread.start()
+        return self
+    
+    def _log_loop(self):
+        while not self._stop.wait(self.config["log_interval"]):
+            for host, state in self.snapshot().items():
+                logger.info(f"Rate {host}: {state['rate']:.2f} req/s | concurrency {state['in_flight']}/{state['concurrency']} | "
+                            f"backoff {state['backoff']:.1f}s | ok {state['ok']} throttled {state['throttled']}")
+    
+    def _host(self, url):
+        host = urlparse(url).netloc or url
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = {
+                "rate": self.config["initial_rate"],
+                "tokens": 1.0,
+                "refilled": time.monotonic(),
+                "concurrency": self.config["initial_concurrency"],
+                "in_flight": 0,
+                "backoff_until": 0.0,
+                "failures": 0,
+                "successes": 0,
+                "ok": 0,
+                "throttled": 0
+            }
+        return state
+    
+    def _reserve(self, state):
+        """Take a token and a concurrency slot, or return how long to wait for one; call with the lock held"""
+        now = time.monotonic()
+        state["tokens"] = min(1.0, state["tokens"] + (now - state["refilled"]) * state["rate"])
+        state["refilled"] = now
+        
+        if now < state["backoff_until"]:
+            return state["backoff_until"] - now
+        if state["in_flight"] >= state["concurrency"]:
+            return 1
+        if state["tokens"] < 1:
+            return (1 - state["tokens"]) / state["rate"]
+        state["tokens"] -= 1
+        state["in_flight"] += 1
+        return 0
+    
+    def _release(self, state):
+        with self._condition:
+            state["in_flight"] -= 1
+            self._notify()
+    
+    def _notify(self):
+        """Wake blocked threads and coroutines; call with the lock held"""
+        self._condition.notify_all()
+        for loop, event in self._async_waiters:
+            loop.call_soon_threadsafe(event.set)
+    
+    @contextmanager
+    def acquire(self, url):
+        """Wait for a token and a concurrency slot for the url's host"""
+        with self._condition:
+            state = self._host(url)
+            while True:
+                wait = self._reserve(state)
+                if not wait:
+                    break
+                self._condition.wait(wait)
+        try:
+            yield
+        finally:
+            self._release(state)
+    
+    @asynccontextmanager
+    async def acquire_async(self, url):
+        """acquire() for coroutines: waits without blocking the event loop"""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        while True:
+            with self._condition:
+                state = self._host(url)
+                wait = self._reserve(state)
+                if not wait:
+                    break
+                waiter[1].clear()
+                self._async_waiters.add(waiter)
+            try:
+                await asyncio.wait_for(waiter[1].wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._condition:
+                    self._async_waiters.discard(waiter)
+        try:
+            yield
+        finally:
+            self._release(state)
+    
+    def report(self, url, outcome):
+        """Feed a fetch outcome back into the host's rate and concurrency"""
+        config = self.config
+        Metrics.inc(f"fetch_{outcome}")
+        with self._condition:
+            state = self._host(url)
+            if outcome == self.OK:
+                state["ok"] += 1
+                state["failures"] = 0
+                state["successes"] += 1
+                state["rate"] = min(config["max_rate"], state["rate"] + config["additive_increase"])
+                if state["successes"] >= state["concurrency"]:
+                    state["successes"] = 0
+                    state["concurrency"] = min(config["max_concurrency"], state["concurrency"] + 1)
+            else:
+                state["throttled"] += 1
+                state["failures"] += 1
+                state["successes"] = 0
+                state["rate"] = max(config["min_rate"], state["rate"] * config["multiplicative_decrease"])
+                state["concurrency"] = max(1, int(state["concurrency"] * config["multiplicative_decrease"]))
+                backoff = min(config["backoff_max"], config["backoff_base"] * 2 ** (state["failures"] - 1))
+                state["backoff_until"] = max(state["backoff_until"], time.monotonic() + random.uniform(0, backoff))
+                logger.warning(f"{outcome} from {urlparse(url).netloc}, slowing to {state['rate']:.2f} req/s")
+            self._notify()
+    
+    @staticmethod
+    def classify(html, url="", status=200, markers=JOB_PAGE_MARKERS):
+        """Classify a fetched page as ok, rate limited, auth wall or empty (missing markers)"""
+        if status == 429:
+            return RateController.RATE_LIMITED
+        if "authwall" in url or (html and "authwall" in html[:5000]):
+            return RateController.AUTH_WALL
+        if not html or not all(marker in html for marker in markers):
+            return RateController.EMPTY
+        return RateController.OK
+    
+    def snapshot(self):
+        """Current rate, concurrency and backoff for every host"""
+        now = time.monotonic()
+        with self._condition:
+            return {
+                host: {
+                    "rate": state["rate"],
+                    "concurrency": state["concurrency"],
+                    "in_flight": state["in_flight"],
+                    "backoff": max(0.0, state["backoff_until"] - now),
+                    "ok": state["ok"],
+                    "throttled": state["throttled"]
+                }
+                for host, state in self._hosts.items()
+            }
+    
+    def stop(self):
+        """Stop the rate log thread"""
+        self._stop.set()
+
+class HttpFetcher:
+    """Fetches server-rendered job pages over a pooled keep-alive session"""
+
+    _session = None
+    _session_lock = Lock()
+
+    @staticmethod
+    def get_session():
+        """Return the shared session, creating it on first use"""
+        with HttpFetcher._session_lock:
+            if HttpFetcher._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=SCRAPER_CONFIG["http_pool_size"],
+                    pool_block=True
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({
+                    "User-Agent": random.choice(SCRAPER_CONFIG["user_agents"]),
+                    "Accept": "text/html,application/xhtml+xml",
+                    "Accept-Language": "en-US,en;q=0.9"
+                })
+                HttpFetcher._session = session
+            return HttpFetcher._session
+
+    @staticmethod
+    def fetch(url, markers=JOB_PAGE_MARKERS):
+        """Fetch a page and return its HTML, or None if the response is unusable"""
+        with rate_controller.acquire(url):
+            response = HttpFetcher.get_session().get(url, timeout=SCRAPER_CONFIG["http_timeout"])
+        return HttpFetcher.check(url, response.text, response.url, response.status_code, markers)
+    
+    @staticmethod
+    def check(url, html, final_url, status, markers=JOB_PAGE_MARKERS):
+        """Report a response to the rate controller and return its HTML if usable"""
+        rate_controller.report(url, RateController.classify(html, final_url, status, markers))
+        if status == 429:
+            raise RuntimeError(f"429 Too Many Requests for {url}")
+        if status != 200:
+            logger.warning(f"HTTP {status} for {url}")
+            return None
+        return html
+
+    @staticmethod
+    def close():
+        """Close the shared session"""
+        with HttpFetcher._session_lock:
+            if HttpFetcher._session is not None:
+                HttpFetcher._session.close()
+                HttpFetcher._session = None
+
+class DateTimeHelper:
+    """Helper class for date and time operations"""
+    
+    @staticmethod
+    def convert_to_datetime(post_time, current_time=None):
+        """Convert LinkedIn relative time to datetime object, relative to current_time (default now)"""
+        if post_time == "Not Mentioned":
+            return None
+            
+        current_time = current_time or datetime.now()
+        
+        # Parse the post time
+        try:
+            number = int(post_time.split()[0])
+            
+            if 'minute' in post_time:
+                return current_time - timedelta(minutes=number)
+            elif 'hour' in post_time:
+                return current_time - timedelta(hours=number)
+            elif 'day' in post_time:
+                return current_time - timedelta(days=number)
+            elif 'week' in post_time:
+                return current_time - timedelta(weeks=number)
+            elif 'month' in post_time:
+                return current_time - relativedelta(months=number)
+            elif 'year' in post_time:
+                return current_time - relativedelta(years=number)
+            else:
+                return current_time
+        except (ValueError, IndexError):
+            return current_time
+
+class FieldExtractor:
+    """Runs JOB_FIELD_SPEC (or another spec in its format) against a page with a selectable parser backend
+    
+    Pages without a top card or without the required field extract to None.
+    """
+    
+    BACKENDS = ("lxml", "selectolax", "bs4")
+    
+    def __init__(self, backend=None, spec=JOB_FIELD_SPEC, top_card_selectors=TOP_CARD_SELECTORS, required="Job Title"):
+        self.backend = backend or SCRAPER_CONFIG["parser_backend"]
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"Unknown parser backend: {self.backend}")
+        if self.backend == "lxml" and lxml is None:
+            raise ImportError("The lxml parser backend requires lxml and cssselect")
+        if self.backend == "selectolax" and LexborHTMLParser is None:
+            raise ImportError("The selectolax parser backend requires selectolax")
+        
+        if self.backend == "lxml":
+            self._html_parser = lxml.html.HTMLParser(encoding="utf-8")
+            self._text_nodes = etree.XPath(".//text()")
+        self.required = required
+        self.top_card = self._compile(top_card_selectors)
+        self.rules = []
+        for field, scope, selectors, attribute in spec:
+            if isinstance(attribute, tuple):
+                attribute = tuple(self._compile((selector,))[0] for selector in attribute)
+            self.rules.append((field, scope, self._compile(selectors), attribute))
+    
+    def _compile(self, selectors):
+        if self.backend == "lxml":
+            return [CSSSelector(selector, translator="html") for selector in selectors]
+        if self.backend == "bs4":
+            return [soupsieve.compile(selector) for selector in selectors]
+        return list(selectors)
+    
+    def _parse(self, html):
+        if self.backend == "lxml":
+            return lxml.html.fromstring(html.encode("utf-8"), parser=self._html_parser)
+        if self.backend == "bs4":
+            return BeautifulSoup(html, 'html.parser')
+        return LexborHTMLParser(html)
+    
+    def _select_all(self, node, selector):
+        if self.backend == "lxml":
+            return selector(node)
+        if self.backend == "bs4":
+            return selector.select(node)
+        return node.css(selector)
+    
+    def _select_one(self, node, selectors):
+        for selector in selectors:
+            if self.backend == "lxml":
+                matches = selector(node)
+                match = matches[0] if matches else None
+            elif self.backend == "bs4":
+                match = selector.select_one(node)
+            else:
+                match = node.css_first(selector)
+            if match is not None:
+                return match
+        return None
+    
+    def _text(self, node):
+        if self.backend == "lxml":
+            return "".join(text.strip() for text in self._text_nodes(node))
+        if self.backend == "bs4":
+            return node.get_text(strip=True)
+        return node.text(deep=True, separator="", strip=True)
+    
+    def _attribute(self, node, name):
+        if self.backend == "selectolax":
+            return node.attributes.get(name)
+        return node.get(name)
+    
+    def extract(self, html):
+        """Extract every field in one pass, or return None if the top card is missing"""
+        if not html:
+            return None
+        root = self._parse(html)
+        top_card = self._select_one(root, self.top_card)
+        if top_card is None:
+            return None
+        
+        fields = {}
+        for field, scope, selectors, attribute in self.rules:
+            node = top_card if scope == "top_card" else root
+            
+            if isinstance(attribute, tuple):
+                heading_selector, value_selector = attribute
+                for item in self._select_all(node, selectors[0]):
+                    heading = self._select_one(item, (heading_selector,))
+                    value = self._select_one(item, (value_selector,))
+                    if heading is not None and value is not None:
+                        fields[self._text(heading)] = self._text(value)
+                continue
+            
+            match = self._select_one(node, selectors)
+            if match is None:
+                fields[field] = None
+            elif attribute:
+                fields[field] = self._attribute(match, attribute)
+            else:
+                fields[field] = self._text(match)
+        
+        if not fields.get(self.required):
+            return None
+        return fields
+
+class LatencyHistogram:
+    """Cumulative latency histogram with fixed bucket bounds in seconds"""
+    
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = Lock()
+    
+    def observe(self, seconds):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.sum += seconds
+    
+    def quantile(self, q):
+        """Estimate the q-quantile by interpolating inside its bucket"""
+        with self._lock:
+            counts, count = list(self.counts), self.count
+        if not count:
+            return 0.0
+        rank = q * count
+        cumulative = 0
+        for i, bucket_count in enumerate(counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+    
+    def summary(self):
+        """Count, mean, p50/p99 and per-bucket counts keyed by upper bound"""
+        with self._lock:
+            bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+            summary = {
+                "count": self.count,
+                "mean": self.sum / self.count if self.count else 0.0,
+                "buckets": dict(zip(bounds, self.counts))
+            }
+        summary["p50"] = self.quantile(0.5)
+        summary["p99"] = self.quantile(0.99)
+        return summary
+
+class Metrics:
+    """Process-wide pipeline counters, gauges and per-stage latency histograms
+    
+    Stages are search_page_load, scroll, detail_fetch, parse and db_write;
+    "job" is each job's latency from its frontier lease to its durable write.
+    Gauges are callables sampled on read, so queue depths and driver
+    utilization are always current. Served by MetricsServer and written as a
+    JSON summary at shutdown.
+    """
+    
+    PREFIX = "linkedin_scraper"
+    counters = {}
+    gauges = {}
+    gauge_labels = {}
+    histograms = {}
+    started = time.time()
+    _jobs_started = {}
+    _lock = Lock()
+    
+    @staticmethod
+    def inc(name, amount=1):
+        with Metrics._lock:
+            Metrics.counters[name] = Metrics.counters.get(name, 0) + amount
+    
+    @staticmethod
+    def observe(stage, seconds):
+        with Metrics._lock:
+            histogram = Metrics.histograms.get(stage)
+            if histogram is None:
+                histogram = Metrics.histograms[stage] = LatencyHistogram(SCRAPER_CONFIG["stage_buckets"])
+        histogram.observe(seconds)
+    
+    @staticmethod
+    def job_started(job_id):
+        with Metrics._lock:
+            Metrics._jobs_started[job_id] = time.monotonic()
+    
+    @staticmethod
+    def job_finished(job_id, written=True):
+        """Observe the job's end-to-end latency, or just forget it when it was not written"""
+        with Metrics._lock:
+            started = Metrics._jobs_started.pop(job_id, None)
+        if written and started is not None:
+            Metrics.observe("job", time.monotonic() - started)
+    
+    @staticmethod
+    @contextmanager
+    def timer(stage):
+        """Observe the duration of the block under stage"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            Metrics.observe(stage, time.monotonic() - started)
+    
+    @staticmethod
+    def gauge(name, read, label=None):
+        """Register a gauge; read() returns a number, or a {value of label: number} dict"""
+        with Metrics._lock:
+            Metrics.gauges[name] = read
+            Metrics.gauge_labels[name] = label
+    
+    @staticmethod
+    def read_gauges():
+        with Metrics._lock:
+            gauges = dict(Metrics.gauges)
+        values = {}
+        for name, read in gauges.items():
+            try:
+                values[name] = read()
+            except Exception as e:
+                logger.debug(f"Could not read gauge {name}: {e}")
+        return values
+    
+    @staticmethod
+    def summary():
+        """Counters, gauges, throughput and stage latencies as a JSON-friendly dict"""
+        elapsed = time.time() - Metrics.started
+        with Metrics._lock:
+            counters = dict(Metrics.counters)
+            histograms = dict(Metrics.histograms)
+        written = counters.get("jobs_inserted", 0) + counters.get("jobs_existing", 0)
+        return {
+            "elapsed_seconds": round(elapsed, 1),
+            "jobs_per_second": written / elapsed if elapsed else 0.0,
+            "counters": counters,
+            "gauges": Metrics.read_gauges(),
+            "stages": {stage: histogram.summary() for stage, histogram in histograms.items()},
+            "waits": PageReadiness.summary()
+        }
+    
+    @staticmethod
+    def _render_histogram(lines, name, label, histograms):
+        lines.append(f"# TYPE {name} histogram")
+        for key, histogram in sorted(histograms.items()):
+            with histogram._lock:
+                counts, count, total = list(histogram.counts), histogram.count, histogram.sum
+            cumulative = 0
+            for bound, bucket_count in zip([str(bound) for bound in histogram.buckets] + ["+Inf"], counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{{label}="{key}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{label}="{key}"}} {total}')
+            lines.append(f'{name}_count{{{label}="{key}"}} {count}')
+    
+    @staticmethod
+    def render_prometheus():
+        """Everything in Prometheus text exposition format"""
+        prefix = Metrics.PREFIX
+        lines = []
+        with Metrics._lock:
+            counters = dict(Metrics.counters)
+            histograms = dict(Metrics.histograms)
+        for name, value in sorted(counters.items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        for name, value in sorted(Metrics.read_gauges().items()):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            if isinstance(value, dict):
+                label = Metrics.gauge_labels.get(name) or "label"
+                lines.extend(f'{prefix}_{name}{{{label}="{key}"}} {item}' for key, item in sorted(value.items()))
+            else:
+                lines.append(f"{prefix}_{name} {value}")
+        lines.append(f"# TYPE {prefix}_uptime_seconds gauge")
+        lines.append(f"{prefix}_uptime_seconds {time.time() - Metrics.started:.1f}")
+        Metrics._render_histogram(lines, f"{prefix}_stage_seconds", "stage", histograms)
+        with PageReadiness._histograms_lock:
+            waits = dict(PageReadiness.histograms)
+        Metrics._render_histogram(lines, f"{prefix}_wait_seconds", "condition", waits)
+        return "\n".join(lines) + "\n"
+    
+    @staticmethod
+    def write_summary(path=None):
+        """Log the summary and write it to metrics_summary_path"""
+        path = path or SCRAPER_CONFIG["metrics_summary_path"]
+        summary = Metrics.summary()
+        logger.info(f"Metrics: {json.dumps(summary['counters'])} | {summary['jobs_per_second']:.2f} jobs/sec")
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+        return summary
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves /metrics (Prometheus text) and /stats (JSON summary)"""
+    
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = Metrics.render_prometheus(), "text/plain; version=0.0.4"
+        elif self.path == "/stats":
+            body, content_type = json.dumps(Metrics.summary(), indent=2), "application/json"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        logger.debug(f"Metrics request: {format % args}")
+
+class MetricsServer:
+    """Local HTTP endpoint for live metrics on a daemon thread"""
+    
+    def __init__(self, host=None, port=None):
+        self.host = host or SCRAPER_CONFIG["metrics_host"]
+        self.port = SCRAPER_CONFIG["metrics_port"] if port is None else port
+        self._server = None
+    
+    def start(self):
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), MetricsRequestHandler)
+        except OSError as e:
+            logger.warning(f"Metrics endpoint disabled, could not bind {self.host}:{self.port}: {e}")
+            return self
+        self._server.daemon_threads = True
+        Thread(target=self._server.serve_forever, name="metrics", daemon=True).start()
+        logger.info(f"Serving metrics on http://{self.host}:{self._server.server_port}/metrics")
+        return self
+    
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+class PageReadiness:
+    """Waits on concrete page conditions and returns as soon as they hold"""
+    
+    JOB_CARD_CLASS = "job-card-list__title--link"
+    histograms = {}
+    _histograms_lock = Lock()
+    
+    @staticmethod
+    def _observe(name, started):
+        elapsed = time.monotonic() - started
+        with PageReadiness._histograms_lock:
+            histogram = PageReadiness.histograms.get(name)
+            if histogram is None:
+                histogram = PageReadiness.histograms[name] = LatencyHistogram(SCRAPER_CONFIG["readiness"]["histogram_buckets"])
+        histogram.observe(elapsed)
+    
+    @staticmethod
+    def _wait(driver, name, timeout, condition):
+        """Poll condition until it returns something truthy; None on timeout"""
+        started = time.monotonic()
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=SCRAPER_CONFIG["readiness"]["poll_interval"]).until(condition)
+        except TimeoutException:
+            logger.debug(f"Timed out waiting for {name} after {timeout}s")
+            return None
+        finally:
+            PageReadiness._observe(name, started)
+    
+    @staticmethod
+    def wait_document_ready(driver):
+        """Wait for document.readyState to reach complete"""
+        return PageReadiness._wait(
+            driver, "document_ready", SCRAPER_CONFIG["readiness"]["page_timeout"],
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+    
+    @staticmethod
+    def wait_for_top_card(driver):
+        """Wait for the job page top card h4 to be present"""
+        return PageReadiness._wait(
+            driver, "top_card", SCRAPER_CONFIG["readiness"]["top_card_timeout"],
+            EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(TOP_CARD_SELECTORS)))
+        )
+    
+    @staticmethod
+    def wait_for_job_cards(driver, previous_count=0, timeout=None):
+        """Wait until more than previous_count job cards exist and the count stops changing
+        
+        Returns the settled card count, or None if no new cards appeared in time.
+        """
+        readiness = SCRAPER_CONFIG["readiness"]
+        if timeout is None:
+            timeout = readiness["cards_timeout"] if previous_count == 0 else readiness["scroll_timeout"]
+        script = f"return document.getElementsByClassName('{PageReadiness.JOB_CARD_CLASS}').length"
+        last = {"count": -1, "since": time.monotonic()}
+        
+        def settled(d):
+            count = d.execute_script(script)
+            now = time.monotonic()
+            if count != last["count"]:
+                last["count"], last["since"] = count, now
+                return False
+            return count > previous_count and now - last["since"] >= readiness["cards_stable_time"]
+        
+        name = "job_cards" if previous_count == 0 else "scroll_cards"
+        if not PageReadiness._wait(driver, name, timeout, settled):
+            return None
+        return last["count"]
+    
+    @staticmethod
+    def summary():
+        """Latency summary for every wait recorded so far"""
+        with PageReadiness._histograms_lock:
+            return {name: histogram.summary() for name, histogram in PageReadiness.histograms.items()}
+
+class JobScraper:
+    """Main class for scraping LinkedIn jobs"""
+    
+    _debug_pages = 0
+    _debug_pages_lock = Lock()
+    
+    # Scroll the last job card into view and return the card count
+    SCROLL_CARDS_SCRIPT = f"""
+const cards = document.getElementsByClassName('{PageReadiness.JOB_CARD_CLASS}');
+if (cards.length) cards[cards.length - 1].scrollIntoView();
+return cards.length;
+"""
+    # Every job card's href and metadata wrapper text in one round-trip
+    HARVEST_CARDS_SCRIPT = f"""
+return Array.from(document.getElementsByClassName('{PageReadiness.JOB_CARD_CLASS}'), card => {{
+  const content = card.closest('div.artdeco-entity-lockup__content');
+  const metadata = content && content.querySelector('ul.job-card-container__metadata-wrapper');
+  return [card.href, metadata ? metadata.innerText : null];
+}});
+"""
+    
+    @staticmethod
+    def build_search_url(query, start=0):
+        """Build the search results URL for a query and result offset"""
+        params = {"keywords": query.get("keywords"), "geoId": query.get("geoId")}
+        params.update(query.get("filters", {}))
+        if SCRAPER_CONFIG["incremental"]:
+            params["sortBy"] = "DD"  # Most recent first
+        if start:
+            params["start"] = start
+        return SCRAPER_CONFIG["search_url"] + "?" + urlencode({key: value for key, value in params.items() if value not in (None, "")})
+    
+    @staticmethod
+    def scrape_search_page(driver, url, is_known):
+        """Load one search results page and return its new (job_url, job_type) cards and the known job ids
+        
+        Cards for which is_known(job_id) is true are only returned as ids.
+        The page's outcome is reported to the rate controller; a page without
+        cards counts as empty.
+        """
+        with Metrics.timer("search_page_load"):
+            with rate_controller.acquire(url):
+                driver.get(url)
+            
+            # Find job cards once the page has rendered them
+            PageReadiness.wait_document_ready(driver)
+            card_count = PageReadiness.wait_for_job_cards(driver) or 0
+        Metrics.inc("search_pages")
+        
+        # Scroll until 25 cards are loaded or the count stops growing
+        scroll_attempts = 0
+        while 0 < card_count < 25 and scroll_attempts < SCRAPER_CONFIG["max_scroll_attempts"]:
+            try:
+                with Metrics.timer("scroll"):
+                    driver.execute_script(JobScraper.SCROLL_CARDS_SCRIPT)
+                    more_cards = PageReadiness.wait_for_job_cards(driver, card_count)
+                if not more_cards:
+                    break  # Scrolling loaded nothing new
+                card_count = more_cards
+            except Exception as e:
+                logger.warning(f"Scroll error: {e}")
+                break
+            
+            scroll_attempts += 1
+        
+        # Read every card in one round-trip
+        try:
+            harvested = driver.execute_script(JobScraper.HARVEST_CARDS_SCRIPT) if card_count else []
+        except Exception as e:
+            logger.warning(f"Error reading job cards: {e}")
+            harvested = []
+        
+        if harvested:
+            outcome = RateController.AUTH_WALL if "authwall" in driver.current_url else RateController.OK
+        else:
+            outcome = RateController.classify(driver.page_source, driver.current_url, markers=(PageReadiness.JOB_CARD_CLASS,))
+        rate_controller.report(url, outcome)
+        
+        cards = []
+        known_ids = []
+        for job_url, metadata in harvested or []:
+            if not job_url:
+                continue
+            
+            # Drop jobs that are already stored or queued
+            job_id = JobScraper.extract_job_id(job_url)
+            if is_known(job_id):
+                known_ids.append(job_id)
+                Metrics.inc("duplicates_skipped")
+                continue
+            
+            # Extract job type if available
+            match = re.search(r'\((.*?)\)', (metadata or "").strip())
+            job_type = match.group(1) if match else "Unknown"
+            cards.append((job_url, job_type))
+        
+        return cards, known_ids
+    
+    @staticmethod
+    def get_job_links(queries, search_drivers):
+        """Scrape job links for every query, sharding result pages across the search drivers"""
+        try:
+            return SearchCoordinator(queries).run(search_drivers)
+        except Exception as e:
+            logger.error(f"Error in get_job_links: {e}")
+            return 0
+    
+    @staticmethod
+    def extract_job_id(job_url):
+        """Extract the job id from a /jobs/view/<id> URL"""
+        job_id = job_url.split('jobs/view/')[-1].split('/')[0]
+        return job_id.split('?')[0]  # Handle URLs with query parameters
+    
+    @staticmethod
+    def get_extractor():
+        """Return this process's FieldExtractor, compiling it on first use"""
+        global field_extractor
+        if field_extractor is None:
+            field_extractor = FieldExtractor()
+        return field_extractor
+    
+    @staticmethod
+    def parse_job_page(html, fetched_at=None):
+        """Extract job fields from page HTML, or return None if the expected markers are missing
+        
+        fetched_at anchors the relative post time, for pages parsed after the fact.
+        """
+        fields = JobScraper.get_extractor().extract(html)
+        if fields is None:
+            return None
+        return JobScraper.normalize_fields(fields, fetched_at)
+    
+    @staticmethod
+    def normalize_fields(fields, fetched_at=None):
+        """Turn extracted fields into stored job fields"""
+        # Missing values are marked "Not Mentioned" (JobSchema stores them as
+        # null), and the relative post time is converted right after it so the
+        # column order is unchanged
+        job_fields = {}
+        for field, value in fields.items():
+            job_fields[field] = value or "Not Mentioned"
+            if field == "Post Time":
+                converted_time = DateTimeHelper.convert_to_datetime(job_fields[field], fetched_at)
+                job_fields['Post Converted Time'] = converted_time.strftime("%Y-%m-%d %H:%M:%S") if converted_time else "Not Mentioned"
+        return job_fields
+    
+    @staticmethod
+    def save_debug_page(job_id, html):
+        """Keep a page that failed to load or parse in debug_pages_dir, up to debug_pages_max per run"""
+        directory = SCRAPER_CONFIG["debug_pages_dir"]
+        if not directory or not html:
+            return
+        with JobScraper._debug_pages_lock:
+            if JobScraper._debug_pages >= SCRAPER_CONFIG["debug_pages_max"]:
+                return
+            JobScraper._debug_pages += 1
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, f"error_page_{job_id}.html"), "w", encoding="utf-8") as f:
+                f.write(html)
+        except OSError as e:
+            logger.warning(f"Could not save debug page for job {job_id}: {e}")
+    
+    @staticmethod
+    def has_job_markers(html):
+        """Cheap check that a fetched page contains the job top card"""
+        return bool(html) and all(marker in html for marker in JOB_PAGE_MARKERS)
+    
+    @staticmethod
+    def validate_browser_fields(result):
+        """Fields from a JOB_EXTRACTOR_SCRIPT result, or None if they can't be trusted"""
+        if not isinstance(result, dict) or not result.get("topCard") or "authwall" in (result.get("url") or ""):
+            return None
+        pairs = result.get("fields")
+        if not isinstance(pairs, list):
+            return None
+        fields = {}
+        for pair in pairs:
+            if not isinstance(pair, list) or len(pair) != 2 or not isinstance(pair[0], str):
+                return None
+            if pair[1] is not None and not isinstance(pair[1], str):
+                return None
+            fields[pair[0]] = pair[1]
+        if not fields.get("Job Title"):
+            return None
+        return fields
+    
+    @staticmethod
+    def load_job_fields(driver, job_url):
+        """Load a job page and extract its fields inside the browser, or None if that didn't work"""
+        with rate_controller.acquire(job_url):
+            driver.get(job_url)
+        PageReadiness.wait_for_top_card(driver)
+        try:
+            result = driver.execute_script(JOB_EXTRACTOR_SCRIPT)
+        except Exception as e:
+            logger.debug(f"In-browser extraction failed for {job_url}: {e}")
+            return None
+        Metrics.inc("browser_transfer_bytes", len(json.dumps(result)))
+        fields = JobScraper.validate_browser_fields(result)
+        if fields is not None:
+            rate_controller.report(job_url, RateController.OK)
+        return fields
+    
+    @staticmethod
+    def fetch_in_browser(driver, job_url, job_id):
+        """Load a job page in the browser and return (fields, html)
+        
+        With browser_extract the fields are extracted in the page and html is
+        None; the HTML is only read when that fails or pages are archived.
+        """
+        if SCRAPER_CONFIG["browser_extract"] and page_archive is None:
+            fields = JobScraper.load_job_fields(driver, job_url)
+            if fields is not None:
+                Metrics.inc("browser_extracted")
+                return fields, None
+            logger.info(f"In-browser extraction failed for job {job_id}, falling back to the page source")
+            Metrics.inc("browser_extract_fallbacks")
+            return None, JobScraper.load_job_page(driver, job_url, job_id, loaded=True)
+        return None, JobScraper.load_job_page(driver, job_url, job_id)
+    
+    @staticmethod
+    def load_job_page(driver, job_url, job_id, loaded=False):
+        """Load a job page in the browser and return its HTML, retrying until the top card is present
+        
+        loaded skips the initial navigation when the driver is already on the page.
+        """
+        if not loaded:
+            with rate_controller.acquire(job_url):
+                driver.get(job_url)
+        
+        for attempt in range(SCRAPER_CONFIG["retry_attempts"]):
+            try:
+                logger.debug(f"Attempt {attempt+1} to read job page")
+                PageReadiness.wait_for_top_card(driver)
+                html = driver.page_source
+                Metrics.inc("browser_transfer_bytes", len(html))
+                
+                # Check if the page has loaded properly
+                outcome = RateController.classify(html, driver.current_url)
+                rate_controller.report(job_url, outcome)
+                if outcome == RateController.OK:
+                    logger.debug("Job page loaded successfully")
+                    return html
+                
+                if attempt < SCRAPER_CONFIG["retry_attempts"] - 1:
+                    logger.warning(f"Retrying page load for job {job_id} (attempt {attempt + 1}, {outcome})")
+                    Metrics.inc("page_retries")
+                    with rate_controller.acquire(job_url):
+                        driver.refresh()
+            except Exception as page_error:
+                logger.warning(f"Error reading job page on attempt {attempt+1}: {page_error}")
+                if attempt < SCRAPER_CONFIG["retry_attempts"] - 1:
+                    Metrics.inc("page_retries")
+                    with rate_controller.acquire(job_url):
+                        driver.refresh()
+        
+        logger.warning(f"Failed to load job page for {job_id} after {SCRAPER_CONFIG['retry_attempts']} attempts")
+        JobScraper.save_debug_page(job_id, driver.page_source)
+        return None
+    
+    @staticmethod
+    def next_job():
+        """Lease the next job, waiting up to wait_for_jobs_timeout
+        
+        The wait is cut into one-second slices so the worker notices
+        stop_event (and a drained frontier) promptly.
+        """
+        deadline = time.monotonic() + SCRAPER_CONFIG["wait_for_jobs_timeout"]
+        while not stop_event.is_set():
+            job = frontier.get(timeout=min(1, max(0, deadline - time.monotonic())))
+            if job is not None or time.monotonic() >= deadline or frontier.drained():
+                return job
+        return None
+    
+    @staticmethod
+    def get_job_details():
+        """Extract detailed information from individual job pages
+
+        Workers check a driver out of driver_pool only for pages that need a
+        browser; in http fetch mode that is just the fallback path.
+        """
+        logger.info('Waiting for job links to be available...')
+        
+        # Process jobs from the frontier until it is drained
+        while not stop_event.is_set():
+            job_id = None
+            job_url = None
+            try:
+                job = JobScraper.next_job()
+                if job is None:
+                    if frontier.drained():
+                        break
+                    continue
+                job_id, job_url, job_type, refresh = job
+                Metrics.job_started(job_id)
+                
+                logger.info(f"Processing job: {job_url}")
+                
+                # Skip if job already exists, unless it is due for a re-scrape
+                if job_id in known_jobs and not refresh:
+                    logger.info(f"Job {job_id} already exists in database, skipping")
+                    Metrics.inc("duplicates_skipped")
+                    Metrics.job_finished(job_id, written=False)
+                    frontier.done(job_id)
+                    continue
                 
                 # Initialize job data
                 job_data = {
@@ -328,198 +3196,678 @@ class JobScraper:
                     'Scrape Time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 }
                 
-                # Load job page
-                driver.get(job_url)
-                wait_time = random.uniform(*SCRAPER_CONFIG["job_detail_wait"])
-                time.sleep(wait_time)
+                # Load job page, preferring the pooled http session
+                html = None
+                fields = None
+                with Metrics.timer("detail_fetch"):
+                    if SCRAPER_CONFIG["fetch_mode"] == "http":
+                        html = HttpFetcher.fetch(job_url)
+                        if not JobScraper.has_job_markers(html):
+                            logger.info(f"Job {job_id} is missing expected markers over http, falling back to browser")
+                            Metrics.inc("http_fallbacks")
+                            html = None
+                    
+                    if not html:
+                        with driver_pool.checkout() as driver:
+                            fields, html = JobScraper.fetch_in_browser(driver, job_url, job_id)
                 
-                # Extract job details with retries
-                soup = None
-                h4 = None
-                job_title = None
+                # Hand the page to the parse stage unless it didn't load properly,
+                # fields extracted in the browser go straight to the writer;
+                # the job is acknowledged once it has been written
+                if fields:
+                    Metrics.inc("pages_fetched")
+                    DatabaseManager.insert_job(browser_job(job_data, fields))
+                elif html:
+                    Metrics.inc("pages_fetched")
+                    if page_archive is not None:
+                        page_archive.store(job_data, html)
+                    parse_stage.submit(html, job_data)
+                else:
+                    frontier.fail(job_id)
                 
-                for attempt in range(SCRAPER_CONFIG["retry_attempts"]):
-                    try:
-                        logger.debug(f"Attempt {attempt+1} to parse job page")
-                        soup = BeautifulSoup(driver.page_source, 'html.parser')
-                        
-                        # Check if the page has loaded properly
-                        h4 = soup.select_one('h1 + h4') or soup.select_one('section.top-card-layout h4')
-                        job_title = soup.find('h1')
-                        
-                        if h4 and job_title:
-                            logger.debug("Job page loaded successfully")
-                            break
-                        
-                        if attempt < SCRAPER_CONFIG["retry_attempts"] - 1:
-                            logger.warning(f"Retrying page load for job {job_id} (attempt {attempt + 1})")
-                            driver.refresh()
-                            time.sleep(2)
-                    except Exception as parsing_error:
-                        logger.warning(f"Error parsing job page on attempt {attempt+1}: {parsing_error}")
-                        if attempt < SCRAPER_CONFIG["retry_attempts"] - 1:
-                            driver.refresh()
-                            time.sleep(2)
+            except DriverPoolEmpty as e:
+                logger.critical(f"{e}, stopping the run; unfinished jobs are left for --resume")
+                frontier.release(job_id)
+                stop_event.set()
+                break
+            except Exception as e:
+                logger.error(f"Error processing job {job_url}: {e}", exc_info=True)  # Added exc_info for full traceback
                 
-                # Skip if page didn't load properly
-                if not h4 or not job_title:
-                    logger.warning(f"Failed to load job page for {job_id} after {SCRAPER_CONFIG['retry_attempts']} attempts")
-                    # Save the page source for debugging
-                    with open(f"error_page_{job_id}.html", "w", encoding="utf-8") as f:
-                        f.write(driver.page_source)
-                    job_queue.task_done()
+                if job_id and "429" in str(e).lower():
+                    # The pool has already replaced the driver if a browser hit the limit
+                    # and the rate controller is already backing off the host
+                    logger.warning(f"Rate limit detected, retrying job later: {e}")
+                    frontier.release(job_id)
+                elif job_id:
+                    frontier.fail(job_id)
+        
+        logger.info('No more jobs, worker exiting')
+
+class SearchCoordinator:
+    """Shards the result pages of many search queries across several search drivers
+    
+    Pages are handed out offset by offset across all queries, so the first
+    page of every query is fetched before any second page. A query stops as
+    soon as one of its pages comes back empty, and job ids are de-duplicated
+    across queries before they reach the frontier.
+    
+    In incremental mode results are sorted by date and a query also stops at
+    a page holding only stored jobs, or one whose newest job id is at or below
+    the query's high-water mark from earlier runs. A query's mark is only
+    raised when none of its pages failed and the run wasn't interrupted, so
+    pages that were never crawled aren't skipped by later runs.
+    """
+    
+    def __init__(self, queries):
+        self.queries = queries
+        self.tasks = Queue()
+        self.exhausted = {}
+        
+        # Skip pages a resumed run already finished
+        finished_pages = frontier.finished_pages()
+        for (key, start), cards in finished_pages.items():
+            if cards == 0:
+                self.exhausted[key] = min(start, self.exhausted.get(key, start))
+        for start in range(0, SCRAPER_CONFIG["max_pages"] * 25, 25):
+            for query in queries:
+                if (self.query_key(query), start) not in finished_pages:
+                    self.tasks.put((query, start))
+        self.queued_ids = set()
+        self.total_jobs = 0
+        self.high_water_marks = DatabaseManager.load_high_water_marks() if SCRAPER_CONFIG["incremental"] else {}
+        self.newest_ids = {}
+        self.failed_queries = set()
+        self._lock = Lock()
+    
+    @staticmethod
+    def query_key(query):
+        filters = ",".join(f"{key}={value}" for key, value in sorted(query.get("filters", {}).items()))
+        return f"{query.get('keywords')}|{query.get('geoId')}|{filters}"
+    
+    def is_exhausted(self, query, start):
+        with self._lock:
+            return start > self.exhausted.get(self.query_key(query), float("inf"))
+    
+    def mark_exhausted(self, query, start):
+        key = self.query_key(query)
+        with self._lock:
+            self.exhausted[key] = min(start, self.exhausted.get(key, start))
+    
+    @staticmethod
+    def is_stored(job_id):
+        """True for jobs already in the database
+        
+        Jobs another query queued in this run are not stored yet. queue_jobs
+        drops them as duplicates, but they must not stop this query's
+        incremental pagination.
+        """
+        return job_id in known_jobs
+    
+    def queue_jobs(self, cards):
+        """Add cards whose job id has not been queued by any query yet to the frontier"""
+        queued = 0
+        for job_url, job_type in cards:
+            job_id = JobScraper.extract_job_id(job_url)
+            with self._lock:
+                if job_id in self.queued_ids:
+                    continue
+                self.queued_ids.add(job_id)
+                self.total_jobs += 1
+            frontier.put(job_url, job_type)
+            queued += 1
+        Metrics.inc("jobs_queued", queued)
+        return queued
+    
+    def run_worker(self, driver):
+        """Take page tasks until none are left"""
+        while not stop_event.is_set():
+            try:
+                query, start = self.tasks.get_nowait()
+            except Empty:
+                return
+            if self.is_exhausted(query, start):
+                continue
+            
+            key = self.query_key(query)
+            try:
+                cards, known_ids = JobScraper.scrape_search_page(driver, JobScraper.build_search_url(query, start), self.is_stored)
+            except Exception as e:
+                logger.error(f"Error scraping search page {start // 25 + 1} of '{key}': {e}")
+                with self._lock:
+                    self.failed_queries.add(key)
+                continue
+            
+            page_jobs = self.queue_jobs(cards)
+            logger.info(f"Added {page_jobs} jobs from Page {start // 25 + 1} of '{key}' "
+                        f"({len(known_ids)} already stored) | Total: {self.total_jobs}")
+            
+            page_ids = [int(job_id) for job_id in known_ids + [JobScraper.extract_job_id(url) for url, _ in cards] if job_id.isdigit()]
+            newest_on_page = max(page_ids, default=0)
+            with self._lock:
+                self.newest_ids[key] = max(newest_on_page, self.newest_ids.get(key, 0))
+            
+            # Check if we've reached the end of available (or new) jobs for this query
+            stop = False
+            if not cards and not known_ids:
+                logger.info(f"No more jobs found for '{key}', stopping its pagination")
+                stop = True
+            elif SCRAPER_CONFIG["incremental"] and not cards:
+                logger.info(f"Page {start // 25 + 1} of '{key}' holds only stored jobs, stopping its pagination")
+                stop = True
+            elif SCRAPER_CONFIG["incremental"] and newest_on_page and newest_on_page <= self.high_water_marks.get(key, 0):
+                logger.info(f"Page {start // 25 + 1} of '{key}' is past the high-water mark, stopping its pagination")
+                stop = True
+            
+            # An exhausting page is recorded with 0 cards so --resume stops there too
+            frontier.page_done(key, start, 0 if stop else len(cards) + len(known_ids))
+            if stop:
+                self.mark_exhausted(query, start)
+    
+    def run(self, drivers):
+        """Run one search worker per driver and return the number of jobs queued"""
+        threads = [Thread(target=self.run_worker, args=(driver,), name=f"search-{i}") for i, driver in enumerate(drivers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        if SCRAPER_CONFIG["incremental"]:
+            if stop_event.is_set():
+                logger.warning("Search was interrupted, keeping the previous high-water marks")
+            else:
+                for key, newest_id in self.newest_ids.items():
+                    if key in self.failed_queries:
+                        logger.warning(f"Keeping the previous high-water mark of '{key}', some of its pages failed")
+                    elif newest_id:
+                        DatabaseManager.save_high_water_mark(key, newest_id)
+        return self.total_jobs
+
+def parse_job(html, job_data):
+    """Parse a fetched job page into finished job data, or None if extraction fails
+    
+    Module level so it can run in the parse stage's worker processes.
+    """
+    fetched_at = datetime.strptime(job_data['Scrape Time'], "%Y-%m-%d %H:%M:%S")
+    job_fields = JobScraper.parse_job_page(html, fetched_at)
+    if not job_fields:
+        return None
+    return finish_job(job_data, job_fields)
+
+def finish_job(job_data, job_fields):
+    """Merge normalized job fields into job_data and type it for storage, ready for the writer"""
+    job_data.update(job_fields)
+    if DB_CONFIG["dedup_descriptions"]:
+        job_data = DescriptionStore.attach_hash(job_data)
+    return JobSchema.normalize(job_data)
+
+def browser_job(job_data, fields):
+    """Finished job data from fields extracted in the browser"""
+    fetched_at = datetime.strptime(job_data['Scrape Time'], "%Y-%m-%d %H:%M:%S")
+    return finish_job(job_data, JobScraper.normalize_fields(fields, fetched_at))
+
+def timed_parse_job(html, job_data):
+    """parse_job plus the seconds it took, measured in the worker process"""
+    started = time.monotonic()
+    result = parse_job(html, job_data)
+    return result, time.monotonic() - started
+
+# Settings parse_job reads, copied into each spawned parse process so
+# changes made at runtime apply there as well
+PARSE_SCRAPER_CONFIG_KEYS = ("parser_backend",)
+PARSE_DB_CONFIG_KEYS = ("dedup_descriptions",)
+
+def init_parse_worker(scraper_config, db_config):
+    """Apply the parent's parse settings in a freshly spawned parse process"""
+    SCRAPER_CONFIG.update(scraper_config)
+    DB_CONFIG.update(db_config)
+
+def create_parse_pool(workers):
+    """Spawned process pool for parse_job, or None to parse inline"""
+    if workers <= 0:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_parse_worker,
+        initargs=({key: SCRAPER_CONFIG[key] for key in PARSE_SCRAPER_CONFIG_KEYS},
+                  {key: DB_CONFIG[key] for key in PARSE_DB_CONFIG_KEYS})
+    )
+
+class ParseStage:
+    """Parses fetched pages in a process pool and hands finished job data to the writer
+    
+    Fetch workers submit raw HTML with its job data; the bounded queue makes
+    them block when parsing falls behind, and at most two pages per parse
+    process are in flight at once. A pool that breaks (a worker process died)
+    is replaced and its pages are resubmitted up to parse_pool_retries times.
+    """
+    
+    def __init__(self, workers=None, queue_size=None):
+        self.workers = SCRAPER_CONFIG["parse_workers"] if workers is None else workers
+        self.queue = Queue(maxsize=queue_size or SCRAPER_CONFIG["parse_queue_size"])
+        self.executor = create_parse_pool(self.workers)
+        self._executor_lock = Lock()
+        self._in_flight = Semaphore(max(1, self.workers * 2))
+        self._closed = False
+        self._thread = Thread(target=self._run, name="parse-stage", daemon=True)
+    
+    def start(self):
+        """Start dispatching queued pages to the pool"""
+        self._thread.start()
+        return self
+    
+    def submit(self, html, job_data):
+        """Queue a fetched page for parsing; blocks while the queue is full"""
+        if self._closed:
+            raise RuntimeError("ParseStage is closed")
+        if self.executor is None:
+            result, seconds = timed_parse_job(html, job_data)
+            Metrics.observe("parse", seconds)
+            self._finish(job_data, result, html)
+            return
+        self.queue.put((html, job_data))
+    
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            html, job_data = item
+            self._in_flight.acquire()
+            self._dispatch(html, job_data)
+    
+    def _dispatch(self, html, job_data, attempt=0):
+        """Submit a page to the current pool; the in-flight slot is released once it is finished"""
+        executor = self.executor
+        try:
+            future = executor.submit(timed_parse_job, html, job_data)
+        except BrokenProcessPool as e:
+            if attempt < SCRAPER_CONFIG["parse_pool_retries"]:
+                self._replace_executor(executor)
+                self._dispatch(html, job_data, attempt + 1)
+            else:
+                self._failed(job_data, e)
+            return
+        except Exception as e:
+            self._failed(job_data, e)
+            return
+        future.add_done_callback(lambda future: self._done(future, html, job_data, executor, attempt))
+    
+    def _replace_executor(self, executor):
+        """Swap a broken pool for a new one, once however many of its pages report it"""
+        with self._executor_lock:
+            if self.executor is not executor:
+                return
+            logger.warning("Parse process pool broke, starting a new one")
+            Metrics.inc("parse_pool_restarts")
+            executor.shutdown(wait=False)
+            self.executor = create_parse_pool(self.workers)
+    
+    def _done(self, future, html, job_data, executor, attempt):
+        try:
+            result, seconds = future.result()
+            Metrics.observe("parse", seconds)
+        except BrokenProcessPool as e:
+            if attempt < SCRAPER_CONFIG["parse_pool_retries"]:
+                self._replace_executor(executor)
+                self._dispatch(html, job_data, attempt + 1)
+            else:
+                self._failed(job_data, e)
+            return
+        except Exception as e:
+            self._failed(job_data, e)
+            return
+        self._in_flight.release()
+        self._finish(job_data, result, html)
+    
+    def _failed(self, job_data, error):
+        self._in_flight.release()
+        logger.error(f"Error parsing job {job_data['Job Id']}: {error}")
+        Metrics.inc("parse_failures")
+        if frontier is not None:
+            frontier.fail(job_data['Job Id'])
+    
+    def _finish(self, job_data, result, html):
+        """Send parsed job data to the writer, or keep the page for debugging"""
+        job_id = job_data['Job Id']
+        if not result:
+            logger.warning(f"Could not extract fields for job {job_id}")
+            Metrics.inc("parse_failures")
+            JobScraper.save_debug_page(job_id, html)
+            if frontier is not None:
+                frontier.fail(job_id)
+            return
+        try:
+            DatabaseManager.insert_job(result)
+            logger.info(f"Queued job for insert: {result['Job Title']} at {result['Company Name']}")
+        except Exception as e:
+            logger.error(f"Error inserting job data into database: {e}")
+    
+    def close(self):
+        """Parse everything still queued, then stop the pool"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join()
+        if self.executor is not None:
+            # Wait for every in-flight page, including ones resubmitted to a replacement pool
+            for _ in range(max(1, self.workers * 2)):
+                self._in_flight.acquire()
+            self.executor.shutdown(wait=True)
+
+class AsyncPipeline:
+    """Search, fetch, parse and write stages as coroutines joined by bounded asyncio queues
+    
+    A full queue suspends the stage feeding it, so a slow parser or database
+    throttles fetching without busy-waiting. Blocking work is bridged through
+    executors: SQLite and Mongo through small thread pools, browsers through one
+    thread per pooled driver and parsing through the spawned process pool. With
+    aiohttp installed, http fetches run on the event loop itself. SIGINT and
+    SIGTERM cancel the run. search and fetch select the stages a --role runs.
+    
+    Jobs are only leased when a fetcher is free, so leases don't expire while
+    jobs wait in the fetch queue behind a rate-limited host.
+    """
+    
+    def __init__(self, queries, drivers, search=True, fetch=True):
+        self.queries = queries
+        self.drivers = drivers
+        self.search = search
+        self.fetch = fetch
+        size = SCRAPER_CONFIG["async_queue_size"]
+        self.fetch_queue = asyncio.Queue(maxsize=size)
+        self.parse_queue = asyncio.Queue(maxsize=size)
+        self.write_queue = asyncio.Queue(maxsize=size)
+        self.http_mode = SCRAPER_CONFIG["fetch_mode"] == "http"
+        self.browsers = driver_pool.size if driver_pool else 0
+        self.fetchers = SCRAPER_CONFIG["async_fetches"] if self.http_mode else max(1, self.browsers)
+        self.fetch_slots = asyncio.Semaphore(self.fetchers)
+        self.parse_workers = SCRAPER_CONFIG["parse_workers"]
+        self.session = None
+    
+    async def run(self):
+        """Run every stage until the frontier is drained or the run is cancelled"""
+        loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.task.cancel)
+        
+        self.io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="async-io")
+        self.write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-write")
+        self.browser_executor = ThreadPoolExecutor(max_workers=max(1, self.browsers), thread_name_prefix="async-browser")
+        # Without aiohttp every in-flight http fetch needs its own thread
+        self.http_executor = ThreadPoolExecutor(max_workers=self.fetchers, thread_name_prefix="async-http")
+        self.parse_pool = create_parse_pool(self.parse_workers) if self.fetch else None
+        if self.fetch and self.http_mode and aiohttp is not None:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=SCRAPER_CONFIG["http_timeout"]),
+                connector=aiohttp.TCPConnector(limit=SCRAPER_CONFIG["http_pool_size"]),
+                headers=dict(HttpFetcher.get_session().headers)
+            )
+        Metrics.gauge("async_queue_depth", lambda: {
+            "fetch": self.fetch_queue.qsize(), "parse": self.parse_queue.qsize(), "write": self.write_queue.qsize()
+        }, label="stage")
+        
+        workers = []
+        if self.fetch:
+            workers += [loop.create_task(self.fetch_stage()) for _ in range(self.fetchers)]
+            workers += [loop.create_task(self.parse_stage()) for _ in range(max(1, self.parse_workers * 2))]
+            workers.append(loop.create_task(self.write_stage()))
+        stages = ([self.search_stage()] if self.search else []) + ([self.lease_stage()] if self.fetch else [])
+        try:
+            await asyncio.gather(*stages)
+            if stop_event.is_set():
+                logger.warning("⚠️ LinkedIn Scraping was interrupted, resume it with --resume")
+            else:
+                logger.info("✅ LinkedIn Scraping Done Successfully!")
+        except asyncio.CancelledError:
+            logger.info("Interrupt received, cancelling the pipeline; resume it with --resume")
+            stop_event.set()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(sig)
+            if self.session is not None:
+                await self.session.close()
+            for executor in (self.io_executor, self.write_executor, self.browser_executor, self.http_executor):
+                executor.shutdown(wait=False, cancel_futures=True)
+            if self.parse_pool is not None:
+                self.parse_pool.shutdown(wait=True, cancel_futures=True)
+    
+    async def search_stage(self):
+        """Shard the search result pages over the search drivers, then close the frontier's input"""
+        loop = asyncio.get_running_loop()
+        search_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-search")
+        try:
+            await loop.run_in_executor(search_executor, JobScraper.get_job_links, self.queries, self.drivers)
+        finally:
+            search_executor.shutdown(wait=False)
+            frontier.close_input()
+    
+    async def lease_stage(self):
+        """Lease a job for each free fetcher and hand it over until the frontier is drained"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.fetch_slots.acquire()
+            job = await loop.run_in_executor(self.io_executor, frontier.get, 1)
+            if job is not None:
+                await self.fetch_queue.put(job)
+                continue
+            self.fetch_slots.release()
+            if await loop.run_in_executor(self.io_executor, frontier.drained):
+                return
+    
+    async def fetch_http(self, url):
+        """Fetch a page over aiohttp, or the pooled requests session in a thread without it"""
+        if self.session is None:
+            return await asyncio.get_running_loop().run_in_executor(self.http_executor, HttpFetcher.fetch, url)
+        async with rate_controller.acquire_async(url):
+            async with self.session.get(url) as response:
+                html = await response.text()
+                return HttpFetcher.check(url, html, str(response.url), response.status)
+    
+    @staticmethod
+    def fetch_browser(job_url, job_id):
+        with driver_pool.checkout() as driver:
+            return JobScraper.fetch_in_browser(driver, job_url, job_id)
+    
+    async def fetch_stage(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job_id, job_url, job_type, refresh = await self.fetch_queue.get()
+            Metrics.job_started(job_id)
+            try:
+                if job_id in known_jobs and not refresh:
+                    Metrics.inc("duplicates_skipped")
+                    Metrics.job_finished(job_id, written=False)
+                    frontier.done(job_id)
                     continue
                 
-                # Extract job information
-                try:
-                    job_data['Job Title'] = job_title.get_text(strip=True) if job_title else "Not Mentioned"
-                except Exception as e:
-                    logger.error(f"Error extracting job title: {e}")
-                    job_data['Job Title'] = "Not Mentioned"
-                
-                # Job description
-                try:
-                    job_description = soup.find(class_='description__text')
-                    job_data['Job Description'] = job_description.get_text(strip=True) if job_description else "Not Mentioned"
-                except Exception as e:
-                    logger.error(f"Error extracting job description: {e}")
-                    job_data['Job Description'] = "Not Mentioned"
-                
-                # Job criteria
-                try:
-                    job_criteria = soup.find('ul', class_='description__job-criteria-list')
-                    if job_criteria:
-                        for li in job_criteria.find_all('li', class_='description__job-criteria-item'):
-                            try:
-                                heading = li.find('h3', class_='description__job-criteria-subheader')
-                                value = li.find('span', class_='description__job-criteria-text')
-                                
-                                if heading and value:
-                                    job_data[heading.get_text(strip=True)] = value.get_text(strip=True)
-                            except Exception as e:
-                                logger.error(f"Error extracting job criteria item: {e}")
-                except Exception as e:
-                    logger.error(f"Error extracting job criteria: {e}")
-                
-                # Company information
-                try:
-                    company_name = h4.find('a', class_='topcard__org-name-link')
-                    job_data['Company Name'] = company_name.get_text(strip=True) if company_name else "Not Mentioned"
-                except Exception as e:
-                    logger.error(f"Error extracting company name: {e}")
-                    job_data['Company Name'] = "Not Mentioned"
-                
-                try:
-                    company_link = h4.find('a', class_='topcard__org-name-link')
-                    job_data['Company Link'] = company_link['href'] if company_link and 'href' in company_link.attrs else "Not Mentioned"
-                except Exception as e:
-                    logger.error(f"Error extracting company link: {e}")
-                    job_data['Company Link'] = "Not Mentioned"
-                
-                try:
-                    location = h4.find('span', class_='topcard__flavor--bullet')
-                    job_data['Company Location'] = location.get_text(strip=True) if location else "Not Mentioned"
-                except Exception as e:
-                    logger.error(f"Error extracting company location: {e}")
-                    job_data['Company Location'] = "Not Mentioned"
-                
-                # Posting time
-                try:
-                    post_time = h4.find('span', class_='posted-time-ago__text')
-                    post_time_text = post_time.text.strip() if post_time else "Not Mentioned"
-                    job_data['Post Time'] = post_time_text
-                except Exception as e:
-                    logger.error(f"Error extracting post time: {e}")
-                    job_data['Post Time'] = "Not Mentioned"
-                
-                # Convert posting time
-                try:
-                    converted_time = DateTimeHelper.convert_to_datetime(job_data['Post Time'])
-                    job_data['Post Converted Time'] = converted_time.strftime("%Y-%m-%d %H:%M:%S") if converted_time else "Not Mentioned"
-                except Exception as e:
-                    logger.error(f"Error converting post time: {e}")
-                    job_data['Post Converted Time'] = "Not Mentioned"
-                
-                # Applicant information
-                try:
-                    applicants = h4.find('figcaption') or h4.find('span', class_='num-applicants__caption')
-                    job_data['Applicants Apply'] = applicants.get_text(strip=True) if applicants else "Not Mentioned"
-                except Exception as e:
-                    logger.error(f"Error extracting applicants info: {e}")
-                    job_data['Applicants Apply'] = "Not Mentioned"
-                
-                # Salary information
-                try:
-                    salary_description = soup.find('p', class_='compensation__description')
-                    job_data['Salary Description'] = salary_description.get_text(strip=True) if salary_description else "Not Mentioned"
-                except Exception as e:
-                    logger.error(f"Error extracting salary description: {e}")
-                    job_data['Salary Description'] = "Not Mentioned"
-                
-                try:
-                    salary_range = soup.find('div', class_='salary')
-                    job_data['Salary Range'] = salary_range.get_text(strip=True) if salary_range else "Not Mentioned"
-                except Exception as e:
-                    logger.error(f"Error extracting salary range: {e}")
-                    job_data['Salary Range'] = "Not Mentioned"
-                
-                # Insert job data into database
-                try:
-                    inserted = DatabaseManager.insert_job(job_data)
-                    if inserted:
-                        logger.info(f"Inserted job: {job_data['Job Title']} at {job_data['Company Name']}")
-                    else:
-                        logger.info(f"Job {job_id} already exists or could not be inserted")
-                except Exception as e:
-                    logger.error(f"Error inserting job data into database: {e}")
-
-                job_queue.task_done()
+                job_data = {
+                    'Job Id': job_id,
+                    'Job Url': job_url,
+                    'Job Type': job_type,
+                    'Scrape Time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                }
+                html = None
+                fields = None
+                with Metrics.timer("detail_fetch"):
+                    if self.http_mode:
+                        html = await self.fetch_http(job_url)
+                        if not JobScraper.has_job_markers(html):
+                            logger.info(f"Job {job_id} is missing expected markers over http, falling back to browser")
+                            Metrics.inc("http_fallbacks")
+                            html = None
+                    if not html:
+                        fields, html = await loop.run_in_executor(self.browser_executor, self.fetch_browser, job_url, job_id)
                 
+                if fields:
+                    # Extracted in the browser, nothing left to parse
+                    Metrics.inc("pages_fetched")
+                    await self.write_queue.put(browser_job(job_data, fields))
+                    continue
+                if not html:
+                    frontier.fail(job_id)
+                    continue
+                Metrics.inc("pages_fetched")
+                if page_archive is not None:
+                    await loop.run_in_executor(self.io_executor, page_archive.store, job_data, html)
+                await self.parse_queue.put((html, job_data))
+            except asyncio.CancelledError:
+                raise
+            except DriverPoolEmpty as e:
+                logger.critical(f"{e}, stopping the run; unfinished jobs are left for --resume")
+                frontier.release(job_id)
+                self.task.cancel()
             except Exception as e:
-                logger.error(f"Error processing job {job_url}: {e}", exc_info=True)  # Added exc_info for full traceback
-                
-                if job_url and "429" in str(e).lower():
-                    logger.warning(f"Rate limit detected, restarting driver: {e}")
-                    # Restart driver
-                    with lock:
-                        if driver in drivers:
-                            drivers.remove(driver)
-                        
-                        try:
-                            driver.quit()
-                        except Exception:
-                            pass
-                        
-                        new_driver = DriverManager.create_driver()
-                        if new_driver:
-                            drivers.append(new_driver)
-                            # Put the job back in the queue for retry
-                            job_queue.put((job_url, job_type))
-                    
-                    return
+                logger.error(f"Error processing job {job_url}: {e}")
+                if "429" in str(e):
+                    frontier.release(job_id)
+                else:
+                    frontier.fail(job_id)
+            finally:
+                self.fetch_slots.release()
+    
+    async def parse_in_pool(self, html, job_data):
+        """timed_parse_job in the process pool, replacing the pool if it broke under the page"""
+        loop = asyncio.get_running_loop()
+        for attempt in range(SCRAPER_CONFIG["parse_pool_retries"] + 1):
+            pool = self.parse_pool
+            try:
+                return await loop.run_in_executor(pool, timed_parse_job, html, job_data)
+            except BrokenProcessPool:
+                if attempt == SCRAPER_CONFIG["parse_pool_retries"]:
+                    raise
+                if self.parse_pool is pool:
+                    logger.warning("Parse process pool broke, starting a new one")
+                    Metrics.inc("parse_pool_restarts")
+                    pool.shutdown(wait=False)
+                    self.parse_pool = create_parse_pool(self.parse_workers)
+    
+    async def parse_stage(self):
+        while True:
+            html, job_data = await self.parse_queue.get()
+            job_id = job_data['Job Id']
+            try:
+                if self.parse_pool is None:
+                    result, seconds = timed_parse_job(html, job_data)
                 else:
-                    try:
-                        if job_url:  # Only mark as done if we had a valid job
-                            job_queue.task_done()
-                    except Exception:
-                        pass
+                    result, seconds = await self.parse_in_pool(html, job_data)
+                Metrics.observe("parse", seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error parsing job {job_id}: {e}")
+                result = None
+            
+            if result:
+                await self.write_queue.put(result)
+                continue
+            logger.warning(f"Could not extract fields for job {job_id}")
+            Metrics.inc("parse_failures")
+            JobScraper.save_debug_page(job_id, html)
+            frontier.fail(job_id)
+    
+    async def write_stage(self):
+        """Batch parsed jobs by size or flush interval and write them with the JobWriter"""
+        loop = asyncio.get_running_loop()
+        batch = []
+        deadline = loop.time() + job_writer.flush_interval
+        try:
+            while True:
+                try:
+                    batch.append(await asyncio.wait_for(self.write_queue.get(), max(0, deadline - loop.time())))
+                except asyncio.TimeoutError:
+                    pass
+                if len(batch) >= job_writer.batch_size or loop.time() >= deadline:
+                    pending, batch = batch, []
+                    await loop.run_in_executor(self.write_executor, job_writer.flush, pending)
+                    deadline = loop.time() + job_writer.flush_interval
+        finally:
+            # Cancelled at shutdown: write what was already parsed
+            job_writer.flush(batch)
 
 def signal_handler(sig, frame):
-    """Handle interrupt signals"""
-    global stop_event
+    """Handle interrupt signals
+    
+    The first signal only stops the search and worker threads; main() joins
+    them and then cleans up once, so nothing is closed under a running worker.
+    A second signal stops waiting for them.
+    """
+    if stop_event.is_set():
+        logger.warning("Second interrupt received, exiting without waiting for workers")
+        raise SystemExit(1)
     logger.info("Interrupt received, shutting down gracefully...")
-    stop_event = True
-    cleanup()
+    stop_event.set()
 
 def cleanup():
     """Clean up resources"""
     logger.info("Cleaning up resources...")
-    DriverManager.quit_drivers(drivers)
+    DriverManager.quit_drivers(search_drivers)
+    if driver_pool:
+        logger.info(f"Driver pool stats: {driver_pool.stats()}")
+        driver_pool.close()
+    logger.info(f"Page readiness latencies: {PageReadiness.summary()}")
+    if rate_controller:
+        logger.info(f"Final rates: {rate_controller.snapshot()}")
+        rate_controller.stop()
+    if parse_stage:
+        parse_stage.close()
+    if job_writer:
+        job_writer.close()
+    if company_enricher:
+        company_enricher.close(wait=not stop_event.is_set())
+        logger.info(f"Company cache: {company_enricher.stats()}")
+    HttpFetcher.close()
+    if frontier:
+        frontier.close()
+    if page_archive:
+        logger.info(f"Page archive: {page_archive.stats()}")
+        page_archive.close()
+    try:
+        Metrics.write_summary()
+    except Exception as e:
+        logger.error(f"Error writing metrics summary: {e}")
+    if metrics_server:
+        metrics_server.close()
     DatabaseManager.close()
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Scrape LinkedIn job listings into MongoDB")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the crawl recorded in the frontier instead of starting a new one")
+    parser.add_argument("--role", choices=["all", "search", "worker"], default="all",
+                        help="search only paginates, worker only fetches job pages; either shares a Mongo frontier with other nodes")
+    parser.add_argument("--engine", choices=["asyncio", "threads"], default=SCRAPER_CONFIG["engine"],
+                        help="Pipeline engine (default: SCRAPER_CONFIG engine)")
+    parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], default=SCRAPER_CONFIG["log_level"],
+                        help="Scraper log level (default: SCRAPER_CONFIG log_level)")
+    parser.add_argument("--rebuild-profiles", action="store_true",
+                        help="Rebuild the template Chrome profiles, e.g. after exporting new login cookies")
+    parser.add_argument("--metrics-port", type=int, default=SCRAPER_CONFIG["metrics_port"],
+                        help="Port for the /metrics and /stats endpoint, 0 picks a free one")
+    return parser.parse_args(argv)
+
+def register_gauges():
+    """Sample queue depths, frontier states, driver utilization and host rates on every metrics read"""
+    Metrics.gauge("parse_queue_depth", lambda: parse_stage.queue.qsize())
+    Metrics.gauge("write_buffer_depth", lambda: job_writer.buffer.qsize())
+    Metrics.gauge("frontier_jobs", lambda: frontier.counts(), label="state")
+    Metrics.gauge("driver_pool", lambda: driver_pool.stats(), label="kind")
+    Metrics.gauge("driver_utilization", lambda: driver_pool.utilization(), label="slot")
+    Metrics.gauge("host_rate", lambda: {host: state["rate"] for host, state in rate_controller.snapshot().items()}, label="host")
+
+def main(argv=None):
     """Main function to run the scraper"""
-    global client, db, collection, drivers, job_queue, stop_event
+    global client, db, collection, driver_pool, search_drivers, frontier, page_archive, company_enricher, job_writer, parse_stage, rate_controller, known_jobs, metrics_server
+    
+    args = parse_args(argv)
+    logger.setLevel(args.log_level)
     
     # Register signal handlers
     signal.signal(signal.SIGINT, signal_handler)
@@ -528,46 +3876,85 @@ def main():
     try:
         # Connect to database
         client, db, collection = DatabaseManager.connect()
+        DatabaseManager.ensure_indexes(collection)
+        known_jobs = KnownJobIndex.load(collection)
+        searching = args.role in ("all", "search")
+        fetching = args.role in ("all", "worker")
+        if args.role != "all" or SCRAPER_CONFIG["frontier_backend"] == "mongo":
+            frontier = MongoFrontier(db, args.role, resume=args.resume)
+        else:
+            frontier = Frontier(resume=args.resume)
+        if SCRAPER_CONFIG["rescrape_ttl_hours"] and searching and not args.resume:
+            stale = 0
+            for doc in DatabaseManager.find_stale_jobs():
+                frontier.put(doc["Job Url"], doc.get("Job Type", "Unknown"), refresh=True)
+                stale += 1
+            logger.info(f"Queued {stale} stale jobs for re-scrape")
+        if SCRAPER_CONFIG["archive_enabled"]:
+            page_archive = PageArchive()
+        descriptions = DescriptionStore(db) if DB_CONFIG["dedup_descriptions"] else None
+        if SCRAPER_CONFIG["company_enrichment"] and fetching:
+            company_enricher = CompanyEnricher(db)
+        job_writer = JobWriter(collection, descriptions=descriptions, companies=company_enricher)
+        if args.engine == "threads" and fetching:
+            job_writer.start()
+            parse_stage = ParseStage().start()
+        rate_controller = RateController().start()
+        register_gauges()
+        if args.metrics_port is not None:
+            metrics_server = MetricsServer(port=args.metrics_port).start()
         
-        # LinkedIn search URL
-        linkedin_url = "https://www.linkedin.com/jobs/search/?currentJobId=4141450053&geoId=103644278&keywords=python%20developer&origin=JOB_SEARCH_PAGE_LOCATION_AUTOCOMPLETE&refresh=true"
+        if args.rebuild_profiles:
+            DriverManager.rebuild_templates()
         
-        # Create main driver for pagination
-        main_driver = DriverManager.create_driver(headless=False, use_profile=True)
-        if not main_driver:
-            logger.error("Failed to create main driver")
-            return
+        # Create search drivers for pagination
+        if searching:
+            search_drivers = DriverManager.create_search_drivers(SCRAPER_CONFIG["search_drivers"])
+            if not search_drivers:
+                logger.error("Failed to create search drivers")
+                return
+        
+        # Start the worker driver pool (in http mode only a few fallback browsers are needed)
+        http_mode = SCRAPER_CONFIG["fetch_mode"] == "http"
+        driver_count = SCRAPER_CONFIG["fallback_drivers"] if http_mode else SCRAPER_CONFIG["num_drivers"]
+        if fetching:
+            driver_pool = DriverPool(driver_count)
+            if not driver_pool.start():
+                logger.error("Failed to create worker drivers")
+                return
         
-        # Create worker drivers
-        drivers = DriverManager.create_drivers(SCRAPER_CONFIG["num_drivers"])
-        if not drivers:
-            logger.error("Failed to create worker drivers")
-            main_driver.quit()
+        if args.engine == "asyncio":
+            pipeline = AsyncPipeline(SCRAPER_CONFIG["search_queries"], search_drivers, search=searching, fetch=fetching)
+            asyncio.run(pipeline.run())
             return
         
         # Run URL scraper in a thread
-        url_thread = Thread(target=JobScraper.get_job_links, args=(SCRAPER_CONFIG["linkedin_url"], main_driver))
-        url_thread.start()
+        if searching:
+            url_thread = Thread(target=JobScraper.get_job_links, args=(SCRAPER_CONFIG["search_queries"], search_drivers))
+            url_thread.start()
         
         # Start worker threads
+        worker_count = SCRAPER_CONFIG["http_workers"] if http_mode else driver_count
         worker_threads = []
-        for driver in drivers:
-            worker_thread = Thread(target=JobScraper.get_job_details, args=(driver,))
+        for _ in range(worker_count if fetching else 0):
+            worker_thread = Thread(target=JobScraper.get_job_details)
             worker_thread.start()
             worker_threads.append(worker_thread)
         
-        # Wait for URL scraper to finish
-        url_thread.join()
-        
-        # Add end signals to queue
-        for _ in range(len(drivers)):
-            job_queue.put((None, None))
+        # Wait for URL scraper to finish, then let workers drain the frontier
+        if searching:
+            url_thread.join()
+            if not stop_event.is_set():
+                frontier.close_input()
         
         # Wait for workers to finish
         for thread in worker_threads:
             thread.join()
         
-        logger.info("✅ LinkedIn Scraping Done Successfully!")
+        if stop_event.is_set():
+            logger.warning("⚠️ LinkedIn Scraping was interrupted, resume it with --resume")
+        else:
+            logger.info("✅ LinkedIn Scraping Done Successfully!")
         
     except Exception as e:
         logger.error(f"Error in main: {e}")
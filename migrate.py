@@ -0,0 +1,99 @@
+"""One-off maintenance for the jobs collection
+
+Usage:
+    python migrate.py descriptions [--batch-size 1000]   # move inline descriptions into the descriptions collection
+    python migrate.py report                              # description dedup numbers
+    python migrate.py schema [--batch-size 1000]         # store older jobs with typed fields and create the query indexes
+"""
+import argparse
+import json
+
+from pymongo import ReplaceOne, UpdateOne
+
+import main
+
+
+def migrate_descriptions(db, batch_size=1000):
+    """Replace inline "Job Description" texts with hashes into the descriptions store"""
+    jobs = db[main.DB_CONFIG["collection_name"]]
+    descriptions = main.DescriptionStore(db)
+    query = {
+        main.DescriptionStore.HASH_FIELD: {"$exists": False},
+        main.DescriptionStore.TEXT_FIELD: {"$exists": True, "$nin": [main.JobSchema.MISSING, None]}
+    }
+    projection = {main.DescriptionStore.TEXT_FIELD: 1}
+
+    migrated = 0
+    while True:
+        # Migrated documents drop out of the query, so every pass starts over
+        batch = list(jobs.find(query, projection).limit(batch_size))
+        if not batch:
+            break
+        texts = {}
+        operations = []
+        for doc in batch:
+            text = main.DescriptionStore.normalize(doc[main.DescriptionStore.TEXT_FIELD] or "")
+            if not text:
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {main.DescriptionStore.TEXT_FIELD: None}}))
+                continue
+            digest = main.DescriptionStore.digest(text)
+            texts[digest] = text
+            operations.append(UpdateOne({"_id": doc["_id"]}, {
+                "$set": {main.DescriptionStore.HASH_FIELD: digest},
+                "$unset": {main.DescriptionStore.TEXT_FIELD: ""}
+            }))
+        descriptions.store(texts)
+        jobs.bulk_write(operations, ordered=False)
+        migrated += len(batch)
+        print(f"Migrated {migrated} descriptions")
+    return migrated
+
+
+def migrate_schema(db, batch_size=1000):
+    """Rewrite jobs stored before the current JobSchema with typed fields, then create the query indexes"""
+    jobs = db[main.DB_CONFIG["collection_name"]]
+    query = {main.JobSchema.VERSION_FIELD: {"$ne": main.JobSchema.VERSION}}
+
+    migrated = 0
+    while True:
+        # Migrated documents drop out of the query, so every pass starts over
+        batch = list(jobs.find(query).limit(batch_size))
+        if not batch:
+            break
+        jobs.bulk_write([ReplaceOne({"_id": doc["_id"]}, main.JobSchema.normalize(doc)) for doc in batch], ordered=False)
+        migrated += len(batch)
+        print(f"Migrated {migrated} jobs")
+    main.DatabaseManager.ensure_indexes(jobs)
+    return migrated
+
+
+def description_report(db):
+    jobs = db[main.DB_CONFIG["collection_name"]]
+    return main.DescriptionStore(db).report(jobs)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="LinkedIn scraper database maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    descriptions_parser = subparsers.add_parser("descriptions", help="Move inline job descriptions into the dedup store")
+    descriptions_parser.add_argument("--batch-size", type=int, default=1000)
+    subparsers.add_parser("report", help="Show description dedup numbers")
+    schema_parser = subparsers.add_parser("schema", help="Store older jobs with typed fields and create the query indexes")
+    schema_parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    client, db, _ = main.DatabaseManager.connect()
+    try:
+        if args.command == "descriptions":
+            print(f"Migrated {migrate_descriptions(db, args.batch_size)} jobs")
+        elif args.command == "schema":
+            print(f"Migrated {migrate_schema(db, args.batch_size)} jobs")
+        elif args.command == "report":
+            print(json.dumps(description_report(db), indent=2))
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,57 @@
+"""Re-run field extraction over the page archive and upsert the results
+
+No browser or network is used: the newest archived page of every job is
+parsed in the process-pool parse stage and bulk-upserted, replacing the
+stored fields. Enable "archive_enabled" in SCRAPER_CONFIG to build an archive.
+
+Usage:
+    python replay.py [--archive archive/] [--since "2025-01-01 00:00:00"] [--parse-workers 8]
+"""
+import argparse
+import time
+
+import main
+
+
+def replay(archive_dir=None, since=None, parse_workers=None):
+    """Parse every archived job page and upsert the results, returning the number of pages replayed"""
+    archive = main.PageArchive(archive_dir)
+    client, db, collection = main.DatabaseManager.connect()
+    main.client, main.db, main.collection = client, db, collection
+    main.DatabaseManager.ensure_indexes(collection)
+    descriptions = main.DescriptionStore(db) if main.DB_CONFIG["dedup_descriptions"] else None
+    main.job_writer = main.JobWriter(collection, overwrite=True, descriptions=descriptions).start()
+    main.parse_stage = main.ParseStage(workers=parse_workers).start()
+
+    replayed = 0
+    start = time.perf_counter()
+    try:
+        for job_data, html in archive.iter_latest(since):
+            main.parse_stage.submit(html, job_data)
+            replayed += 1
+            if replayed % 10000 == 0:
+                print(f"Replayed {replayed} pages ({replayed / (time.perf_counter() - start):.0f} pages/sec)")
+    finally:
+        main.parse_stage.close()
+        main.job_writer.close()
+        archive.close()
+        main.DatabaseManager.close()
+
+    elapsed = time.perf_counter() - start
+    writer = main.job_writer
+    print(f"Replayed {replayed} pages in {elapsed:.1f}s ({replayed / elapsed if elapsed else 0:.0f} pages/sec) | "
+          f"Inserted: {writer.inserted} | Updated: {writer.existing} | Failed: {writer.failed}")
+    return replayed
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Re-parse archived job pages into MongoDB")
+    parser.add_argument("--archive", default=main.SCRAPER_CONFIG["archive_dir"], help="Archive directory")
+    parser.add_argument("--since", help='Only pages fetched at or after this time ("YYYY-MM-DD HH:MM:SS")')
+    parser.add_argument("--parse-workers", type=int, default=None, help="Parse processes (default: SCRAPER_CONFIG)")
+    args = parser.parse_args()
+    replay(args.archive, args.since, args.parse_workers)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,24 +1,171 @@
-import pymongo
+"""Export the jobs collection to JSONL, CSV or Parquet
+
+Documents are streamed from a cursor and written in chunks, so memory stays
+flat however large the collection is. CSV and Parquet columns are the union of
+every document's fields, gathered by a cheap server-side first pass unless
+--fields declares them.
+
+Usage:
+    python save_data.py [--format csv|jsonl|parquet] [--output output.csv] [--since "2025-01-01 00:00:00"]
+                        [--fields "Job Id,Job Title,Company Name"] [--batch-size 2000]
+"""
+from datetime import datetime
+import argparse
+import json
 import csv
 
-# MongoDB connection
-client = pymongo.MongoClient("mongodb://localhost:27017/")
-db = client["local"]  # Replace with your database name
-collection = db["jobs"]  # Replace with your collection name
+import pymongo
+
+from main import DB_CONFIG, JOB_FIELD_SPEC, DescriptionStore, JobSchema
 
-# Fetch all data from the collection
-data = list(collection.find())
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
 
-if data:
-    # Extract field names from the first document
-    fieldnames = data[0].keys()
-    
-    # Save data to CSV
-    with open("output.csv", "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
+# Leading columns in the order the scraper writes them; any other field
+# (the per-job criteria such as "Seniority level") follows alphabetically
+BASE_COLUMNS = ["_id", "Job Id", "Job Url", "Job Type", "Scrape Time"]
+for field, _, _, _ in JOB_FIELD_SPEC:
+    if field:
+        BASE_COLUMNS.append(field)
+        BASE_COLUMNS.extend(JobSchema.DERIVED_FIELDS.get(field, ()))
+    if field == "Post Time":
+        BASE_COLUMNS.append("Post Converted Time")
+
+
+def build_query(since=None):
+    """Mongo filter for an export, optionally only jobs scraped at or after since ("YYYY-MM-DD HH:MM:SS")"""
+    if not since:
+        return {}
+    return JobSchema.time_filter("Scrape Time", "$gte", datetime.strptime(since, JobSchema.TIME_FORMAT))
+
+
+def collect_columns(collection, query):
+    """Union of field names across the matching documents, computed by the server"""
+    pipeline = [
+        {"$match": query},
+        {"$project": {"fields": {"$objectToArray": "$$ROOT"}}},
+        {"$unwind": "$fields"},
+        {"$group": {"_id": "$fields.k"}},
+    ]
+    names = {doc["_id"] for doc in collection.aggregate(pipeline, allowDiskUse=True)}
+    if DescriptionStore.HASH_FIELD in names:
+        # Hashes are exported as the description text they point to
+        names = (names - {DescriptionStore.HASH_FIELD}) | {DescriptionStore.TEXT_FIELD}
+    ordered = [column for column in BASE_COLUMNS if column in names]
+    return ordered + sorted(names - set(ordered))
+
+
+def to_text(value):
+    """Flatten a stored value (ObjectId, datetime, ...) for CSV and Parquet"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value if isinstance(value, str) else str(value)
+
+
+def iter_batches(cursor, batch_size):
+    """Group a cursor into lists of batch_size documents"""
+    batch = []
+    for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_jsonl(batches, output, columns=None):
+    count = 0
+    with open(output, "w", encoding="utf-8") as file:
+        for batch in batches:
+            file.writelines(json.dumps(doc, default=to_text, ensure_ascii=False) + "\n" for doc in batch)
+            count += len(batch)
+    return count
+
+
+def write_csv(batches, output, columns):
+    count = 0
+    with open(output, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=columns, extrasaction="ignore", restval="")
         writer.writeheader()
-        writer.writerows(data)
+        for batch in batches:
+            writer.writerows({column: to_text(doc.get(column)) for column in columns} for doc in batch)
+            count += len(batch)
+    return count
+
+
+def write_parquet(batches, output, columns):
+    if pa is None:
+        raise SystemExit("Parquet export requires pyarrow (pip install pyarrow)")
+    schema = pa.schema([(column, pa.string()) for column in columns])
+    count = 0
+    with pq.ParquetWriter(output, schema, compression="zstd") as writer:
+        for batch in batches:
+            rows = [{column: to_text(doc.get(column)) for column in columns} for doc in batch]
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            count += len(batch)
+    return count
+
+
+WRITERS = {"jsonl": write_jsonl, "csv": write_csv, "parquet": write_parquet}
+
+
+def export(collection, output, file_format="csv", since=None, fields=None, batch_size=2000, descriptions=None):
+    """Stream matching jobs into output and return the number of documents written
     
-    print("Data saved to output.csv")
-else:
-    print("No data found in the collection.")
+    With a DescriptionStore, jobs that only carry a description hash get the
+    text back, looked up once per batch.
+    """
+    query = build_query(since)
+    columns = fields
+    if columns is None and file_format != "jsonl":
+        columns = collect_columns(collection, query)
+    projection = {column: 1 for column in columns} if fields else None
+    if projection is not None and "_id" not in fields:
+        projection["_id"] = 0
+    if projection is not None and DescriptionStore.TEXT_FIELD in fields:
+        projection[DescriptionStore.HASH_FIELD] = 1
+
+    cursor = collection.find(query, projection).batch_size(batch_size)
+    batches = iter_batches(cursor, batch_size)
+    if descriptions is not None:
+        batches = map(descriptions.rehydrate, batches)
+    try:
+        return WRITERS[file_format](batches, output, columns)
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export scraped jobs from MongoDB")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="csv")
+    parser.add_argument("--output", help="Output file (default: output.<format>)")
+    parser.add_argument("--since", help='Only jobs scraped at or after this time ("YYYY-MM-DD HH:MM:SS")')
+    parser.add_argument("--fields", help="Comma-separated columns to export, skips the column discovery pass")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    client = pymongo.MongoClient(DB_CONFIG["host"])
+    db = client[DB_CONFIG["db_name"]]
+    collection = db[DB_CONFIG["collection_name"]]
+    output = args.output or f"output.{args.format}"
+    fields = [field.strip() for field in args.fields.split(",")] if args.fields else None
+
+    try:
+        count = export(collection, output, args.format, args.since, fields, args.batch_size, DescriptionStore(db))
+    finally:
+        client.close()
+
+    if count:
+        print(f"Saved {count} jobs to {output}")
+    else:
+        print("No data found in the collection.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Shared fixtures: the benchmark's fake LinkedIn, a Chrome-free driver and a mongomock database"""
+from urllib.parse import urljoin
+
+import signal
+from threading import Event
+from types import SimpleNamespace
+
+import lxml.html
+import pytest
+import requests
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+import benchmark
+import main
+
+
+class FakeDriver:
+    """Just enough of a Chrome driver for the scraper's search and job page paths
+    
+    Pages are fetched with requests, logged in (li_at cookie) like the search
+    profile. The card scripts are answered from the parsed page; in-browser
+    extraction is reported as failed, so job pages take the page_source path.
+    """
+    
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.cookies.set("li_at", "fake")
+        self.page_source = ""
+        self.current_url = "about:blank"
+        self.quit_calls = 0
+    
+    def get(self, url):
+        response = self.session.get(url, timeout=10)
+        self.page_source = response.text
+        self.current_url = response.url
+    
+    def refresh(self):
+        self.get(self.current_url)
+    
+    def _document(self):
+        return lxml.html.fromstring(self.page_source or "<html></html>")
+    
+    def _cards(self):
+        return self._document().find_class(main.PageReadiness.JOB_CARD_CLASS)
+    
+    def execute_script(self, script, *args):
+        if script == "return 1":
+            return 1
+        if "document.readyState" in script:
+            return "complete"
+        if script == main.JobScraper.HARVEST_CARDS_SCRIPT:
+            harvested = []
+            for card in self._cards():
+                content = next(card.iterancestors("div"), None)
+                metadata = content.cssselect("ul.job-card-container__metadata-wrapper") if content is not None else []
+                harvested.append([urljoin(self.current_url, card.get("href")), metadata[0].text_content() if metadata else None])
+            return harvested
+        if main.PageReadiness.JOB_CARD_CLASS in script:
+            return len(self._cards())
+        raise WebDriverException("script not supported by FakeDriver")
+    
+    def execute_cdp_cmd(self, command, params):
+        return {}
+    
+    def find_element(self, by, selector):
+        found = self._document().cssselect(selector)
+        if not found:
+            raise NoSuchElementException(selector)
+        return SimpleNamespace(tag_name=found[0].tag, text=found[0].text_content())
+    
+    def quit(self):
+        self.quit_calls += 1
+
+
+@pytest.fixture
+def fake_linkedin():
+    """Start FakeLinkedIn servers with the given options; all are shut down after the test"""
+    servers = []
+    
+    def start(jobs_per_query=25, **options):
+        server = benchmark.FakeLinkedIn(jobs_per_query, **options).start()
+        servers.append(server)
+        return server
+    
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def mongomock_problem():
+    """Why the Mongo-backed tests can't run here, or None"""
+    if benchmark.mongomock is None:
+        return "mongomock is not installed"
+    if not benchmark.mongomock_works():
+        return f"mongomock {benchmark.mongomock.__version__} can't run pymongo {main.pymongo.version}'s bulk writes"
+    return None
+
+
+def pytest_report_header(config):
+    problem = mongomock_problem()
+    return f"mongomock: {problem}, the Mongo-backed tests will fail" if problem else None
+
+
+@pytest.fixture
+def mongo_client():
+    """A mongomock client; fails the test when mongomock can't stand in for the installed pymongo"""
+    problem = mongomock_problem()
+    if problem:
+        pytest.fail(f"{problem}; pip install -r requirements-dev.txt (it pins a compatible pymongo)", pytrace=False)
+    return benchmark.mongomock.MongoClient()
+
+
+@pytest.fixture
+def mongo_db(mongo_client):
+    return mongo_client.scraper_tests
+
+
+@pytest.fixture
+def scraper_config(monkeypatch, tmp_path):
+    """Isolate SCRAPER_CONFIG changes, the module globals and metrics a test (or main()) sets"""
+    monkeypatch.setattr(main, "SCRAPER_CONFIG", {**main.SCRAPER_CONFIG, "rate_limit": dict(main.SCRAPER_CONFIG["rate_limit"])})
+    monkeypatch.setattr(main, "DB_CONFIG", dict(main.DB_CONFIG))
+    main.SCRAPER_CONFIG.update({
+        "frontier_path": str(tmp_path / "frontier.sqlite3"),
+        "archive_enabled": False,
+        "metrics_summary_path": None,
+    })
+    for name in ("client", "db", "collection", "driver_pool", "search_drivers", "frontier", "page_archive", "company_enricher",
+                 "job_writer", "parse_stage", "rate_controller", "metrics_server", "known_jobs"):
+        monkeypatch.setattr(main, name, getattr(main, name))
+    monkeypatch.setattr(main, "stop_event", Event())
+    for name in ("counters", "gauges", "gauge_labels", "histograms", "_jobs_started"):
+        monkeypatch.setattr(main.Metrics, name, {})
+    handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM)}
+    monkeypatch.chdir(tmp_path)
+    yield main.SCRAPER_CONFIG
+    main.HttpFetcher.close()
+    for signum, handler in handlers.items():
+        signal.signal(signum, handler)
+
+
+
+@pytest.fixture
+def run_scraper(scraper_config, mongo_client, monkeypatch):
+    """Run main() against a FakeLinkedIn with FakeDrivers and mongomock; returns the jobs collection"""
+    monkeypatch.setattr(main.pymongo, "MongoClient", lambda *args, **kwargs: mongo_client)
+    monkeypatch.setattr(main.DriverManager, "create_driver", staticmethod(lambda *args, **kwargs: FakeDriver()))
+    
+    def run(fake, *args):
+        scraper_config.update({
+            "search_url": f"{fake.base}/jobs/search/",
+            "search_queries": [{"keywords": "bench-0"}],
+            "search_profile": False,
+            "num_drivers": 1,
+            "wait_for_jobs_timeout": 1,
+            "company_enrichment": False,
+        })
+        scraper_config["rate_limit"].update({"initial_rate": 1000, "max_rate": 1000, "initial_concurrency": 100, "max_concurrency": 100})
+        main.main(["--log-level", "WARNING", "--metrics-port", "0", *args])
+        return mongo_client[main.DB_CONFIG["db_name"]][main.DB_CONFIG["collection_name"]]
+    
+    return run
@@ -0,0 +1,93 @@
+"""AsyncPipeline: the asyncio engine end to end, cancellation and parse pool replacement"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import benchmark
+import main
+
+
+class IdleFrontier:
+    """Never has work and never drains, like a run waiting on other search nodes"""
+
+    def get(self, timeout=None):
+        return None
+
+    def drained(self):
+        return False
+
+
+class RecordingWriter:
+    batch_size = 100
+    flush_interval = 60
+
+    def __init__(self):
+        self.flushed = []
+
+    def flush(self, batch):
+        self.flushed.extend(batch)
+
+
+class BrokenPool:
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("a parse process died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def test_asyncio_engine_scrapes_every_job(scraper_config, fake_linkedin, run_scraper):
+    fake = fake_linkedin(30)
+    scraper_config.update({"fetch_mode": "http", "max_pages": 2, "parse_workers": 1, "async_fetches": 8})
+
+    jobs = run_scraper(fake, "--engine", "asyncio")
+
+    assert jobs.count_documents({}) == 30
+    assert main.Metrics.counters["pages_fetched"] == 30
+    assert not main.stop_event.is_set()
+
+
+def test_cancel_sets_stop_event_and_writes_parsed_jobs(scraper_config):
+    scraper_config.update({"fetch_mode": "http", "parse_workers": 0, "async_fetches": 2})
+    main.frontier = IdleFrontier()
+    main.job_writer = RecordingWriter()
+    main.driver_pool = None
+
+    async def scenario():
+        pipeline = main.AsyncPipeline([], [], search=False)
+        task = asyncio.ensure_future(pipeline.run())
+        await asyncio.sleep(0.1)
+        await pipeline.write_queue.put({"Job Id": "1"})
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await asyncio.wait_for(task, 5)
+        return pipeline
+
+    pipeline = asyncio.run(scenario())
+    assert main.stop_event.is_set()
+    assert main.job_writer.flushed == [{"Job Id": "1"}]
+    assert pipeline.io_executor._shutdown
+
+
+def test_broken_parse_pool_is_replaced(scraper_config, monkeypatch):
+    scraper_config.update({"parse_workers": 1, "parse_pool_retries": 1})
+    replacements = []
+
+    def create_parse_pool(workers):
+        replacements.append(ThreadPoolExecutor(max_workers=workers))
+        return replacements[-1]
+    monkeypatch.setattr(main, "create_parse_pool", create_parse_pool)
+    html = benchmark.JOB_PAGE.format(base="http://jobs.test", job_id=1, company=1, days=2, applicants=3, description="Build.")
+    job_data = {"Job Id": "1", "Job Url": "http://jobs.test/jobs/view/1/", "Job Type": "Remote",
+                "Scrape Time": "2025-01-01 00:00:00"}
+
+    async def scenario():
+        pipeline = main.AsyncPipeline([], [])
+        pipeline.parse_pool = BrokenPool()
+        return pipeline, await pipeline.parse_in_pool(html, job_data)
+
+    pipeline, (result, _) = asyncio.run(scenario())
+    assert result["Job Title"] == "Benchmark Engineer 1"
+    assert pipeline.parse_pool is replacements[0] and len(replacements) == 1
+    assert main.Metrics.counters["parse_pool_restarts"] == 1
+    replacements[0].shutdown()
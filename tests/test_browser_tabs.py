@@ -0,0 +1,108 @@
+"""BrowserTab: tabs of one shared browser driven over its single WebDriver session"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+import undetected_chromedriver as uc
+
+import main
+
+
+class FakeSession:
+    """A WebDriver session with windows, a current window and instant navigations"""
+    
+    def __init__(self):
+        self.windows = {"first": {"url": "about:blank", "marker": False}}
+        self.contexts = set()
+        self.current = "first"
+        self.switch_to = SimpleNamespace(window=self._switch)
+        self.created = 0
+    
+    @property
+    def window_handles(self):
+        return list(self.windows)
+    
+    def _switch(self, handle):
+        assert handle in self.windows
+        self.current = handle
+    
+    def execute_cdp_cmd(self, cmd, params):
+        self.created += 1
+        if cmd == "Target.createBrowserContext":
+            self.contexts.add(f"context-{self.created}")
+            return {"browserContextId": f"context-{self.created}"}
+        if cmd == "Target.createTarget":
+            self.windows[f"tab-{self.created}"] = {"url": params["url"], "marker": False}
+            return {"targetId": f"tab-{self.created}"}
+        if cmd == "Target.closeTarget":
+            del self.windows[params["targetId"]]
+        if cmd == "Target.disposeBrowserContext":
+            self.contexts.remove(params["browserContextId"])
+        return {}
+    
+    def execute_script(self, script, *args):
+        window = self.windows[self.current]
+        if script == "window.__tabNavigation = true":
+            window["marker"] = True
+        elif "__tabNavigation === undefined" in script:
+            return not window["marker"] and "complete"
+        return None
+    
+    def get(self, url):
+        window = self.windows[self.current]
+        time.sleep(0.001)  # Another tab switching the session now would load its page here
+        window.update(url=url, marker=False)
+    
+    @property
+    def page_source(self):
+        return f"<html>{self.windows[self.current]['url']}</html>"
+
+
+def test_tabs_share_one_session():
+    session = FakeSession()
+    tabs = [main.BrowserTab(session) for _ in range(3)]
+    seen = {index: [] for index in range(len(tabs))}
+    
+    def browse(index):
+        for page in range(20):
+            url = f"http://jobs.test/{index}/{page}"
+            tabs[index].get(url)
+            seen[index].append(url in tabs[index].page_source)
+    
+    threads = [threading.Thread(target=browse, args=(index,)) for index in range(len(tabs))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert all(all(pages) and len(pages) == 20 for pages in seen.values())
+    assert len(session.contexts) == 3
+    for tab in tabs:
+        tab.quit()
+    assert session.window_handles == ["first"] and session.current == "first"
+    assert not session.contexts
+
+
+@pytest.mark.skipif(not uc.find_chrome_executable(), reason="Chrome is not installed")
+def test_shared_browser_tabs_load_job_pages(scraper_config, fake_linkedin):
+    fake = fake_linkedin(10)
+    main.rate_controller = main.RateController()
+    pool = main.DriverPool(2, headless=True, tabs_per_browser=2)
+    try:
+        assert pool.start() == 2
+        assert pool.stats()["browsers"] == 1
+        pages = {}
+        
+        def fetch(job_id):
+            with pool.checkout() as driver:
+                pages[job_id] = main.JobScraper.load_job_page(driver, f"{fake.base}/jobs/view/{job_id}/", job_id)
+        
+        threads = [threading.Thread(target=fetch, args=(4000000000 + i,)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(html and str(job_id) in html for job_id, html in pages.items()) and len(pages) == 2
+    finally:
+        pool.close()
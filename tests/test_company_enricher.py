@@ -0,0 +1,74 @@
+"""CompanyEnricher: TTL cache, coalesced lookups and retrying failed companies"""
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def enricher(scraper_config, mongo_db):
+    scraper_config["rate_limit"].update({"initial_rate": 1000, "max_rate": 1000, "initial_concurrency": 100,
+                                         "max_concurrency": 100, "backoff_base": 0.01})
+    main.rate_controller = main.RateController()
+    enricher = main.CompanyEnricher(mongo_db, workers=4)
+    yield enricher
+    enricher.close()
+
+
+def test_companies_are_fetched_once_per_ttl(enricher, fake_linkedin):
+    fake = fake_linkedin()
+    company = enricher.get(f"{fake.base}/company/company-7?trk=public_jobs")
+    assert company["_id"] == "/company/company-7" and company["Company Name"] == "Company 7"
+    assert enricher.collection.count_documents({}) == 1
+
+    assert enricher.get(f"{fake.base}/company/Company-7/") is company
+    enricher._cache.clear()
+    assert enricher.get(f"{fake.base}/company/company-7")["Company Name"] == "Company 7"
+    assert fake.requests == 1
+    assert {outcome: count for outcome, count in enricher.hits.items() if count} == {"fetched": 1, "memory": 1, "store": 1}
+
+
+def test_expired_companies_are_fetched_again(enricher, fake_linkedin):
+    fake = fake_linkedin()
+    enricher.collection.insert_one({"_id": "/company/company-3", "Company Name": "Renamed",
+                                    "Scrape Time": datetime.now() - timedelta(hours=200)})
+
+    assert enricher.get(f"{fake.base}/company/company-3")["Company Name"] == "Company 3"
+    assert enricher.collection.find_one({"_id": "/company/company-3"})["Company Name"] == "Company 3"
+    assert fake.requests == 1
+
+
+def test_concurrent_lookups_share_one_fetch(enricher, fake_linkedin):
+    fake = fake_linkedin(latency_ms=300)
+    start = threading.Barrier(6)
+    results = []
+
+    def lookup():
+        start.wait()
+        results.append(enricher.get(f"{fake.base}/company/company-5"))
+    threads = [threading.Thread(target=lookup) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fake.requests == 1
+    assert len(results) == 6 and all(company is results[0] for company in results)
+    assert enricher.hits["fetched"] == 1 and enricher.hits["coalesced"] == 5
+
+
+def test_failed_companies_are_skipped_then_retried(enricher, fake_linkedin):
+    fake = fake_linkedin(throttle_requests={1})
+    link = f"{fake.base}/company/company-9"
+
+    assert enricher.get(link) is None
+    assert enricher.get(link) is None
+    enricher.submit(link)
+    assert fake.requests == 1 and "/company/company-9" not in enricher._cache
+    assert enricher.hits["failed"] == 1 and enricher.hits["skipped"] == 2
+
+    enricher._failures["/company/company-9"] -= enricher.retry_after
+    assert enricher.get(link)["Company Name"] == "Company 9"
+    assert fake.requests == 2 and "/company/company-9" not in enricher._failures
@@ -0,0 +1,66 @@
+"""DescriptionStore: descriptions stored once per content hash and put back for readers"""
+import zlib
+
+import pytest
+
+import main
+
+TEXT = "Build   data pipelines.\n\nShip them."
+
+
+@pytest.fixture
+def store(scraper_config, mongo_db):
+    return main.DescriptionStore(mongo_db)
+
+
+def test_attach_hash_normalizes_and_keeps_field_order():
+    job = main.DescriptionStore.attach_hash({"Job Id": "1", "Job Description": TEXT, "Job Title": "Engineer"})
+    assert list(job) == ["Job Id", "Job Description Hash", "Job Description", "Job Title"]
+    assert job["Job Description"] == "Build data pipelines. Ship them."
+    assert job["Job Description Hash"] == main.DescriptionStore.digest("Build data pipelines. Ship them.")
+    spaced = main.DescriptionStore.attach_hash({"Job Id": "2", "Job Description": "  Build data pipelines. Ship   them. "})
+    assert spaced["Job Description Hash"] == job["Job Description Hash"]
+    assert "Job Description Hash" not in main.DescriptionStore.attach_hash({"Job Id": "3", "Job Description": "Not Mentioned"})
+
+
+def test_detach_stores_each_text_once(store):
+    batch = [main.DescriptionStore.attach_hash({"Job Id": str(i), "Job Description": TEXT}) for i in range(3)]
+    batch.append({"Job Id": "3", "Job Description": "Not Mentioned"})
+    store.detach(batch)
+    store.detach([main.DescriptionStore.attach_hash({"Job Id": "4", "Job Description": TEXT})])
+
+    assert all("Job Description" not in job for job in batch[:3]) and batch[3]["Job Description"] == "Not Mentioned"
+    stored, = store.collection.find()
+    assert stored["_id"] == batch[0]["Job Description Hash"]
+    assert zlib.decompress(stored["text"]).decode("utf-8") == "Build data pipelines. Ship them."
+    assert stored["length"] == len("Build data pipelines. Ship them.")
+
+
+def test_rehydrate_reads_texts_from_the_collection(store, mongo_db):
+    job = main.DescriptionStore.attach_hash({"Job Id": "1", "Job Description": TEXT, "Job Title": "Engineer"})
+    store.detach([job])
+
+    reader = main.DescriptionStore(mongo_db, cache_size=1)
+    docs = reader.rehydrate([dict(job), {"Job Id": "2", "Job Description": "Inline"}, {"Job Id": "3"}])
+    assert docs[0] == {"Job Id": "1", "Job Description": "Build data pipelines. Ship them.", "Job Title": "Engineer"}
+    assert docs[1:] == [{"Job Id": "2", "Job Description": "Inline"}, {"Job Id": "3"}]
+    assert list(reader._cache) == [job["Job Description Hash"]]
+
+
+def test_cache_is_bounded(store):
+    store.cache_size = 2
+    for text in ("one", "two", "three"):
+        store.store({main.DescriptionStore.digest(text): text})
+    assert list(store._cache.values()) == ["two", "three"]
+    assert store.collection.count_documents({}) == 3
+
+
+def test_writer_stores_hashes_instead_of_texts(store, mongo_db):
+    main.known_jobs = main.KnownJobIndex()
+    writer = main.JobWriter(mongo_db.jobs, descriptions=store)
+    writer.flush([main.DescriptionStore.attach_hash({"Job Id": str(i), "Job Description": TEXT}) for i in range(4)])
+
+    jobs = list(mongo_db.jobs.find({}, {"_id": 0}))
+    assert len(jobs) == 4 and all(set(job) == {"Job Id", "Job Description Hash"} for job in jobs)
+    assert store.collection.count_documents({}) == 1
+    assert {job["Job Description"] for job in store.rehydrate(jobs)} == {"Build data pipelines. Ship them."}
@@ -0,0 +1,83 @@
+"""DriverPool: recycling, replacement and running out of drivers"""
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import main
+from conftest import FakeDriver
+
+
+class PoolDriver(FakeDriver):
+    def __init__(self, number):
+        super().__init__()
+        self.number = number
+        self.alive = True
+    
+    def execute_script(self, script, *args):
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        return super().execute_script(script, *args)
+
+
+class DriverList(list):
+    """Drivers create_driver started, in order; set failing to make new starts fail"""
+    failing = False
+
+
+@pytest.fixture
+def started(scraper_config, monkeypatch):
+    drivers = DriverList()
+    
+    def create_driver(*args, **kwargs):
+        if drivers.failing:
+            return None
+        drivers.append(PoolDriver(len(drivers)))
+        return drivers[-1]
+    
+    monkeypatch.setattr(main.DriverManager, "create_driver", staticmethod(create_driver))
+    scraper_config.update({"driver_max_pages": 3, "driver_replace_attempts": 2, "driver_replace_backoff": 0.01,
+                           "driver_probe_interval": 60})
+    return drivers
+
+
+@pytest.fixture
+def pool(started):
+    pool = main.DriverPool(2, headless=True, tabs_per_browser=0)
+    assert pool.start() == 2
+    yield pool
+    pool.close()
+
+
+def test_drivers_are_recycled_after_max_pages(pool, started):
+    for _ in range(6):
+        with pool.checkout():
+            pass
+    assert pool.stats()["recycled"] == 2
+    assert len(started) == 4 and all(driver.quit_calls == 1 for driver in started[:2])
+    assert pool.stats()["idle"] == 2
+
+
+def test_crashed_and_rate_limited_drivers_are_replaced(pool, started):
+    with pytest.raises(RuntimeError):
+        with pool.checkout() as driver:
+            driver.alive = False
+            raise RuntimeError("page crashed")
+    with pytest.raises(RuntimeError):
+        with pool.checkout() as driver:
+            raise RuntimeError("429 Too Many Requests")
+    with pytest.raises(ValueError):
+        with pool.checkout() as driver:
+            raise ValueError("parse error, driver still fine")
+    assert pool.stats()["replaced"] == 2
+    assert len(started) == 4
+
+
+def test_checkout_fails_once_no_driver_can_be_started(pool, started):
+    started.failing = True
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            with pool.checkout() as driver:
+                driver.alive = False
+                raise RuntimeError("chrome crashed")
+    with pytest.raises(main.DriverPoolEmpty):
+        with pool.checkout(timeout=5):
+            pass
@@ -0,0 +1,57 @@
+"""FieldExtractor: JOB_FIELD_SPEC on every parser backend"""
+from datetime import datetime
+
+import pytest
+
+import benchmark
+import main
+
+BACKENDS = [
+    pytest.param(backend, marks=pytest.mark.skipif(backend == "selectolax" and main.LexborHTMLParser is None,
+                                                   reason="selectolax is not installed"))
+    for backend in main.FieldExtractor.BACKENDS
+]
+
+PAGE = benchmark.JOB_PAGE.format(base="https://www.linkedin.com", job_id=4000000007, company=7, days=3, applicants=42,
+                                 description="Build & run data pipelines.")
+
+EXPECTED = {
+    "Job Title": "Benchmark Engineer 4000000007",
+    "Job Description": "Build & run data pipelines.",
+    "Seniority level": "Mid-Senior level",
+    "Employment type": "Full-time",
+    "Company Name": "Company 7",
+    "Company Link": "https://www.linkedin.com/company/company-7",
+    "Company Location": "Ahmedabad, Gujarat, India",
+    "Post Time": "3 days ago",
+    "Applicants Apply": "42 applicants",
+    "Salary Description": None,
+    "Salary Range": None,
+}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_extracts_every_field(backend):
+    fields = main.FieldExtractor(backend).extract(PAGE)
+    assert fields == EXPECTED
+    assert list(fields) == list(EXPECTED)  # Stored column order
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_pages_without_top_card_or_title_are_rejected(backend):
+    extractor = main.FieldExtractor(backend)
+    assert extractor.extract("") is None
+    assert extractor.extract("<html><body><h1>Sign in</h1></body></html>") is None
+    assert extractor.extract(PAGE.replace("Benchmark Engineer 4000000007</h1>", "</h1>")) is None
+
+
+def test_unknown_backend_is_refused():
+    with pytest.raises(ValueError):
+        main.FieldExtractor("regex")
+
+
+def test_parse_job_page_converts_the_post_time():
+    fields = main.JobScraper.parse_job_page(PAGE, datetime(2025, 1, 10, 12, 0, 0))
+    assert fields["Post Converted Time"] == "2025-01-07 12:00:00"
+    assert fields["Salary Range"] == "Not Mentioned"
+    assert list(fields).index("Post Converted Time") == list(fields).index("Post Time") + 1
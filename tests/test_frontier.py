@@ -0,0 +1,78 @@
+"""Frontier: the SQLite crawl frontier of a single-process run"""
+import pytest
+
+import main
+
+
+def job_url(number):
+    return f"https://www.linkedin.com/jobs/view/{4000000000 + number}/"
+
+
+@pytest.fixture
+def frontier_config(scraper_config):
+    scraper_config.update({"frontier_prefetch": 2, "frontier_commit_interval": 0, "max_job_attempts": 2})
+    return scraper_config
+
+
+@pytest.fixture
+def frontier(frontier_config):
+    frontier = main.Frontier()
+    yield frontier
+    frontier.close()
+
+
+def test_jobs_are_leased_once_and_drained(frontier):
+    frontier.put(job_url(1), "Remote")
+    frontier.put(job_url(1), "Remote")  # Already in the frontier
+    frontier.put(job_url(2), "Hybrid", refresh=True)
+    frontier.close_input()
+    
+    jobs = [frontier.get(timeout=0), frontier.get(timeout=0)]
+    assert sorted(jobs) == [("4000000001", job_url(1), "Remote", False), ("4000000002", job_url(2), "Hybrid", True)]
+    assert frontier.get(timeout=0) is None and not frontier.drained()
+    for job in jobs:
+        frontier.done(job[0])
+    assert frontier.drained()
+    assert frontier.counts() == {main.Frontier.DONE: 2}
+
+
+def test_failed_jobs_are_retried_until_max_attempts(frontier):
+    frontier.put(job_url(1), "Remote")
+    frontier.close_input()
+    frontier.fail(frontier.get(timeout=0)[0])
+    frontier.release(frontier.get(timeout=0)[0])  # A 429 doesn't count as an attempt
+    frontier.fail(frontier.get(timeout=0)[0])
+    assert frontier.get(timeout=0) is None
+    assert frontier.drained()
+    assert frontier.counts() == {main.Frontier.FAILED: 1}
+
+
+def test_expired_leases_are_leased_again(frontier_config):
+    frontier_config["frontier_lease_seconds"] = -1  # Every lease is already expired
+    frontier = main.Frontier()
+    try:
+        frontier.put(job_url(1), "Remote")
+        first = frontier.get(timeout=0)
+        assert frontier.get(timeout=0) == first
+    finally:
+        frontier.close()
+
+
+def test_resume_keeps_pending_jobs_and_finished_pages(frontier_config):
+    frontier = main.Frontier()
+    for number in range(3):
+        frontier.put(job_url(number), "Remote")
+    frontier.page_done("bench-0", 0, 3)
+    leased = frontier.get(timeout=0)
+    frontier.done(frontier.get(timeout=0)[0])
+    frontier.close()  # Stopped with a job still leased
+    
+    resumed = main.Frontier(resume=True)
+    assert resumed.counts() == {main.Frontier.PENDING: 2, main.Frontier.DONE: 1}
+    assert resumed.finished_pages() == {("bench-0", 0): 3}
+    assert leased in [resumed.get(timeout=0), resumed.get(timeout=0)]
+    resumed.close()
+    
+    fresh = main.Frontier()
+    assert fresh.counts() == {} and fresh.finished_pages() == {}
+    fresh.close()
@@ -0,0 +1,19 @@
+"""fetch_mode http: job pages over the pooled session, with the browser as fallback"""
+import main
+
+FIRST_JOB = 4000000000
+
+
+def test_marker_miss_falls_back_to_browser(scraper_config, fake_linkedin, run_scraper):
+    walled = {str(FIRST_JOB + rank) for rank in (3, 7, 11)}
+    fake = fake_linkedin(30, walled_jobs=walled)
+    scraper_config.update({"fetch_mode": "http", "http_workers": 4, "max_pages": 2})
+    
+    jobs = run_scraper(fake)
+    
+    assert main.Metrics.counters["http_fallbacks"] == len(walled)
+    assert jobs.count_documents({}) == 30
+    fallen_back = list(jobs.find({"Job Id": {"$in": sorted(walled)}}))
+    assert len(fallen_back) == len(walled)
+    for job in fallen_back:
+        assert job["Job Title"] == f"Benchmark Engineer {job['Job Id']}"
@@ -0,0 +1,78 @@
+"""JobWriter: bulk upserts and what happens to jobs whose write failed"""
+import pytest
+from pymongo.errors import BulkWriteError
+
+import main
+
+
+class RecordingFrontier:
+    def __init__(self):
+        self.done_ids = []
+        self.failed_ids = []
+    
+    def done(self, job_id):
+        self.done_ids.append(job_id)
+    
+    def fail(self, job_id):
+        self.failed_ids.append(job_id)
+
+
+class RecordingCompanies:
+    def __init__(self):
+        self.links = []
+    
+    def submit(self, link):
+        self.links.append(link)
+
+
+class FailingCollection:
+    """bulk_write fails op 1 with a validation error and op 2 with a duplicate key"""
+    
+    def bulk_write(self, operations, ordered=False):
+        raise BulkWriteError({"nUpserted": 1, "writeErrors": [
+            {"index": 1, "code": 121, "errmsg": "Document failed validation"},
+            {"index": 2, "code": 11000, "errmsg": "E11000 duplicate key error"},
+        ]})
+
+
+def job(number):
+    return {"Job Id": str(4000000000 + number), "Job Title": f"Job {number}", "Company Link": f"/company/c-{number}"}
+
+
+@pytest.fixture
+def recorded(scraper_config):
+    main.frontier = RecordingFrontier()
+    main.known_jobs = main.KnownJobIndex()
+    return main.frontier
+
+
+def test_failed_writes_are_retried_not_stored(recorded):
+    companies = RecordingCompanies()
+    writer = main.JobWriter(FailingCollection(), companies=companies)
+    writer.flush([job(0), job(1), job(2)])
+    
+    assert recorded.failed_ids == ["4000000001"]
+    assert recorded.done_ids == ["4000000000", "4000000002"]
+    assert "4000000001" not in main.known_jobs and "4000000002" in main.known_jobs
+    assert companies.links == ["/company/c-0", "/company/c-2"]
+    assert (writer.inserted, writer.existing, writer.failed) == (1, 1, 1)
+
+
+def test_failed_batch_is_retried(recorded):
+    class DownCollection:
+        def bulk_write(self, operations, ordered=False):
+            raise main.pymongo.errors.AutoReconnect("connection refused")
+    
+    writer = main.JobWriter(DownCollection())
+    writer.flush([job(0), job(1)])
+    assert recorded.failed_ids == ["4000000000", "4000000001"] and not recorded.done_ids
+    assert "4000000000" not in main.known_jobs
+
+
+def test_written_jobs_are_acknowledged(recorded, mongo_db):
+    writer = main.JobWriter(mongo_db.jobs)
+    writer.flush([job(0), job(1)])
+    writer.flush([job(1)])
+    assert recorded.done_ids == ["4000000000", "4000000001", "4000000001"]
+    assert (writer.inserted, writer.existing, writer.failed) == (2, 1, 0)
+    assert mongo_db.jobs.count_documents({}) == 2
@@ -0,0 +1,27 @@
+"""KnownJobIndex: sorted-array membership for stored job ids"""
+import main
+
+
+def test_lookups_accept_string_and_int_ids():
+    index = main.KnownJobIndex([4000000003, 4000000001, 4000000002])
+    assert "4000000001" in index and 4000000002 in index
+    assert "4000000004" not in index and "not-a-number" not in index and None not in index
+    assert len(index) == 3
+
+
+def test_added_ids_merge_into_the_array():
+    index = main.KnownJobIndex([10, 30], merge_threshold=3)
+    index.add(["20", "30", "bad", -5, 2 ** 64])
+    assert len(index._recent) == 1 and 20 in index
+    index.add([40, 5])
+    assert not index._recent
+    assert list(index._ids) == [5, 10, 20, 30, 40]
+    assert all(job_id in index for job_id in (5, 10, 20, 30, 40)) and 25 not in index
+
+
+def test_load_merges_sorted_chunks(mongo_db):
+    ids = ["7", "3", "9", "3", "1", "8", "x", "-2", "5", "7"]
+    mongo_db.jobs.insert_many([{"Job Id": job_id} for job_id in ids] + [{"Title": "no id"}])
+    index = main.KnownJobIndex.load(mongo_db.jobs, chunk_size=3)
+    assert list(index._ids) == [1, 3, 5, 7, 8, 9]
+    assert len(index) == 6
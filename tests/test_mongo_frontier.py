@@ -0,0 +1,112 @@
+"""MongoFrontier: leases shared by several consuming nodes"""
+import pytest
+
+import main
+
+
+@pytest.fixture
+def frontier_config(scraper_config):
+    scraper_config.update({
+        "frontier_lease_seconds": 60,
+        "frontier_heartbeat_seconds": 3600,  # Heartbeats after the first are sent by the tests
+        "frontier_poll_interval": 0.05,
+        "frontier_commit_interval": 0,
+        "frontier_prefetch": 1,
+    })
+    return scraper_config
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+    
+    def __call__(self):
+        return self.now
+    
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def nodes(frontier_config, mongo_db, clock):
+    """Start MongoFrontier nodes on one database and one fake clock; all are closed after the test"""
+    started = []
+    
+    def start(node_id, role="worker", resume=False):
+        node = main.MongoFrontier(mongo_db, role, resume=resume, clock=clock, node_id=node_id)
+        started.append(node)
+        return node
+    
+    yield start
+    for node in started:
+        node.close()
+
+
+def job_url(number):
+    return f"https://www.linkedin.com/jobs/view/{4000000000 + number}/"
+
+
+def test_consumers_never_share_a_lease(nodes):
+    search = nodes("search", role="search")
+    for number in range(20):
+        search.put(job_url(number), "Remote")
+    search.close_input()
+    consumers = [nodes("worker-a"), nodes("worker-b")]
+    
+    claimed = {consumer.node_id: [] for consumer in consumers}
+    while not all(consumer.drained() for consumer in consumers):
+        for consumer in consumers:
+            job = consumer.get(timeout=0)
+            if job is not None:
+                claimed[consumer.node_id].append(job[0])
+                consumer.done(job[0])
+    
+    assert claimed["worker-a"] and claimed["worker-b"]
+    assert not set(claimed["worker-a"]) & set(claimed["worker-b"])
+    assert sorted(claimed["worker-a"] + claimed["worker-b"]) == sorted(str(4000000000 + number) for number in range(20))
+
+
+def test_expired_lease_is_redelivered(nodes, clock):
+    search = nodes("search", role="search")
+    search.put(job_url(1), "Remote")
+    search.close_input()
+    crashed, survivor = nodes("worker-a"), nodes("worker-b")
+    
+    job = crashed.get(timeout=0)
+    assert job[0] == "4000000001"
+    clock.advance(40)
+    crashed._beat()  # The heartbeat keeps the lease alive past lease_seconds
+    clock.advance(40)
+    assert survivor.get(timeout=0) is None
+    assert not survivor.drained()
+    
+    clock.advance(60)  # The node died: no more heartbeats, no acknowledgement
+    assert not survivor.drained()  # The expired lease is still work to reclaim
+    assert survivor.get(timeout=0) == job
+    survivor.done(job[0])
+    assert survivor.drained()
+    assert survivor.counts() == {main.MongoFrontier.DONE: 1}
+
+
+def test_worker_waits_for_the_current_runs_input(nodes):
+    previous = nodes("search-1", role="search")
+    previous.close_input()
+    previous.close()
+    
+    worker = nodes("worker-a")
+    assert not worker.drained()  # The closed input is from the previous run
+    
+    search = nodes("search-2", role="search")
+    search.put(job_url(1), "Remote")
+    search.close_input()
+    job = worker.get(timeout=1)
+    assert not worker.drained()
+    worker.done(job[0])
+    assert worker.drained()
+    worker.close()
+    worker.close()  # Closing twice is harmless
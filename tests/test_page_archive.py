@@ -0,0 +1,96 @@
+"""PageArchive: content-addressed segments with an SQLite index, and replay.py over it"""
+import os
+
+import benchmark
+import main
+import replay
+
+
+def job(job_id, scrape_time="2025-01-01 00:00:00"):
+    return {"Job Id": str(job_id), "Job Url": f"http://jobs.test/jobs/view/{job_id}/", "Job Type": "Remote",
+            "Scrape Time": scrape_time}
+
+
+def page(job_id, text="Build data pipelines."):
+    return benchmark.JOB_PAGE.format(base="http://jobs.test", job_id=job_id, company=1, days=2, applicants=3,
+                                     description=text)
+
+
+def test_identical_pages_are_stored_once(scraper_config, tmp_path):
+    archive = main.PageArchive(str(tmp_path / "archive"))
+    archive.store(job(1), page(1))
+    archive.store(job(1, "2025-01-02 00:00:00"), page(1))
+    archive.store(job(2), page(2))
+
+    stats = archive.stats()
+    assert (stats["fetches"], stats["jobs"], stats["unique_pages"]) == (3, 2, 2)
+    assert stats["raw_bytes"] == len(page(1).encode()) + len(page(2).encode())
+    assert 0 < stats["compressed_bytes"] < stats["raw_bytes"]
+    archive.close()
+
+
+def test_pages_roll_over_into_new_segments(scraper_config, tmp_path):
+    archive = main.PageArchive(str(tmp_path / "archive"))
+    archive.segment_limit = 600
+    pages = {job_id: page(job_id, os.urandom(200).hex()) for job_id in range(1, 6)}
+    for job_id, html in pages.items():
+        archive.store(job(job_id), html)
+
+    segments = sorted(name for name in os.listdir(archive.directory) if name.startswith("segment-"))
+    assert len(segments) == archive.segment == 5
+    assert {data["Job Id"]: html for data, html in archive.iter_latest()} == {str(k): v for k, v in pages.items()}
+    archive.close()
+
+
+def test_iter_latest_yields_the_newest_fetch_since(scraper_config, tmp_path):
+    archive = main.PageArchive(str(tmp_path / "archive"))
+    archive.store(job(1, "2025-01-01 00:00:00"), page(1, "first"))
+    archive.store(job(1, "2025-01-03 00:00:00"), page(1, "third"))
+    archive.store(job(1, "2025-01-02 00:00:00"), page(1, "second"))
+    archive.store(job(2, "2025-01-01 12:00:00"), page(2, "old"))
+
+    latest = {data["Job Id"]: (data["Scrape Time"], html) for data, html in archive.iter_latest()}
+    assert latest == {"1": ("2025-01-03 00:00:00", page(1, "third")), "2": ("2025-01-01 12:00:00", page(2, "old"))}
+    assert [data["Job Id"] for data, _ in archive.iter_latest(since="2025-01-02 00:00:00")] == ["1"]
+    archive.close()
+
+
+def test_reopened_archive_keeps_its_index_and_segment(scraper_config, tmp_path):
+    archive = main.PageArchive(str(tmp_path / "archive"))
+    archive.segment_limit = 1
+    archive.store(job(1), page(1, "one"))
+    archive.store(job(2), page(2, "two"))
+    archive.close()
+
+    reopened = main.PageArchive(str(tmp_path / "archive"))
+    assert reopened.segment == 2
+    reopened.store(job(3), page(3, "three"))
+    assert reopened.stats()["unique_pages"] == 3
+    assert {data["Job Id"] for data, _ in reopened.iter_latest()} == {"1", "2", "3"}
+    reopened.close()
+
+
+def test_zlib_is_used_without_zstandard(scraper_config, tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "zstandard", None)
+    archive = main.PageArchive(str(tmp_path / "archive"))
+    archive.store(job(1), page(1))
+
+    assert archive.codec == "zlib"
+    sha, = [row[0] for row in archive._db.execute("SELECT sha FROM blobs")]
+    assert archive.read(sha) == page(1)
+    archive.close()
+
+
+def test_replay_upserts_the_newest_pages(scraper_config, mongo_client, monkeypatch, tmp_path):
+    monkeypatch.setattr(main.pymongo, "MongoClient", lambda *args, **kwargs: mongo_client)
+    collection = mongo_client[main.DB_CONFIG["db_name"]][main.DB_CONFIG["collection_name"]]
+    collection.insert_one({"Job Id": "1", "Job Title": "Stale title"})
+    archive = main.PageArchive(str(tmp_path / "archive"))
+    archive.store(job(1, "2025-01-01 00:00:00"), page(1, "old"))
+    archive.store(job(1, "2025-01-02 00:00:00"), page("1b", "new"))
+    archive.store(job(2), page(2))
+    archive.close()
+
+    assert replay.replay(str(tmp_path / "archive"), parse_workers=0) == 2
+    titles = {doc["Job Id"]: doc["Job Title"] for doc in collection.find()}
+    assert titles == {"1": "Benchmark Engineer 1b", "2": "Benchmark Engineer 2"}
@@ -0,0 +1,64 @@
+"""ParseStage: parsing in spawned processes"""
+import os
+import signal
+import time
+
+import pytest
+
+import benchmark
+import main
+
+
+class RecordingFrontier:
+    def __init__(self):
+        self.failed_ids = []
+    
+    def fail(self, job_id):
+        self.failed_ids.append(job_id)
+
+
+@pytest.fixture
+def written(scraper_config, monkeypatch):
+    """Jobs the parse stage hands to the writer"""
+    jobs = []
+    monkeypatch.setattr(main.DatabaseManager, "insert_job", staticmethod(jobs.append))
+    main.frontier = RecordingFrontier()
+    return jobs
+
+
+def page(number):
+    html = benchmark.JOB_PAGE.format(base="http://jobs.test", job_id=number, company=1, days=2, applicants=3,
+                                     description="Build data pipelines. " * 20)
+    return html, {"Job Id": str(number), "Job Url": f"http://jobs.test/jobs/view/{number}/", "Job Type": "Remote",
+                  "Scrape Time": "2025-01-01 00:00:00"}
+
+
+def test_parse_processes_use_runtime_settings(written):
+    main.DB_CONFIG["dedup_descriptions"] = True  # Not what a re-imported main has
+    stage = main.ParseStage(workers=1).start()
+    stage.submit(*page(1))
+    stage.close()
+    inline = main.ParseStage(workers=0)
+    inline.submit(*page(2))
+    inline.close()
+    
+    assert [job["Job Id"] for job in written] == ["1", "2"]
+    assert main.DescriptionStore.HASH_FIELD in written[0]
+    assert list(written[0]) == list(written[1])
+
+
+def test_broken_pool_is_replaced(written):
+    stage = main.ParseStage(workers=2).start()
+    stage.submit(*page(0))
+    deadline = time.monotonic() + 30
+    while not written and time.monotonic() < deadline:
+        time.sleep(0.05)
+    for process in list(stage.executor._processes.values()):
+        os.kill(process.pid, signal.SIGKILL)
+    for number in range(1, 21):
+        stage.submit(*page(number))
+    stage.close()
+    
+    assert sorted(int(job["Job Id"]) for job in written) == list(range(21))
+    assert not main.frontier.failed_ids
+    assert main.Metrics.counters["parse_pool_restarts"] >= 1
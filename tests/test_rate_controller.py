@@ -0,0 +1,55 @@
+"""RateController: AIMD pacing against scheduled 429s"""
+import pytest
+
+import main
+from conftest import FakeDriver
+
+
+def test_backs_off_on_429s_and_recovers(scraper_config, fake_linkedin, monkeypatch):
+    fake = fake_linkedin(10, throttle_requests={3, 4})
+    scraper_config["rate_limit"].update({"initial_rate": 20.0, "max_rate": 50.0, "additive_increase": 1.0, "initial_concurrency": 4,
+                                         "backoff_base": 0.05, "log_interval": 0})
+    monkeypatch.setattr(main.random, "uniform", lambda low, high: high)  # Take the full jittered backoff
+    main.rate_controller = main.RateController()
+    
+    def fetch(number):
+        url = f"{fake.base}/jobs/view/{4000000000 + number}/"
+        try:
+            main.HttpFetcher.fetch(url)
+        except RuntimeError as e:
+            assert "429" in str(e)
+        return main.rate_controller.snapshot()[f"127.0.0.1:{fake.server_port}"]
+    
+    warm = [fetch(number) for number in range(2)]
+    assert warm[-1]["rate"] == pytest.approx(22.0)
+    
+    first, second = fetch(2), fetch(3)
+    assert first["rate"] == pytest.approx(11.0) and first["concurrency"] == 2 and first["backoff"] > 0
+    assert second["rate"] == pytest.approx(5.5) and second["concurrency"] == 1 and second["backoff"] > first["backoff"]
+    
+    recovered = [fetch(number) for number in range(4, 10)]
+    assert recovered[-1]["rate"] == pytest.approx(5.5 + 6 * 1.0)
+    assert recovered[-1]["concurrency"] > 1
+    assert (recovered[-1]["ok"], recovered[-1]["throttled"]) == (8, 2)
+    assert fake.requests == 10
+
+
+def test_search_pages_report_their_outcome(scraper_config, fake_linkedin):
+    fake = fake_linkedin(10)
+    scraper_config.update({"search_url": f"{fake.base}/jobs/search/",
+                           "readiness": {**scraper_config["readiness"], "cards_timeout": 0.2, "scroll_timeout": 0.1,
+                                         "cards_stable_time": 0.01}})
+    scraper_config["rate_limit"].update({"initial_rate": 100.0, "log_interval": 0})
+    main.rate_controller = main.RateController()
+    driver = FakeDriver()
+    query = {"keywords": "bench-0"}
+    
+    cards, _ = main.JobScraper.scrape_search_page(driver, main.JobScraper.build_search_url(query), lambda job_id: False)
+    assert len(cards) == 10
+    host = main.rate_controller.snapshot()[f"127.0.0.1:{fake.server_port}"]
+    assert (host["ok"], host["throttled"]) == (1, 0)
+    
+    cards, _ = main.JobScraper.scrape_search_page(driver, main.JobScraper.build_search_url(query, 25), lambda job_id: False)
+    assert cards == []
+    host = main.rate_controller.snapshot()[f"127.0.0.1:{fake.server_port}"]
+    assert (host["ok"], host["throttled"]) == (1, 1) and host["rate"] < 100.0
@@ -0,0 +1,80 @@
+"""save_data.py: streaming exports of the jobs collection"""
+import csv
+import json
+from datetime import datetime
+
+import pytest
+
+import main
+import save_data
+
+
+@pytest.fixture
+def jobs(mongo_db, scraper_config):
+    """Jobs with mixed fields and time types; one description is only stored by hash"""
+    descriptions = main.DescriptionStore(mongo_db)
+    hashed = main.DescriptionStore.attach_hash({"Job Id": "3", "Job Description": "Run   the  pipelines.",
+                                                "Scrape Time": datetime(2025, 1, 3)})
+    descriptions.detach([hashed])
+    mongo_db.jobs.insert_many([
+        {"Job Id": "1", "Job Title": "Old", "Scrape Time": "2025-01-01 00:00:00", "Seniority level": "Entry level"},
+        {"Job Id": "2", "Job Title": "Mid", "Scrape Time": datetime(2025, 1, 2), "Applicants": 7},
+        hashed,
+    ])
+    return mongo_db.jobs
+
+
+def test_columns_are_the_union_in_scraper_order(jobs):
+    columns = save_data.collect_columns(jobs, {})
+    assert columns[:2] == ["_id", "Job Id"]
+    assert columns.index("Scrape Time") < columns.index("Job Title") < columns.index("Job Description") < columns.index("Applicants")
+    assert columns[-1] == "Seniority level"
+    assert main.DescriptionStore.HASH_FIELD not in columns
+
+
+def test_csv_export_rehydrates_descriptions(jobs, mongo_db, tmp_path):
+    output = tmp_path / "jobs.csv"
+    count = save_data.export(jobs, str(output), "csv", batch_size=2, descriptions=main.DescriptionStore(mongo_db))
+
+    with open(output, newline="", encoding="utf-8") as file:
+        rows = {row["Job Id"]: row for row in csv.DictReader(file)}
+    assert count == 3 and set(rows) == {"1", "2", "3"}
+    assert rows["3"]["Job Description"] == "Run the pipelines."
+    assert rows["2"]["Scrape Time"] == "2025-01-02 00:00:00" and rows["2"]["Applicants"] == "7"
+    assert rows["1"]["Applicants"] == "" and rows["1"]["Seniority level"] == "Entry level"
+
+
+def test_jsonl_export_since_matches_both_time_types(jobs, tmp_path):
+    output = tmp_path / "jobs.jsonl"
+    count = save_data.export(jobs, str(output), "jsonl", since="2025-01-01 12:00:00", batch_size=1)
+
+    with open(output, encoding="utf-8") as file:
+        docs = [json.loads(line) for line in file]
+    assert count == 2 and [doc["Job Id"] for doc in docs] == ["2", "3"]
+    assert docs[0]["Scrape Time"] == "2025-01-02 00:00:00"
+    assert main.DescriptionStore.HASH_FIELD in docs[1]
+
+    assert save_data.export(jobs, str(output), "jsonl", since="2025-02-01 00:00:00") == 0
+
+
+def test_declared_fields_skip_discovery(jobs, mongo_db, tmp_path, monkeypatch):
+    def no_discovery(*args):
+        raise AssertionError("column discovery should be skipped")
+    monkeypatch.setattr(save_data, "collect_columns", no_discovery)
+    output = tmp_path / "jobs.csv"
+    save_data.export(jobs, str(output), "csv", fields=["Job Id", "Job Description"],
+                     descriptions=main.DescriptionStore(mongo_db))
+
+    with open(output, newline="", encoding="utf-8") as file:
+        rows = list(csv.reader(file))
+    assert rows == [["Job Id", "Job Description"], ["1", ""], ["2", ""], ["3", "Run the pipelines."]]
+
+
+def test_parquet_export(jobs, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    output = tmp_path / "jobs.parquet"
+    assert save_data.export(jobs, str(output), "parquet") == 3
+
+    table = pq.read_table(output)
+    assert table.column_names == save_data.collect_columns(jobs, {})
+    assert table.column("Job Id").to_pylist() == ["1", "2", "3"]
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pytest
+
+from main import JobSchema
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$120,000.00/yr - $150,000.00/yr", (120000, 150000, "USD", "year")),
+    ("120,000.00-150,000.00 USD per year", (120000, 150000, "USD", "year")),
+    ("90,000 - 110,000 EUR annually", (90000, 110000, "EUR", "year")),
+    ("USD 90K-110K", (90000, 110000, "USD", None)),
+    ("£40k to £50k a year", (40000, 50000, "GBP", "year")),
+    ("CA$80,000 - CA$95,000/yr", (80000, 95000, "CAD", "year")),
+    ("$25.50/hr", (25.5, 25.5, "USD", "hour")),
+])
+def test_parse_salary(text, expected):
+    salary = JobSchema.parse_salary(text)
+    assert tuple(salary[field] for field in JobSchema.SALARY_FIELDS) == expected
+
+
+@pytest.mark.parametrize("text", [None, "", "Not Mentioned", "Competitive pay", "401k match"])
+def test_parse_salary_without_amount(text):
+    assert JobSchema.parse_salary(text) == dict.fromkeys(JobSchema.SALARY_FIELDS)
+
+
+def test_parse_salary_requires_range_in_free_text():
+    text = "Great benefits, 401k match and $5,000 signing bonus. Pay: 100000"
+    assert JobSchema.parse_salary(text, require_range=True)["Salary Min"] is None
+    assert JobSchema.parse_salary("Pay is $90,000 - $110,000 a year.", require_range=True)["Salary Max"] == 110000
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Over 200 applicants", 200),
+    ("1,234 applicants", 1234),
+    ("Be among the first 25 applicants", None),
+    ("Not Mentioned", None),
+    (None, None),
+    (57, 57),
+])
+def test_parse_applicants(text, expected):
+    assert JobSchema.parse_applicants(text) == expected
+
+
+def test_normalize_is_idempotent_and_typed():
+    job = {
+        "Job Id": "1",
+        "Scrape Time": "2025-01-02 03:04:05",
+        "Applicants Apply": "Over 200 applicants",
+        "Salary Range": "Not Mentioned",
+        "Salary Description": "Signing bonus of $5,000",
+    }
+    normalized = JobSchema.normalize(job)
+    assert normalized["Scrape Time"] == datetime(2025, 1, 2, 3, 4, 5)
+    assert normalized["Applicants"] == 200
+    assert normalized["Salary Range"] is None
+    assert normalized["Salary Min"] is None
+    assert JobSchema.normalize(normalized) == normalized
@@ -0,0 +1,60 @@
+"""SearchCoordinator: incremental pagination and high-water marks"""
+import pytest
+
+import main
+from conftest import FakeDriver
+
+QUERIES = [{"keywords": "bench-0"}, {"keywords": "bench-1"}]
+
+
+@pytest.fixture
+def search(scraper_config, fake_linkedin, mongo_db):
+    """Run a SearchCoordinator over QUERIES with one FakeDriver; returns the saved high-water marks"""
+    fake = fake_linkedin(50)
+    scraper_config.update({"search_url": f"{fake.base}/jobs/search/", "incremental": True, "max_pages": 2,
+                           "readiness": {**scraper_config["readiness"], "cards_stable_time": 0.01, "poll_interval": 0.01}})
+    scraper_config["rate_limit"].update({"initial_rate": 1000, "max_rate": 1000})
+    main.db = mongo_db
+    main.known_jobs = main.KnownJobIndex()
+    main.rate_controller = main.RateController()
+    main.frontier = main.Frontier()
+    
+    def run():
+        main.SearchCoordinator(QUERIES).run([FakeDriver()])
+        main.frontier.close()
+        return main.DatabaseManager.load_high_water_marks()
+    
+    return run
+
+
+def key(number):
+    return main.SearchCoordinator.query_key(QUERIES[number])
+
+
+def test_complete_run_raises_every_mark(search):
+    marks = search()
+    assert marks == {key(0): 4000000049, key(1): 4001000049}
+
+
+def test_failed_page_keeps_the_querys_mark(search, monkeypatch):
+    scrape = main.JobScraper.scrape_search_page
+    
+    def failing(driver, url, is_known):
+        if "bench-0" in url and "start=25" in url:
+            raise RuntimeError("page did not load")
+        return scrape(driver, url, is_known)
+    
+    monkeypatch.setattr(main.JobScraper, "scrape_search_page", staticmethod(failing))
+    assert search() == {key(1): 4001000049}
+
+
+def test_interrupted_run_keeps_every_mark(search, monkeypatch):
+    scrape = main.JobScraper.scrape_search_page
+    
+    def interrupted(driver, url, is_known):
+        result = scrape(driver, url, is_known)
+        main.stop_event.set()
+        return result
+    
+    monkeypatch.setattr(main.JobScraper, "scrape_search_page", staticmethod(interrupted))
+    assert search() == {}
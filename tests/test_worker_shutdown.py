@@ -0,0 +1,32 @@
+"""Fetch workers notice stop_event while waiting for jobs"""
+import threading
+import time
+
+import main
+
+
+def test_idle_worker_stops_promptly(scraper_config):
+    scraper_config["wait_for_jobs_timeout"] = 120
+    main.frontier = main.Frontier()
+    try:
+        threading.Timer(0.2, main.stop_event.set).start()
+        started = time.monotonic()
+        assert main.JobScraper.next_job() is None
+        assert time.monotonic() - started < 2
+    finally:
+        main.frontier.close()
+
+
+def test_next_job_returns_none_once_drained(scraper_config):
+    main.frontier = main.Frontier()
+    try:
+        main.frontier.put("https://www.linkedin.com/jobs/view/4000000001/", "Remote")
+        main.frontier.close_input()
+        job = main.JobScraper.next_job()
+        assert job[0] == "4000000001"
+        main.frontier.done(job[0])
+        started = time.monotonic()
+        assert main.JobScraper.next_job() is None
+        assert time.monotonic() - started < 2
+    finally:
+        main.frontier.close()